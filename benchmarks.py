@@ -0,0 +1,283 @@
+"""
+# Description:  Benchmark suite comparing the chaining and open addressing HashMaps.
+#               Measures put / get / miss-get / remove throughput, resize cost, peak
+#               memory and chain / probe length distributions across key distributions.
+#
+#               python benchmarks.py --sizes 1000 100000 --output results.json
+#               python benchmarks.py --baseline results.json --tolerance 0.1
+"""
+import argparse
+import gc
+import itertools
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from hash_map_sc import HashMap as HashMapSC
+from hash_map_oa import HashMap as HashMapOA
+from hash_map_rh import HashMap as HashMapRH
+from hash_map_cuckoo import HashMap as HashMapCuckoo
+from hash_map_swiss import HashMap as HashMapSwiss
+
+# Maps under test: name -> factory taking (capacity, hash function)
+MAPS = {
+    "sc": lambda capacity, function: HashMapSC(capacity, function, max_load=1.0),
+    "oa": lambda capacity, function: HashMapOA(capacity, function),
+    "oa-compact": lambda capacity, function: HashMapOA(capacity, function, compact=True),
+    "oa-linear": lambda capacity, function: HashMapOA(capacity, function, probe="linear"),
+    "oa-triangular": lambda capacity, function: HashMapOA(capacity, function, probe="triangular"),
+    "oa-double": lambda capacity, function: HashMapOA(capacity, function, probe="double"),
+    "rh": lambda capacity, function: HashMapRH(capacity, function),
+    "cuckoo": lambda capacity, function: HashMapCuckoo(capacity, function),
+    "swiss": lambda capacity, function: HashMapSwiss(capacity, function),
+}
+
+DISTRIBUTIONS = ("sequential", "random", "anagram")
+
+# Metrics where a larger value is an improvement; every other numeric metric is a cost
+THROUGHPUT_METRICS = ("put_ops", "get_ops", "miss_get_ops", "remove_ops")
+COST_METRICS = ("resize_seconds", "peak_memory_bytes", "mean_probe_length", "max_probe_length")
+
+
+def make_keys(distribution: str, count: int, seed: int = 0) -> list:
+    """
+    Return count distinct string keys following the given distribution.
+    Anagrams are permutations of one string, so any hash that ignores order collides on all of them.
+    """
+    if distribution == "sequential":
+        return ['key' + str(i) for i in range(count)]
+
+    if distribution == "random":
+        # A dict dedupes in generation order, so a seeded run is the same under any PYTHONHASHSEED
+        rng = random.Random(seed)
+        keys = {}
+        while len(keys) < count:
+            keys[''.join(rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=12))] = None
+        return list(keys)
+
+    if distribution == "anagram":
+        letters = 'abcdefghijkl'
+        return [''.join(p) for p in itertools.islice(itertools.permutations(letters), count)]
+
+    raise ValueError(f"Unknown key distribution {distribution!r}")
+
+
+def chain_lengths(hash_map) -> dict:
+    """Return a histogram {chain length: number of buckets} for a chaining HashMap."""
+    hash_map.complete_resize()
+    histogram = {}
+    for idx in range(hash_map.get_capacity()):
+        bucket = hash_map._buckets[idx]
+        length = 0 if bucket is None else bucket.length()
+        histogram[length] = histogram.get(length, 0) + 1
+    return histogram
+
+
+def _probe_length(hash_map, entry, slot: int, capacity: int) -> int:
+    """Return the number of collisions probed past before entry's lookup reaches slot."""
+    if isinstance(hash_map, HashMapCuckoo):
+        # Cuckoo: 0 for keys in their first bucket, 1 in their second
+        return int(slot // hash_map._bucket_size != entry.hash_value[0] % hash_map._bucket_count)
+    if isinstance(hash_map, HashMapSwiss):
+        # Groups of 8 slots are probed triangularly; count the groups passed over
+        groups = capacity // 8
+        group, j = (entry.hash_value >> 7) % groups, 0
+        while group != slot // 8:
+            j += 1
+            group = (group + j) % groups
+        return j
+    if isinstance(hash_map, HashMapRH):
+        # Linear probing: the probe length is the distance from the key's home slot
+        return (slot - entry.hash_value) % capacity
+
+    # Open addressing: follow the map's probe sequence (see PROBE_STRATEGIES) to the slot
+    a, b = hash_map._probe_terms(entry.key)
+    j, idx = 0, entry.hash_value % capacity
+    while idx != slot:
+        j += 1
+        if j >= capacity:
+            a, b = 1, 0
+        idx = (idx + a + b * j) % capacity
+    return j
+
+
+def probe_lengths(hash_map) -> dict:
+    """
+    Return a histogram {probe length: number of keys} for an open addressing HashMap,
+    where the probe length is the number of collisions before the key's slot is reached.
+    """
+    buckets, capacity = hash_map.get_buckets(), hash_map.get_capacity()
+    histogram = {}
+    if isinstance(hash_map, HashMapCuckoo):
+        # Cuckoo keys in the stash are found after both buckets
+        stashed = len(hash_map.get_stash())
+        if stashed:
+            histogram[2] = stashed
+    for slot in range(capacity):
+        entry = buckets[slot]
+        if entry is None or entry.is_tombstone:
+            continue
+        j = _probe_length(hash_map, entry, slot, capacity)
+        histogram[j] = histogram.get(j, 0) + 1
+    return histogram
+
+
+def _summarize(histogram: dict, weighted_by_length: bool) -> (float, int):
+    """Return the mean and max of a length histogram."""
+    if not histogram:
+        return (0.0, 0)
+    if weighted_by_length:
+        # Chain histograms count buckets; weighting each chain by the keys in it gives
+        # the length of the chain an average stored key lives in
+        total = sum(length * count for length, count in histogram.items())
+        mean = sum(length * length * count for length, count in histogram.items()) / max(total, 1)
+    else:
+        mean = sum(length * count for length, count in histogram.items()) / sum(histogram.values())
+    return (round(mean, 4), max(length for length, count in histogram.items() if count))
+
+
+def _ops_per_second(operation, keys: list, repeat: int) -> float:
+    """Return the best observed rate of calling operation once per key."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            operation(key)
+        best = min(best, time.perf_counter() - start)
+    return round(len(keys) / best, 1) if best else float('inf')
+
+
+def bench_map(name: str, function, keys: list, misses: list, repeat: int = 1) -> dict:
+    """
+    Run every measurement for one map implementation on one key set.
+    :param name: The key of the map factory in MAPS
+    :param function: The hash function used by the map
+    :param keys: The keys inserted into the map
+    :param misses: Keys that are not in the map, for miss lookups
+    :param repeat: Number of times each lookup pass is timed; the best is kept
+    :return: A dict of metric name -> value
+    """
+    factory = MAPS[name]
+    result = {}
+    gc.collect()
+
+    # Inserts start from a small table so that growth is part of the cost
+    best = float('inf')
+    for _ in range(repeat):
+        hash_map = factory(11, function)
+        start = time.perf_counter()
+        for i, key in enumerate(keys):
+            hash_map.put(key, i)
+        best = min(best, time.perf_counter() - start)
+    result["put_ops"] = round(len(keys) / best, 1)
+
+    result["get_ops"] = _ops_per_second(hash_map.get, keys, repeat)
+    result["miss_get_ops"] = _ops_per_second(hash_map.get, misses, repeat)
+
+    if name == "sc":
+        histogram = chain_lengths(hash_map)
+        result["mean_probe_length"], result["max_probe_length"] = _summarize(histogram, True)
+        result["chain_length_histogram"] = histogram
+    else:
+        histogram = probe_lengths(hash_map)
+        result["mean_probe_length"], result["max_probe_length"] = _summarize(histogram, False)
+        result["probe_length_histogram"] = histogram
+
+    start = time.perf_counter()
+    hash_map.resize_table(hash_map.get_capacity() * 2)
+    hash_map.complete_resize()
+    result["resize_seconds"] = round(time.perf_counter() - start, 6)
+
+    start = time.perf_counter()
+    for key in keys:
+        hash_map.remove(key)
+    result["remove_ops"] = round(len(keys) / (time.perf_counter() - start), 1)
+
+    # Peak memory is measured on a separate build, since tracing slows every allocation
+    del hash_map
+    gc.collect()
+    tracemalloc.start()
+    hash_map = factory(11, function)
+    for i, key in enumerate(keys):
+        hash_map.put(key, i)
+    result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def run(maps, distributions, sizes, function, repeat: int = 1, seed: int = 0, log=None) -> dict:
+    """
+    Run bench_map for every combination and return results keyed "map/distribution/size".
+    """
+    results = {}
+    for distribution in distributions:
+        for size in sizes:
+            keys = make_keys(distribution, size * 2, seed)
+            keys, misses = keys[:size], keys[size:]
+            for name in maps:
+                label = f"{name}/{distribution}/{size}"
+                if log:
+                    log(f"running {label}")
+                results[label] = bench_map(name, function, keys, misses, repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Return a list of regression messages for metrics that are worse than the baseline
+    by more than the tolerance (a fraction, e.g. 0.1 for 10%).
+    """
+    regressions = []
+    for label, metrics in results.items():
+        if label not in baseline:
+            continue
+        for metric in THROUGHPUT_METRICS + COST_METRICS:
+            if metric not in metrics or metric not in baseline[label]:
+                continue
+            current, previous = metrics[metric], baseline[label][metric]
+            if metric in THROUGHPUT_METRICS:
+                worse = current < previous * (1 - tolerance)
+            else:
+                worse = current > previous * (1 + tolerance) and current - previous > 1e-6
+            if worse:
+                regressions.append(f"{label} {metric}: {previous} -> {current}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1].strip('# '))
+    parser.add_argument("--maps", nargs="+", default=list(MAPS), choices=list(MAPS))
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=DISTRIBUTIONS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--hash", default="FNV-1a", help="registered hash function name")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per lookup measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed fractional regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.maps, args.distributions, args.sizes, args.hash, args.repeat, args.seed,
+                  log=lambda message: print(message, file=sys.stderr))
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
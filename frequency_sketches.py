@@ -0,0 +1,267 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents fixed-memory frequency estimators for streams too large
+#               to count exactly: a Count-Min Sketch for point estimates and Space-Saving for
+#               heavy hitters, combined by find_mode_approximate
+"""
+import heapq
+import itertools
+import math
+from array import array
+
+from hash_map_sc import HashMap as HashMapSC
+from hashmap_helpers import DynamicArray, blake2b_hash, resolve_hash_function
+
+_MASK_32 = (1 << 32) - 1
+_MASK_64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: depth rows of width counters. A value increments one counter per row
+    and its estimate is the smallest of those counters, which never undercounts and, with
+    probability 1 - delta, overcounts by at most epsilon times the number of values added.
+    """
+
+    def __init__(self, epsilon: float = .001, delta: float = .01, function=blake2b_hash) -> None:
+        """
+        Initialize an empty sketch
+        :param epsilon: The overcount bound, as a fraction of the number of values added
+        :param delta: The probability that an estimate exceeds the bound
+        :param function: The hash function; its 64-bit result is split into two 32-bit hashes
+                         that are combined to give one column per row
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        self._epsilon = epsilon
+        self._delta = delta
+        self._width = math.ceil(math.e / epsilon)
+        self._depth = math.ceil(math.log(1 / delta))
+        self._counts = array('Q', bytes(8 * self._width * self._depth))
+        self._hash_function = resolve_hash_function(function)
+        self._total = 0
+
+    def _columns(self, hash_value: int) -> list:
+        """
+        Helper method that returns the index of a value's counter in each row, given its hash.
+        Row i uses h1 + i * h2 (Kirsch-Mitzenmacher), so one hash call serves every row.
+        """
+        hash_value &= _MASK_64
+        h1, h2 = hash_value & _MASK_32, (hash_value >> 32) | 1
+        width = self._width
+        return [row * width + (h1 + row * h2) % width for row in range(self._depth)]
+
+    def add(self, value: object, count: int = 1) -> None:
+        """
+        The method counts count occurrences of value
+        """
+        self._add_hashed(self._hash_function(value), count)
+
+    def _add_hashed(self, hash_value: int, count: int = 1) -> None:
+        """
+        Helper method to add that counts a value given its hash
+        """
+        counts = self._counts
+        for idx in self._columns(hash_value):
+            counts[idx] += count
+        self._total += count
+
+    def update(self, values) -> None:
+        """
+        The method counts every value in values, in a single pass
+        :param values: An iterable (or generator) of values, or a DynamicArray
+        """
+        if isinstance(values, DynamicArray):
+            da = values
+            values = (da[idx] for idx in range(da.length()))
+        columns, counts, function = self._columns, self._counts, self._hash_function
+        total = 0
+        for value in values:
+            for idx in columns(function(value)):
+                counts[idx] += 1
+            total += 1
+        self._total += total
+
+    def estimate(self, value: object) -> int:
+        """
+        The method returns the estimated count of value; never less than the true count
+        """
+        return self._estimate_hashed(self._hash_function(value))
+
+    def _estimate_hashed(self, hash_value: int) -> int:
+        """
+        Helper method to estimate that returns the estimated count of a value given its hash
+        """
+        counts = self._counts
+        return min(counts[idx] for idx in self._columns(hash_value))
+
+    def halve(self) -> None:
+        """
+        The method halves every counter, so that old counts decay relative to new ones
+        """
+        counts = self._counts
+        for idx in range(len(counts)):
+            counts[idx] >>= 1
+        self._total >>= 1
+
+    def error_bound(self) -> int:
+        """
+        The method returns the amount by which an estimate exceeds the true count,
+        except with probability delta
+        """
+        return math.floor(self._epsilon * self._total)
+
+    def get_total(self) -> int:
+        """
+        Return the number of values counted, including repeats
+        """
+        return self._total
+
+    def get_dimensions(self) -> (int, int):
+        """
+        Return the (depth, width) of the counter table
+        """
+        return (self._depth, self._width)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitter summary: monitors at most capacity values. A new value replaces
+    the one with the smallest count and inherits that count as its error, so every count is
+    an overestimate by at most its error, and at most total / capacity.
+    """
+
+    def __init__(self, capacity: int = 1000, function=blake2b_hash) -> None:
+        """
+        Initialize an empty summary
+        :param capacity: The number of values monitored; counts are within total / capacity
+        :param function: The hash function for the table of monitored values
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._hash_function = resolve_hash_function(function)
+        self._map = HashMapSC(capacity, self._hash_function)
+        # Min-heap of (count, tiebreak, value, hash); entries go stale as counts rise and are
+        # skipped when popped, and the heap is rebuilt before it outgrows a fixed size
+        self._heap = []
+        self._tiebreak = itertools.count()
+        self._total = 0
+
+    def add(self, value: object) -> None:
+        """
+        The method counts one occurrence of value
+        """
+        self._add_hashed(value, self._hash_function(value))
+
+    def _add_hashed(self, value: object, hash_value: int) -> None:
+        """
+        Helper method to add that counts a value given its hash
+        """
+        self._total += 1
+        hash_map = self._map
+        node = hash_map._find_node(value, hash_value)
+        if node:
+            counter = node.value
+            counter[0] += 1
+        elif hash_map.get_size() < self._capacity:
+            counter = [1, 0]
+            hash_map._put_hashed(value, counter, hash_value)
+        else:
+            count, evicted, evicted_hash = self._pop_min()
+            hash_map._remove_hashed(evicted, evicted_hash)
+            counter = [count + 1, count]
+            hash_map._put_hashed(value, counter, hash_value)
+
+        heapq.heappush(self._heap, (counter[0], next(self._tiebreak), value, hash_value))
+        if len(self._heap) > 4 * self._capacity:
+            function = self._hash_function
+            self._heap = [(counter[0], next(self._tiebreak), key, function(key))
+                          for key, counter in hash_map.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> (int, object, int):
+        """
+        Helper method to add that pops the smallest current count, with its value and hash
+        """
+        while True:
+            count, _, value, hash_value = heapq.heappop(self._heap)
+            node = self._map._find_node(value, hash_value)
+            if node and node.value[0] == count:
+                return count, value, hash_value
+
+    def update(self, values) -> None:
+        """
+        The method counts every value in values, in a single pass
+        :param values: An iterable (or generator) of values, or a DynamicArray
+        """
+        if isinstance(values, DynamicArray):
+            da = values
+            values = (da[idx] for idx in range(da.length()))
+        for value in values:
+            self.add(value)
+
+    def estimate(self, value: object) -> (int, int):
+        """
+        The method returns the count and error for value; the true count is between
+        count - error and count. Values not monitored return (0, 0), and occur at most
+        as often as the smallest monitored count.
+        """
+        counter = self._map.get(value)
+        return (0, 0) if counter is None else tuple(counter)
+
+    def top_k(self, k: int) -> DynamicArray:
+        """
+        The method returns the k values with the highest counts
+        :return: An array of (value, count, error) tuples, highest count first
+        """
+        items = ((key, counter[0], counter[1]) for key, counter in self._map.items())
+        return DynamicArray(heapq.nlargest(k, items, key=lambda item: item[1]))
+
+    def get_total(self) -> int:
+        """
+        Return the number of values counted, including repeats
+        """
+        return self._total
+
+
+def find_mode_approximate(values, epsilon: float = .001, delta: float = .01,
+                          function=blake2b_hash) -> (DynamicArray, int, int):
+    """
+    The function estimates the mode of a stream in fixed memory, whatever its number of distinct values.
+    Space-Saving (1 / epsilon counters) finds the candidates and a Count-Min Sketch tightens
+    their counts; each count is then known to within epsilon times the stream length.
+    :param values: A Dynamic Array, or any iterable of values
+    :param epsilon: The error bound, as a fraction of the number of values
+    :param delta: The probability that the Count-Min estimates exceed their bound
+    :param function: The hash function
+    :return: A tuple containing an array with every value that may be the mode, most likely first,
+             the estimated modal frequency, and the most that estimate may exceed the true frequency
+    """
+    sketch = CountMinSketch(epsilon, delta, function)
+    summary = SpaceSaving(math.ceil(1 / epsilon), function)
+    if isinstance(values, DynamicArray):
+        da = values
+        values = (da[idx] for idx in range(da.length()))
+    function = resolve_hash_function(function)
+    for value in values:
+        hash_value = function(value)
+        sketch._add_hashed(hash_value)
+        summary._add_hashed(value, hash_value)
+
+    # Each candidate's true count lies in [low, high]; any value whose high reaches the
+    # best low could be the mode
+    bounds = []
+    top = summary.top_k(summary._capacity)
+    for idx in range(top.length()):
+        value, count, error = top[idx]
+        high = min(count, sketch.estimate(value))
+        bounds.append((value, max(count - error, 0), high))
+    if not bounds:
+        return (DynamicArray(), 0, 0)
+
+    best_low = max(low for _, low, _ in bounds)
+    candidates = sorted((item for item in bounds if item[2] >= best_low), key=lambda item: item[2], reverse=True)
+    value, low, high = candidates[0]
+    return (DynamicArray([value for value, _, _ in candidates]), high, high - low)
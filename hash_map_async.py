@@ -0,0 +1,194 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents an asyncio wrapper around the chaining or open addressing
+#               HashMap, which loads missing keys once however many coroutines request them
+"""
+import asyncio
+import inspect
+
+from hash_map_sc import HashMap as HashMapSC
+from hashmap_helpers import hash_function_name, resolve_hash_function
+
+
+class HashMap:
+    """
+    HashMap for use from asyncio coroutines. get_or_load runs one load per missing key however
+    many coroutines are waiting for it, so a hot miss reaches the backend once. The map resizes
+    incrementally and the coroutine that triggers a resize migrates it in chunks, yielding to the
+    event loop between them. Like asyncio itself, it is not thread-safe.
+    """
+
+    def __init__(self, capacity: int, function, map_class=HashMapSC, resize_chunk: int = 1024, **kwargs) -> None:
+        """
+        Initialize new async HashMap
+        :param capacity: The initial capacity of the map
+        :param function: The hash function
+        :param map_class: hash_map_sc.HashMap or hash_map_oa.HashMap
+        :param resize_chunk: The number of buckets migrated between yields to the event loop
+        :param kwargs: Further arguments for the map; a chaining map defaults to max_load=1.0
+        """
+        if issubclass(map_class, HashMapSC):
+            kwargs.setdefault("max_load", 1.0)
+        self._hash_function = resolve_hash_function(function)
+        self._map = map_class(capacity, self._hash_function, incremental=True, **kwargs)
+        self._resize_chunk = max(resize_chunk, 1)
+        self._resizing = False
+
+        # Tasks of the loads in flight, by key
+        self._loads = HashMapSC(11, self._hash_function, max_load=1.0)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_map(self):
+        """
+        The method returns the underlying chaining or open addressing HashMap
+        """
+        return self._map
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_hash_function(self) -> str:
+        """
+        The method returns the current hash function used by the hash map
+        """
+        return hash_function_name(self._hash_function)
+
+    # ------------------------------------------------------------------ #
+
+    async def _finish_resize(self) -> None:
+        """
+        Helper method that migrates any pending resize, yielding to the event loop after each
+        chunk; coroutines that run in between see a consistent map
+        """
+        if self._resizing:
+            return
+        self._resizing = True
+        try:
+            while self._map.is_resizing():
+                self._map._migrate_buckets(self._resize_chunk)
+                await asyncio.sleep(0)
+        finally:
+            self._resizing = False
+
+    def get(self, key: str) -> object:
+        """
+        The method returns the value associated with the given key
+        :param key: The key to be searched
+        :return: Returns the value associated with the given key, else returns None if not found
+        """
+        return self._map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method returns True if the key is in the hash map, else False
+        :param: the key to be found
+        :return: Returns True if the key is found, else False
+        """
+        return self._map.contains_key(key)
+
+    async def put(self, key: str, value: object) -> None:
+        """
+        The method updates the key/value pair for an existing key, or adds the key/value to the hash map
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :return: None
+        """
+        self._map.put(key, value)
+        await self._finish_resize()
+
+    async def put_many(self, pairs) -> None:
+        """
+        The method adds or updates every key/value pair in pairs, growing the table at most once
+        :param pairs: An iterable of (key, value) pairs
+        :return: None
+        """
+        self._map.put_many(pairs)
+        await self._finish_resize()
+
+    def remove(self, key: str) -> None:
+        """
+        The method removes the given key and its value from the hash map.
+        :param key: The key to be removed
+        :return: None
+        """
+        self._map.remove(key)
+
+    async def get_or_load(self, key: str, loader) -> object:
+        """
+        The method returns the value for key, loading and storing it first if it is missing.
+        Concurrent calls for a missing key share one load: the first starts it and the rest
+        await its result or exception. A failed load stores nothing, so the next call retries.
+        Cancelling a caller does not cancel the load, which the other callers may be awaiting.
+        :param key: The key to be searched
+        :param loader: Called as loader(key); may be a plain function or return an awaitable
+        :return: The stored or loaded value
+        """
+        value = self._map.get(key)
+        if value is not None or self._map.contains_key(key):
+            return value
+        task = self._loads.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._loads.put(key, task)
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, loader) -> object:
+        """
+        Helper method to get_or_load that loads and stores the value for key
+        """
+        try:
+            value = loader(key)
+            if inspect.isawaitable(value):
+                value = await value
+            self._map.put(key, value)
+        finally:
+            self._loads.remove(key)
+        await self._finish_resize()
+        return value
+
+    async def get_many(self, keys, loader=None, batch_size: int = 1024) -> list:
+        """
+        The method returns the values for each of the given keys, yielding to the event loop
+        after each batch so that a long lookup does not block other coroutines
+        :param keys: An iterable of keys
+        :param loader: If given, missing keys are loaded concurrently as by get_or_load
+        :param batch_size: The number of keys looked up between yields
+        :return: A list with the value for each key, or None where a key is not found (or loaded)
+        """
+        keys = list(keys)
+        values = []
+        for start in range(0, len(keys), batch_size):
+            values.extend(self._map.get_many(keys[start:start + batch_size]))
+            await asyncio.sleep(0)
+        if loader is None:
+            return values
+
+        missing = [idx for idx, value in enumerate(values)
+                   if value is None and not self._map.contains_key(keys[idx])]
+        loaded = await asyncio.gather(*(self.get_or_load(keys[idx], loader) for idx in missing))
+        for idx, value in zip(missing, loaded):
+            values[idx] = value
+        return values
+
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        """
+        Return size of map, for use with len()
+        """
+        return self.get_size()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return True if the key is in the hash map, for use with the in operator
+        """
+        return self.contains_key(key)
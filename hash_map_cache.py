@@ -0,0 +1,316 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents a bounded cache built on the chaining HashMap, which
+#               evicts the least recently used entries and can filter admissions with TinyLFU
+"""
+import math
+import sys
+
+from frequency_sketches import CountMinSketch
+from hash_map_sc import HashMap as HashMapSC
+from hashmap_helpers import (CacheNode, CacheStats, DynamicArray, RecencyList, builtin_hash, hash_function_name,
+                             resolve_hash_function)
+
+ADMISSION_POLICIES = (None, "tinylfu")
+
+# Default for get that no cached value can be, so that __getitem__ can tell a miss
+_MISSING = object()
+
+
+def _entry_size(key: object, value: object) -> int:
+    """Default entry size for a max_bytes budget: the shallow sizes of the key and the value."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class HashMap:
+    def __init__(self, max_entries: int, function=builtin_hash, max_bytes: int = None, admission: str = None,
+                 sizeof=_entry_size) -> None:
+        """
+        Initialize new bounded cache. Each entry is a CacheNode that is both the chain node of a
+        chaining HashMap and a link of the recency list, so lookups, updates and evicting the least
+        recently used entry are O(1), with one node per entry.
+        With admission="tinylfu", a new key that would force an eviction is only admitted if
+        it has been requested more often than the entry it would evict, as estimated by a
+        Count-Min Sketch that is halved periodically so that old popularity fades.
+        :param max_entries: The most entries the cache holds; None for no limit
+        :param function: The hash function
+        :param max_bytes: The most bytes of entries, as measured by sizeof; None for no limit
+        :param admission: None to admit every new key, or "tinylfu"
+        :param sizeof: Called with (key, value) to give an entry's size for max_bytes
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("A cache needs max_entries, max_bytes or both")
+        if (max_entries is not None and max_entries < 1) or (max_bytes is not None and max_bytes < 1):
+            raise ValueError("max_entries and max_bytes must be positive")
+        if admission not in ADMISSION_POLICIES:
+            raise ValueError(f"Unknown admission {admission!r}; expected one of {ADMISSION_POLICIES}")
+
+        self._hash_function = resolve_hash_function(function)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._map = HashMapSC(min(max_entries or 11, 1 << 16), self._hash_function, max_load=1.0)
+        self._bytes = 0
+
+        self._recency = RecencyList()
+
+        self._sketch = None
+        if admission == "tinylfu":
+            # Eight counters per row for each cached entry, so that one-off keys seldom share a
+            # counter with a popular one; counts are halved after ten requests per entry
+            expected = max(max_entries or 1024, 64)
+            self._sketch = CountMinSketch(epsilon=math.e / (8 * expected), delta=.05, function=self._hash_function)
+            self._sample_size = 10 * expected
+        # Hash of the key of the last get that missed; a put that follows for that key
+        # is the same request, so it is not counted again
+        self._missed = None
+        self.reset_stats()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'Cache [' + ', '.join(f'{key}: {value}' for key, value in self.items()) + ']'
+
+    def get_size(self) -> int:
+        """
+        Return the number of entries in the cache
+        """
+        return self._map.get_size()
+
+    def get_bytes(self) -> int:
+        """
+        Return the total size of the entries in the cache, as measured by sizeof
+        """
+        return self._bytes
+
+    # ------------------------------------------------------------------ #
+
+    def _record(self, hash_value: int) -> None:
+        """
+        Helper method that counts a request for a key in the admission sketch, if any
+        """
+        sketch = self._sketch
+        if sketch is not None:
+            sketch._add_hashed(hash_value)
+            if sketch.get_total() >= self._sample_size:
+                sketch.halve()
+
+    def _over_budget(self, extra_entries: int, extra_bytes: int) -> bool:
+        """
+        Helper method that returns True if adding the given entries and bytes exceeds a budget
+        """
+        return ((self._max_entries is not None and self._map.get_size() + extra_entries > self._max_entries)
+                or (self._max_bytes is not None and self._bytes + extra_bytes > self._max_bytes))
+
+    def _evict(self) -> None:
+        """
+        Helper method that removes the least recently used entry
+        """
+        node = self._recency.oldest()
+        self._recency.unlink(node)
+        self._map._remove_hashed(node.key, node.hash_value)
+        self._bytes -= node.size
+        self._stats.evictions += 1
+
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+        The method returns the value associated with the given key and marks it most recently used
+        :param key: The key to be searched
+        :param default: The value returned when the key is not cached
+        :return: The value associated with the key, else default
+        """
+        hash_value = self._hash_function(key)
+        self._record(hash_value)
+        node = self._map._find_node(key, hash_value)
+        if node is None:
+            self._stats.misses += 1
+            self._missed = hash_value
+            return default
+        self._stats.hits += 1
+        self._recency.move_to_front(node)
+        return node.value
+
+    def put(self, key: str, value: object) -> bool:
+        """
+        The method adds or updates the key/value pair as the most recently used entry,
+        evicting least recently used entries until the cache is within its budget
+        :param key: the key to be updated or added to the cache
+        :param value: the value to be added or updated
+        :return: True if the pair is cached, False if admission rejected it or it alone exceeds
+                 max_bytes (any value already cached for the key is then dropped)
+        """
+        hash_value = self._hash_function(key)
+        size = self._sizeof(key, value) if self._max_bytes is not None else 0
+        if self._max_bytes is not None and size > self._max_bytes:
+            self._remove(key, hash_value)
+            self._rejections += 1
+            return False
+
+        node = self._map._find_node(key, hash_value)
+        if node is not None:
+            self._bytes += size - node.size
+            node.value, node.size = value, size
+            self._recency.move_to_front(node)
+            while self._over_budget(0, 0):
+                self._evict()
+            return True
+
+        if hash_value != self._missed:
+            self._record(hash_value)
+        self._missed = None
+        if self._over_budget(1, size):
+            # TinyLFU: admit only a key requested more often than the entry it would evict
+            victim = self._recency.oldest()
+            if self._sketch is not None and \
+                    self._sketch._estimate_hashed(hash_value) <= self._sketch._estimate_hashed(victim.hash_value):
+                self._rejections += 1
+                return False
+            while self._map.get_size() and self._over_budget(1, size):
+                self._evict()
+
+        node = CacheNode(key, value, hash_value, size)
+        self._map._put_node(node)
+        self._recency.push_front(node)
+        self._bytes += size
+        return True
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method returns True if the key is cached, without marking it used or counting a hit
+        :param: the key to be found
+        :return: Returns True if the key is found, else False
+        """
+        return self._map.contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        The method removes the given key and its value from the cache.
+        :param key: The key to be removed
+        :return: None
+        """
+        self._remove(key, self._hash_function(key))
+
+    def _remove(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/put/__delitem__ that removes the key given its hash
+        :return: True if the key was removed, else False
+        """
+        node = self._map._find_node(key, hash_value)
+        if node is None:
+            return False
+        self._recency.unlink(node)
+        self._bytes -= node.size
+        self._map._remove_hashed(key, hash_value)
+        return True
+
+    def clear(self) -> None:
+        """
+        The method removes every entry; the statistics and admission history are kept
+        :return: None
+        """
+        self._map.clear()
+        self._recency.clear()
+        self._bytes = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        The method returns the cached keys, most recently used first
+        :return: Returns an array with the keys of the cache
+        """
+        return DynamicArray(list(self.keys()))
+
+    def get_hash_function(self) -> str:
+        """
+        The method returns the current hash function used by the cache
+        """
+        return hash_function_name(self._hash_function)
+
+    def get_stats(self) -> dict:
+        """
+        The method returns the hit, miss, eviction and rejection counts with the current size,
+        for tuning the budget
+        :return: A dict of plain values, suitable for exporting
+        """
+        return {
+            **self._stats.snapshot(),
+            "rejections": self._rejections,
+            "size": self.get_size(),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+        }
+
+    def reset_stats(self) -> None:
+        """
+        The method zeroes the hit, miss, eviction and rejection counts
+        """
+        self._stats = CacheStats()
+        self._rejections = 0
+
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        """
+        Return the number of entries, for use with len()
+        """
+        return self.get_size()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return True if the key is cached, for use with the in operator
+        """
+        return self.contains_key(key)
+
+    def __getitem__(self, key: str) -> object:
+        """
+        Return the value for key using [] syntax; raises KeyError if the key is not cached
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: object) -> None:
+        """
+        Add or update the key/value pair using [] syntax
+        """
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Remove the key using del; raises KeyError if the key is not cached
+        """
+        if not self._remove(key, self._hash_function(key)):
+            raise KeyError(key)
+
+    def __iter__(self):
+        """
+        Return a lazy iterator over the keys, most recently used first
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        The method lazily yields each key, most recently used first
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        The method lazily yields each value, most recently used first
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self):
+        """
+        The method lazily yields each (key, value) pair, most recently used first.
+        Reading the cache with get() while iterating reorders the entries.
+        """
+        for node in self._recency:
+            yield (node.key, node.value)
@@ -0,0 +1,311 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents a thread-safe implementation of the HashMap using
+#               chaining, with the buckets split into independently locked segments
+"""
+import threading
+
+from hash_map_sc import HashMap as HashMapSC
+from hashmap_helpers import HashMapMixin, resolve_hash_function
+
+
+class HashMap(HashMapMixin):
+    def __init__(self, capacity: int, function, concurrency: int = 16, max_load: float = 1.0,
+                 rehash_step: int = 4) -> None:
+        """
+        Initialize new thread-safe HashMap that uses
+        separate chaining for collision resolution.
+        Keys are routed by hash to one of concurrency segments, each a chaining HashMap with
+        its own lock, so threads working on different segments never wait for each other.
+        Segments grow on their own and migrate incrementally, so a resize only ever holds
+        one segment's lock, and only for rehash_step buckets at a time.
+        :param capacity: The initial number of buckets, shared between the segments
+        :param function: The hash function
+        :param concurrency: The number of segments (lock stripes)
+        :param max_load: Load factor above which a segment doubles
+        :param rehash_step: Number of old buckets a segment migrates per operation while it is resizing
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+
+        self._hash_function = resolve_hash_function(function)
+        self._concurrency = concurrency
+        self._max_load = max_load
+        self._rehash_step = rehash_step
+
+        segment_capacity = max(-(-capacity // concurrency), 1)
+        self._segments = [HashMapSC(segment_capacity, self._hash_function, max_load=max_load,
+                                    incremental=True, rehash_step=rehash_step)
+                          for _ in range(concurrency)]
+        # Re-entrant, so that a compute function may read or write its own key's segment
+        self._locks = [threading.RLock() for _ in range(concurrency)]
+        # The segment whose compute function each thread is running, if any
+        self._computing = threading.local()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for idx in range(self._concurrency):
+            with self._lock(idx):
+                out += 'segment ' + str(idx) + ':\n' + str(self._segments[idx])
+        return out
+
+    def _route(self, hash_value: int) -> (int, int):
+        """
+        Helper method that returns the segment index for a key's hash and the hash used within
+        the segment. The segment is picked by the low part of the hash and the bucket by the rest,
+        so the keys of one segment still spread over all of its buckets.
+        :param hash_value: The hash of the key to be routed
+        :return: A tuple of the segment index and the key's hash within the segment
+        """
+        return hash_value % self._concurrency, hash_value // self._concurrency
+
+    def _lock(self, idx: int) -> threading.RLock:
+        """
+        Helper method that returns the lock of segment idx. A compute function holds its own
+        segment's lock, so taking another one from inside it could deadlock against a thread
+        computing in that segment; that raises instead.
+        :param idx: The segment index
+        :return: The segment's lock
+        """
+        computing = getattr(self._computing, "idx", None)
+        if computing is not None and computing != idx:
+            raise RuntimeError("A compute function may only access keys in its own segment")
+        return self._locks[idx]
+
+    def get_size(self) -> int:
+        """
+        Return size of map; other threads may change it as soon as it is read
+        """
+        return sum(segment.get_size() for segment in self._segments)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the total of the segment capacities
+        """
+        return sum(segment.get_capacity() for segment in self._segments)
+
+    # ------------------------------------------------------------------ #
+
+    def _put_hashed(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Helper method to put that updates or adds the key/value under its segment's lock
+        """
+        idx, hash_value = self._route(hash_value)
+        with self._lock(idx):
+            self._segments[idx]._put_hashed(key, value, hash_value)
+
+    def put_if_absent(self, key: str, value: object) -> object:
+        """
+        The method atomically adds the key/value pair only if the key is not already in the hash map
+        :param key: the key to be added
+        :param value: the value to be added
+        :return: The value already associated with the key, else None if the pair was added
+        """
+        idx, hash_value = self._route(self._hash_function(key))
+        with self._lock(idx):
+            segment = self._segments[idx]
+            node = segment._find_node(key, hash_value)
+            if node:
+                return node.value
+            segment._put_hashed(key, value, hash_value)
+            return None
+
+    def compute(self, key: str, function) -> object:
+        """
+        The method atomically replaces the value for key with function(key, current value),
+        where the current value is None if the key is absent. Returning None removes the key.
+        Other keys in the same segment wait while function runs, so it should be short.
+        function may read or write key itself; accessing a key in another segment, or any
+        method that locks every segment, raises RuntimeError, as waiting could deadlock.
+        :param key: the key to be updated
+        :param function: Called with the key and its current value; returns the new value
+        :return: The new value, else None if the key was removed or left absent
+        """
+        idx, hash_value = self._route(self._hash_function(key))
+        with self._lock(idx):
+            segment = self._segments[idx]
+            node = segment._find_node(key, hash_value)
+            outer, self._computing.idx = getattr(self._computing, "idx", None), idx
+            try:
+                value = function(key, node.value if node else None)
+            finally:
+                self._computing.idx = outer
+            if value is not None:
+                segment._put_hashed(key, value, hash_value)
+            elif segment._remove_hashed(key, hash_value):
+                segment._shrink()
+            return value
+
+    def get_or_default(self, key: str, default: object = None) -> object:
+        """
+        The method returns the value associated with the given key, or default if the key is not found
+        :param key: The key to be searched
+        :param default: The value returned when the key is not found
+        :return: The value associated with the key, else default
+        """
+        key_val, value = self._get_key_value(key)
+        return default if key_val is None else value
+
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
+        """
+        Helper method that returns the key/value under its segment's lock, if it exists
+        :param key: The key to be searched
+        :param hash_value: The hash of the key, computed if not given
+        :return: Returns a key/value pair if in hash table, else (None, None)
+        """
+        idx, hash_value = self._route(self._hash_function(key) if hash_value is None else hash_value)
+        with self._lock(idx):
+            node = self._segments[idx]._find_node(key, hash_value)
+            return (node.key, node.value) if node else (None, None)
+
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/__delitem__ that removes the key under its segment's lock
+        :param key: The key to be removed
+        :param hash_value: The hash of the key
+        :return: True if the key was removed, else False
+        """
+        idx, hash_value = self._route(hash_value)
+        with self._lock(idx):
+            removed = self._segments[idx]._remove_hashed(key, hash_value)
+            if removed:
+                self._segments[idx]._shrink()
+            return removed
+
+    def empty_buckets(self) -> int:
+        """
+        The method returns the number of empty buckets in the hash table
+        :return: The number of empty buckets
+        """
+        total = 0
+        for idx in range(self._concurrency):
+            with self._lock(idx):
+                total += self._segments[idx].empty_buckets()
+        return total
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        The method changes the capacity of the hash table, sharing it between the segments.
+        Segments are resized one at a time, each under its own lock only.
+        :param new_capacity: The new capacity of the hash table
+        :return: None
+        """
+        if new_capacity < 1:
+            return
+        segment_capacity = max(-(-new_capacity // self._concurrency), 1)
+        for idx in range(self._concurrency):
+            with self._lock(idx):
+                self._segments[idx].resize_table(segment_capacity)
+
+    def complete_resize(self) -> None:
+        """
+        The method finishes any pending incremental resize in every segment.
+        :return: None
+        """
+        for idx in range(self._concurrency):
+            with self._lock(idx):
+                self._segments[idx].complete_resize()
+
+    def is_resizing(self) -> bool:
+        """
+        The method returns True while any segment has an incremental resize pending.
+        :return: True if buckets remain to be migrated, else False
+        """
+        return any(segment.is_resizing() for segment in self._segments)
+
+    # ------------------------------------------------------------------ #
+
+    def _group(self, keys) -> dict:
+        """
+        Helper method to the batch operations that routes keys, grouping them by segment
+        :param keys: An iterable of keys
+        :return: A dict of segment index -> list of (position, key, hash) tuples
+        """
+        groups = {}
+        for position, key in enumerate(keys):
+            idx, hash_value = self._route(self._hash_function(key))
+            groups.setdefault(idx, []).append((position, key, hash_value))
+        return groups
+
+    def put_many(self, pairs) -> None:
+        """
+        The method adds or updates every key/value pair in pairs, taking each segment's lock once
+        :param pairs: An iterable of (key, value) pairs
+        :return: None
+        """
+        pairs = list(pairs)
+        for idx, group in self._group(key for key, _ in pairs).items():
+            with self._lock(idx):
+                segment = self._segments[idx]
+                segment._reserve(len(group))
+                for position, key, hash_value in group:
+                    segment._put_hashed(key, pairs[position][1], hash_value)
+
+    def get_many(self, keys) -> list:
+        """
+        The method returns the values associated with each of the given keys
+        :param keys: An iterable of keys
+        :return: A list with the value for each key, or None where a key is not found
+        """
+        keys = list(keys)
+        result = [None] * len(keys)
+        for idx, group in self._group(keys).items():
+            with self._lock(idx):
+                segment = self._segments[idx]
+                for position, key, hash_value in group:
+                    node = segment._find_node(key, hash_value)
+                    result[position] = node.value if node else None
+        return result
+
+    def contains_many(self, keys) -> list:
+        """
+        The method returns whether each of the given keys is in the hash map
+        :param keys: An iterable of keys
+        :return: A list with True for each key found, else False
+        """
+        keys = list(keys)
+        result = [False] * len(keys)
+        for idx, group in self._group(keys).items():
+            with self._lock(idx):
+                segment = self._segments[idx]
+                for position, key, hash_value in group:
+                    result[position] = segment._find_node(key, hash_value) is not None
+        return result
+
+    def remove_many(self, keys) -> None:
+        """
+        The method removes each of the given keys, taking each segment's lock once
+        :param keys: An iterable of keys
+        :return: None
+        """
+        for idx, group in self._group(keys).items():
+            with self._lock(idx):
+                segment = self._segments[idx]
+                for _, key, hash_value in group:
+                    segment._remove_hashed(key, hash_value)
+                segment._shrink()
+
+    def clear(self) -> None:
+        """
+        The method clears the contents of the hash map, one segment at a time.
+        :return: None
+        """
+        for idx in range(self._concurrency):
+            with self._lock(idx):
+                self._segments[idx].clear()
+
+    # ------------------------------------------------------------------ #
+
+    def _iter_items(self):
+        """
+        Helper generator that copies one segment at a time under its lock and yields its pairs.
+        Iteration never raises for concurrent changes: each segment is seen as it was when copied.
+        """
+        for idx in range(self._concurrency):
+            with self._lock(idx):
+                items = list(self._segments[idx].items())
+            yield from items
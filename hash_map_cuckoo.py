@@ -0,0 +1,363 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents an implementation of the HashMap using bucketized
+#               cuckoo hashing with a stash to resolve collisions
+"""
+import time
+
+from hashmap_helpers import (DynamicArray, HashEntry, HashMapMixin, HashMapStats, make_keyed_hash,
+                             resolve_hash_function)
+
+# Rebuilds attempted after an insertion cycle before giving up
+_MAX_REHASHES = 8
+
+
+class HashMap(HashMapMixin):
+    def __init__(self, capacity: int, function, function2=None, bucket_size: int = 4, stash_size: int = 4,
+                 max_load: float = .9, max_kicks: int = 64, *, stats: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution.
+        Every key lives in one of two buckets, one chosen by each hash function, or in a small stash,
+        so a lookup inspects at most 2 * bucket_size + stash_size slots.
+        :param capacity: The initial number of slots, rounded up to a whole number of buckets
+        :param function: The hash function choosing the first bucket
+        :param function2: The hash function choosing the second bucket; defaults to a keyed BLAKE2b hash
+                          whose secret is replaced whenever an insertion cycle forces a rehash
+        :param bucket_size: Number of slots per bucket
+        :param stash_size: Number of keys that may overflow into the stash before the table is rehashed
+        :param max_load: Load factor above which the table doubles
+        :param max_kicks: Number of evictions tried by an insert before it is treated as a cycle
+        :param stats: Record operation counts, probe lengths and resize times (see get_stats)
+        """
+        if not 0 < max_load <= 1:
+            raise ValueError("max_load must be between 0 and 1")
+        if bucket_size < 1:
+            raise ValueError("bucket_size must be positive")
+
+        self._bucket_size = bucket_size
+        self._bucket_count = max(-(-capacity // bucket_size), 1)
+        self._capacity = self._bucket_count * bucket_size
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._stash = []
+        self._stash_size = stash_size
+
+        self._hash_function = resolve_hash_function(function)
+        self._reseed = function2 is None
+        self._hash_function2 = make_keyed_hash() if function2 is None else resolve_hash_function(function2)
+        self._size = 0
+        self._max_load = max_load
+        self._max_kicks = max_kicks
+        self._kick = 0
+
+        # Bumped whenever keys are added, removed or moved, to detect mutation during iteration
+        self._version = 0
+        self._stats = HashMapStats() if stats else None
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        for entry in self._stash:
+            out += 'stash: ' + str(entry) + '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _put_hashed(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Helper method to put/put_many that updates or adds the key/value given the key's hash
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :param hash_value: the first hash of the key
+        :return: None
+        """
+        if self._stats is not None:
+            self._stats.count("put")
+
+        # Entries cache both hashes, so moving an entry never calls a hash function
+        hashes = (hash_value, self._hash_function2(key))
+        container, idx = self._locate(key, hashes)
+        if container is not None:
+            container[idx].value = value
+            return
+
+        if self._size + 1 > self._capacity * self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        entry = self._place(HashEntry(key, value, hashes))
+        if entry is not None:
+            if len(self._stash) < self._stash_size:
+                self._stash.append(entry)
+            else:
+                # Insertion cycle: new hash functions alone are enough at this load,
+                # but fixed hash functions need more buckets to separate the keys
+                new_capacity = self._capacity if self._reseed else self._capacity * 2
+                self._rehash(new_capacity, self._entries() + [entry], True)
+        self._size += 1
+        self._version += 1
+
+    def _place(self, entry: HashEntry) -> HashEntry:
+        """
+        Helper method to put/rehash that inserts an entry known not to be in the table.
+        If both of its buckets are full, a resident entry is evicted to make room and moved to
+        its other bucket, and so on, up to max_kicks times. If that fails the evictions are
+        undone, so the table is as it was and the entry given is the one left without a slot.
+        :param entry: The entry to be placed
+        :return: None if the entry was placed, else the entry
+        """
+        bucket_count = self._bucket_count
+        h1, h2 = entry.hash_value
+        for bucket in (h1 % bucket_count, h2 % bucket_count):
+            idx = self._free_slot(bucket)
+            if idx >= 0:
+                self._buckets[idx] = entry
+                return None
+
+        bucket, path = h1 % bucket_count, []
+        for _ in range(self._max_kicks):
+            # Rotate through the victim slots so that two full buckets do not trade one entry forever
+            idx = bucket * self._bucket_size + self._kick % self._bucket_size
+            self._kick += 1
+            path.append(idx)
+            entry, self._buckets[idx] = self._buckets[idx], entry
+
+            h1, h2 = entry.hash_value
+            bucket = h2 % bucket_count if h1 % bucket_count == bucket else h1 % bucket_count
+            idx = self._free_slot(bucket)
+            if idx >= 0:
+                self._buckets[idx] = entry
+                return None
+
+        for idx in reversed(path):
+            entry, self._buckets[idx] = self._buckets[idx], entry
+        return entry
+
+    def _free_slot(self, bucket: int) -> int:
+        """
+        Helper method that returns the index of the first empty slot in the bucket, else -1
+        """
+        start = bucket * self._bucket_size
+        for idx in range(start, start + self._bucket_size):
+            if self._buckets[idx] is None:
+                return idx
+        return -1
+
+    def _locate(self, key: str, hashes: tuple) -> (object, int):
+        """
+        Helper method that finds key in its two buckets or the stash
+        :param key: The key to be searched
+        :param hashes: Both hashes of the key
+        :return: The array holding the entry (the slots or the stash) and its index, else (None, -1)
+        """
+        bucket_count, bucket_size = self._bucket_count, self._bucket_size
+        container, result, probes = None, -1, 0
+        for bucket in (hashes[0] % bucket_count, hashes[1] % bucket_count):
+            start = bucket * bucket_size
+            for idx in range(start, start + bucket_size):
+                entry = self._buckets[idx]
+                if entry is not None and entry.hash_value == hashes and entry.key == key:
+                    container, result = self._buckets, idx
+                    break
+            if container is not None:
+                break
+            probes += 1
+        else:
+            for idx, entry in enumerate(self._stash):
+                if entry.hash_value == hashes and entry.key == key:
+                    container, result = self._stash, idx
+                    break
+
+        if self._stats is not None:
+            self._stats.record_probe(probes)
+        return container, result
+
+    def _rehash(self, new_capacity: int, entries: list, reseed: bool) -> None:
+        """
+        Helper method to put/resize that rebuilds the table with the given entries.
+        Whenever a rebuild leaves more entries than the stash can hold, the second hash function
+        is replaced (when it is the default keyed hash) and the capacity doubles before trying again.
+        :param new_capacity: The number of slots to try first
+        :param entries: Every entry to be placed
+        :param reseed: Replace the second hash function before the first attempt too
+        :return: None
+        """
+        start = time.perf_counter() if self._stats is not None else None
+        old_state = (self._buckets, self._bucket_count, self._capacity, self._stash, self._hash_function2)
+        old_hashes = [entry.hash_value for entry in entries]
+
+        for _ in range(_MAX_REHASHES):
+            if reseed and self._reseed:
+                self._hash_function2 = make_keyed_hash()
+                for entry in entries:
+                    entry.hash_value = (entry.hash_value[0], self._hash_function2(entry.key))
+            if self._rebuild(new_capacity, entries):
+                self._version += 1
+                if start is not None:
+                    self._stats.record_resize(time.perf_counter() - start)
+                return
+            new_capacity, reseed = new_capacity * 2, True
+
+        self._buckets, self._bucket_count, self._capacity, self._stash, self._hash_function2 = old_state
+        for entry, hashes in zip(entries, old_hashes):
+            entry.hash_value = hashes
+        raise RuntimeError("Cuckoo rehash failed; too many keys share both of their buckets")
+
+    def _rebuild(self, new_capacity: int, entries: list) -> bool:
+        """
+        Helper method to resize/rehash that places every entry in a new table with new_capacity slots
+        :param new_capacity: The new number of slots, rounded up to a whole number of buckets
+        :param entries: The entries to be placed
+        :return: True if every entry was placed, else False
+        """
+        self._bucket_count = max(-(-new_capacity // self._bucket_size), 1)
+        self._capacity = self._bucket_count * self._bucket_size
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._stash = []
+
+        for entry in entries:
+            entry = self._place(entry)
+            if entry is not None:
+                if len(self._stash) >= self._stash_size:
+                    return False
+                self._stash.append(entry)
+        return True
+
+    def _entries(self) -> list:
+        """
+        Helper method that returns every entry in the slots and the stash
+        """
+        entries = [self._buckets[idx] for idx in range(self._capacity) if self._buckets[idx] is not None]
+        return entries + self._stash
+
+    def empty_buckets(self) -> int:
+        """
+        The method returns the number of empty slots in the hash table
+        :return: The number of empty slots
+        """
+        return self._capacity - self._size + len(self._stash)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        The method changes the capacity of the hash table
+        :param new_capacity: The new capacity of the hash table, rounded up to a whole number of buckets
+        :return: None
+        """
+        if new_capacity < self._size or new_capacity < 1:
+            return
+
+        self._rehash(new_capacity, self._entries(), False)
+
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
+        """
+        Helper method that returns the key/value from the hash table, if it exists
+        :param key: The key to be searched
+        :param hash_value: The first hash of the key, computed if not given
+        :return: Returns a key/value pair if in hash table, else (None, None)
+        """
+        if self._stats is not None:
+            self._stats.count("get")
+        hash_value = self._hash_function(key) if hash_value is None else hash_value
+        container, idx = self._locate(key, (hash_value, self._hash_function2(key)))
+        if container is None:
+            return (None, None)
+        return (container[idx].key, container[idx].value)
+
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/remove_many that removes the key given its first hash.
+        A slot freed in the table is offered to the stashed entries, which keeps the stash short.
+        :param key: The key to be removed
+        :param hash_value: The first hash of the key
+        :return: True if the key was removed, else False
+        """
+        if self._stats is not None:
+            self._stats.count("remove")
+        container, idx = self._locate(key, (hash_value, self._hash_function2(key)))
+        if container is None:
+            return False
+
+        if container is self._stash:
+            self._stash.pop(idx)
+        else:
+            self._buckets[idx] = None
+            bucket = idx // self._bucket_size
+            for stash_idx, entry in enumerate(self._stash):
+                h1, h2 = entry.hash_value
+                if bucket in (h1 % self._bucket_count, h2 % self._bucket_count):
+                    self._buckets[idx] = self._stash.pop(stash_idx)
+                    break
+
+        self._size -= 1
+        self._version += 1
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def _reserve(self, count: int) -> None:
+        """
+        Helper method to put_many that doubles the capacity as many times as needed
+        to add count keys without exceeding max_load, with a single resize.
+        :param count: The number of keys about to be added
+        :return: None
+        """
+        new_capacity = self._capacity
+        while self._size + count > new_capacity * self._max_load:
+            new_capacity *= 2
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+
+    def clear(self) -> None:
+        """
+        The method clears the contents of the hash map.
+        :return: None
+        """
+        version, stats = self._version, self._stats
+        self.__init__(self._capacity, self._hash_function, None if self._reseed else self._hash_function2,
+                      self._bucket_size, self._stash_size, self._max_load, self._max_kicks)
+        self._version, self._stats = version + 1, stats
+
+    def get_buckets(self) -> DynamicArray:
+        """
+        The method returns the hash array; bucket b is slots b * bucket_size up to (b + 1) * bucket_size.
+        Entries in the stash are not included.
+        :return: The hash array
+        """
+        return self._buckets
+
+    def get_stash(self) -> list:
+        """
+        The method returns a copy of the entries held in the stash
+        :return: A list of entries
+        """
+        return list(self._stash)
+
+    def _stats_fields(self) -> dict:
+        """
+        Helper method to get_stats that reports the stash length along with the size and capacity
+        """
+        return {"size": self._size, "capacity": self._capacity, "stash": len(self._stash)}
+
+    # ------------------------------------------------------------------ #
+
+    def _iter_items(self):
+        """
+        Helper generator that walks the slots and then the stash in place, yielding (key, value) pairs.
+        Raises RuntimeError if keys are added or removed while iterating.
+        """
+        version = self._version
+        for idx in range(self._capacity):
+            entry = self._buckets[idx]
+            if entry is not None:
+                yield (entry.key, entry.value)
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
+        for idx in range(len(self._stash)):
+            entry = self._stash[idx]
+            yield (entry.key, entry.value)
+            if self._version != version:
+                raise RuntimeError("HashMap changed size during iteration")
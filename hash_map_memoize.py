@@ -0,0 +1,166 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program memoizes functions with a decorator that stores their results in a
+#               chaining or open addressing HashMap, evicting old results once it is full
+"""
+import functools
+import threading
+import types
+
+from hash_map_oa import HashMap as HashMapOA
+from hash_map_sc import HashMap as HashMapSC
+from hashmap_helpers import CacheNode, CacheStats, RecencyList, builtin_hash, resolve_hash_function
+
+EVICTION_POLICIES = ("lru", "fifo")
+
+# Separates the positional from the keyword arguments in a key
+_KWARGS_MARK = object()
+
+
+def _make_key(args: tuple, kwargs: dict, typed: bool) -> tuple:
+    """
+    Return the cache key for a call: the positional arguments, then the keyword arguments
+    in the order given, then the argument types if typed
+    """
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(kwargs.items())
+    if typed:
+        key += tuple(type(arg) for arg in args) + tuple(type(value) for value in kwargs.values())
+    return key
+
+
+def _next_prime(n: int) -> int:
+    """Return the smallest prime that is at least n."""
+    n = max(n, 2)
+    while any(n % factor == 0 for factor in range(2, int(n ** .5) + 1)):
+        n += 1
+    return n
+
+
+def memoize(maxsize: int = 128, *, map_class=HashMapSC, capacity: int = None, eviction: str = "lru",
+            function=builtin_hash, typed: bool = False, bypass: str = "bypass_cache"):
+    """
+    Decorator that caches a function's results by its arguments in a HashMap.
+    Used as @memoize or @memoize(...). The arguments must be hashable by function.
+    :param maxsize: The most results kept; None keeps every result
+    :param map_class: hash_map_sc.HashMap or hash_map_oa.HashMap
+    :param capacity: The initial capacity of the map; by default it is sized for maxsize
+    :param eviction: "lru" to evict the least recently used result, or "fifo" the oldest
+    :param function: The hash function for the argument keys
+    :param typed: Cache arguments of different types separately, e.g. f(1) and f(1.0)
+    :param bypass: The name of a keyword argument that, when true, calls the function without
+                   the cache (the argument is not passed on); None to disable
+    :return: The decorator, or the memoized function when used without arguments
+    """
+    if callable(maxsize):
+        return memoize()(maxsize)
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be positive or None")
+    if eviction not in EVICTION_POLICIES:
+        raise ValueError(f"Unknown eviction {eviction!r}; expected one of {EVICTION_POLICIES}")
+    if not issubclass(map_class, (HashMapSC, HashMapOA)):
+        raise TypeError(f"Cannot memoize with {map_class.__name__}")
+
+    def decorator(user_function) -> MemoizedFunction:
+        return MemoizedFunction(user_function, maxsize, map_class, capacity, eviction, function, typed, bypass)
+    return decorator
+
+
+class MemoizedFunction:
+    """
+    A function wrapped by memoize. Results are stored as CacheNodes in the HashMap and linked
+    in use order, so lookups and evictions are O(1). One lock guards the map; the function
+    itself runs outside it, so concurrent calls for the same missing key may each compute it.
+    """
+
+    def __init__(self, user_function, maxsize: int, map_class, capacity: int, eviction: str,
+                 function, typed: bool, bypass: str) -> None:
+        """
+        Initialize the wrapper; memoize checks the parameters
+        """
+        functools.update_wrapper(self, user_function)
+
+        self._function = user_function
+        self._maxsize = maxsize
+        self._map_class = map_class
+        self._capacity = capacity
+        self._lru = eviction == "lru"
+        self._hash_function = resolve_hash_function(function)
+        self._typed = typed
+        self._bypass = bypass
+        self._lock = threading.RLock()
+        self.cache_clear()
+
+    def _new_map(self):
+        """
+        Helper method that returns an empty map. A chaining map doubles once it is fully loaded.
+        An open addressing map defaults to a prime capacity of over 4 * maxsize: live keys and
+        tombstones then fill at most half of it, so it never resizes and quadratic probing
+        always reaches an empty slot.
+        """
+        expected = min(self._maxsize or 11, 1 << 16)
+        if issubclass(self._map_class, HashMapSC):
+            return self._map_class(self._capacity or expected, self._hash_function, max_load=1.0)
+        return self._map_class(self._capacity or _next_prime(4 * expected + 1), self._hash_function)
+
+    def __get__(self, instance, owner=None):
+        """
+        Bind the memoized function to instance when it decorates a method
+        """
+        return self if instance is None else types.MethodType(self, instance)
+
+    def __call__(self, *args, **kwargs) -> object:
+        """
+        Return the cached result for the arguments, calling the function on a miss
+        """
+        if self._bypass is not None and kwargs.pop(self._bypass, False):
+            return self._function(*args, **kwargs)
+
+        key = _make_key(args, kwargs, self._typed)
+        with self._lock:
+            node = self._map.get(key)
+            if node is not None:
+                self._stats.hits += 1
+                if self._lru:
+                    self._recency.move_to_front(node)
+                return node.value
+            self._stats.misses += 1
+
+        result = self._function(*args, **kwargs)
+        with self._lock:
+            # Another thread may have stored the key while the function ran
+            if self._map.get(key) is None:
+                node = CacheNode(key, result)
+                self._map.put(key, node)
+                self._recency.push_front(node)
+                if self._maxsize is not None and self._map.get_size() > self._maxsize:
+                    victim = self._recency.oldest()
+                    self._recency.unlink(victim)
+                    self._map.remove(victim.key)
+                    self._stats.evictions += 1
+        return result
+
+    def cache_info(self) -> dict:
+        """
+        The method returns the hit and miss counts with the size and load of the map, for tuning maxsize
+        :return: A dict of plain values, suitable for exporting
+        """
+        with self._lock:
+            return {
+                **self._stats.snapshot(),
+                "size": self._map.get_size(),
+                "maxsize": self._maxsize,
+                "capacity": self._map.get_capacity(),
+                "table_load": self._map.table_load(),
+            }
+
+    def cache_clear(self) -> None:
+        """
+        The method discards every cached result and zeroes the counts
+        """
+        with self._lock:
+            self._map = self._new_map()
+            self._recency = RecencyList()
+            self._stats = CacheStats()
@@ -0,0 +1,172 @@
+"""
+# Description:  Open addressing HashMap with vectorized NumPy lookups for arrays of
+#               integer or fixed-width string keys. NumPy is optional: without it the
+#               module still imports and the scalar put/get/remove methods work.
+"""
+import time
+from operator import eq
+
+from hash_map_oa import CompactHashMap, _EMPTY, _FULL, _HASH_MASK
+from hashmap_helpers import fnv1a_hash, hash_function_2, int_hash, _FNV_OFFSET_BASIS, _FNV_PRIME
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _int_hash_array(keys):
+    """Vectorized int_hash for an integer array; uint64 arithmetic wraps like the masked scalar version."""
+    z = keys.astype(np.uint64) + np.uint64(0x9e3779b97f4a7c15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return z ^ (z >> np.uint64(31))
+
+
+def _fnv1a_array(keys):
+    """Vectorized fnv1a_hash; hashes one byte column at a time across all keys."""
+    encoded = np.char.encode(keys.astype(str), 'utf-8')
+    lengths = np.char.str_len(encoded)
+    width = encoded.dtype.itemsize
+    columns = np.frombuffer(encoded.tobytes(), dtype=np.uint8).reshape(len(encoded), width)
+
+    hashes = np.full(len(encoded), _FNV_OFFSET_BASIS, dtype=np.uint64)
+    prime = np.uint64(_FNV_PRIME)
+    for col in range(width):
+        active = lengths > col
+        hashes[active] = (hashes[active] ^ columns[active, col]) * prime
+    return hashes
+
+
+def _vector_hash(function, keys):
+    """
+    Return the uint64 hashes of an array of keys, vectorized when the map uses
+    int_hash (integer keys) or fnv1a_hash, else by calling the hash function per key.
+    """
+    if function is int_hash and keys.dtype.kind in 'iub':
+        return _int_hash_array(keys)
+    if function is fnv1a_hash and keys.dtype.kind in 'iuUO':
+        return _fnv1a_array(keys)
+    return np.fromiter((function(key) & _HASH_MASK for key in keys.tolist()), dtype=np.uint64, count=len(keys))
+
+
+class NumpyHashMap(CompactHashMap):
+    """
+    Compact open addressing HashMap with array methods (get_array, contains_array, put_array)
+    that hash and probe a whole NumPy array of keys at once, using the same quadratic
+    probe sequence (with its linear fallback) as the scalar methods. Use int_hash or
+    fnv1a_hash as the hash function to have the hashing vectorized too.
+    """
+
+    def __init__(self, capacity: int, function=int_hash, incremental: bool = False, rehash_step: int = 4, *,
+                 compact: bool = True, tombstone_ratio: float = .25, stats: bool = False,
+                 clock=time.monotonic, probe: str = "quadratic", step_function=hash_function_2) -> None:
+        """
+        Initialize new NumpyHashMap that uses
+        quadratic probing for collision resolution; the array methods follow only the
+        quadratic sequence, so probe accepts no other strategy
+        """
+        if probe != "quadratic":
+            raise ValueError(f"NumpyHashMap only supports quadratic probing, not {probe!r}")
+        super().__init__(capacity, function, incremental, rehash_step, compact=compact,
+                         tombstone_ratio=tombstone_ratio, stats=stats, clock=clock, probe=probe,
+                         step_function=step_function)
+
+    def _lookup_array(self, keys):
+        """
+        Helper method that probes for every key at once.
+        :param keys: A NumPy array of keys
+        :return: A tuple of (positions, slots) arrays for the keys that were found
+        """
+        if np is None:
+            raise ImportError("NumPy is required for NumpyHashMap array methods")
+
+        capacity = np.uint64(self._capacity)
+        ctrl = np.frombuffer(self._ctrl, dtype=np.uint8)
+        stored_hashes = np.frombuffer(self._hashes, dtype=np.uint64)
+        stored_keys, query = self._keys, keys.tolist()
+
+        hashes = _vector_hash(self._hash_function, keys)
+        base = hashes % capacity
+        pending = np.arange(len(keys))
+        found_positions, found_slots = [], []
+
+        # Quadratic Probing: i = (initial index + j^2) % capacity, advanced for every pending key at once.
+        # Like the scalar probe, it continues linearly after capacity probes and gives up after
+        # 2 * capacity, so every slot is visited. Reducing both terms first keeps the sum in range.
+        j, limit = 0, self._capacity
+        while pending.size and j < 2 * limit:
+            offset = j * j if j < limit else (limit - 1) ** 2 + j - limit + 1
+            offset = np.uint64(offset % limit)
+            slots = ((base[pending] + offset) % capacity).astype(np.intp)
+            states = ctrl[slots]
+
+            # Only slots whose cached hash matches have their keys compared
+            candidates = np.flatnonzero((states == _FULL) & (stored_hashes[slots] == hashes[pending]))
+            cand_positions, cand_slots = pending[candidates], slots[candidates]
+            equal = np.fromiter(map(eq, [stored_keys[slot] for slot in cand_slots.tolist()],
+                                    [query[position] for position in cand_positions.tolist()]),
+                                dtype=bool, count=candidates.size)
+            found_positions.append(cand_positions[equal])
+            found_slots.append(cand_slots[equal])
+
+            matched = np.zeros(pending.size, dtype=bool)
+            matched[candidates[equal]] = True
+            pending = pending[~matched & (states != _EMPTY)]
+            j += 1
+
+        if not found_positions:
+            return (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+        return (np.concatenate(found_positions), np.concatenate(found_slots))
+
+    def get_array(self, keys, default=None):
+        """
+        The method returns the values associated with an array of keys
+        :param keys: An array-like of keys
+        :param default: The value reported for keys that are not found
+        :return: A tuple of (values, found) arrays; values has dtype object
+        """
+        keys = np.asarray(keys) if np is not None else keys
+        positions, slots = self._lookup_array(keys)
+
+        values = np.full(len(keys), default, dtype=object)
+        found = np.zeros(len(keys), dtype=bool)
+        stored_values = self._values
+        values[positions] = [stored_values[slot] for slot in slots.tolist()]
+        found[positions] = True
+        return (values, found)
+
+    def contains_array(self, keys):
+        """
+        The method returns a mask of which keys in an array are in the hash map
+        :param keys: An array-like of keys
+        :return: A boolean array, True where the key is found
+        """
+        keys = np.asarray(keys) if np is not None else keys
+        positions, _ = self._lookup_array(keys)
+        found = np.zeros(len(keys), dtype=bool)
+        found[positions] = True
+        return found
+
+    def put_array(self, keys, values) -> None:
+        """
+        The method adds or updates a key/value pair for each element of two arrays,
+        hashing the keys in one vectorized pass and sizing the table once
+        :param keys: An array-like of keys
+        :param values: An array-like of values, the same length as keys
+        :return: None
+        """
+        if np is None:
+            raise ImportError("NumPy is required for NumpyHashMap array methods")
+        keys = np.asarray(keys)
+        if len(keys) != len(values):
+            raise ValueError("keys and values must have the same length")
+
+        hashes = _vector_hash(self._hash_function, keys).tolist()
+        values = values.tolist() if isinstance(values, np.ndarray) else list(values)
+        self._reserve(len(keys))
+
+        # Slots depend on earlier inserts in the batch, so placement is sequential
+        put = self._put_hashed
+        for key, value, hash_value in zip(keys.tolist(), values, hashes):
+            put(key, value, hash_value)
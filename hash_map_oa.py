@@ -2,30 +2,131 @@
 # Name:         Josh Harris
 # Course:       Data Structures
 # Description:  The program represents an implementation of the HashMap using open
-#               addressing with quadratic probing to resolve collisions
+#               addressing with quadratic (or linear, triangular or double hashing)
+#               probing to resolve collisions
 """
-from hashmap_helpers import (DynamicArray, HashEntry,
-                             hash_function_1, hash_function_2)
+import time
+from array import array
 
+from hashmap_helpers import (DynamicArray, HashEntry, HashMapMixin, HashMapStats, TimerWheel, hash_function_2,
+                             resolve_hash_function)
 
-class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+# Control byte states for the compact storage backend
+_EMPTY, _FULL, _TOMBSTONE = 0, 1, 2
+_HASH_MASK = (1 << 64) - 1
+
+
+# Probe sequences by name: (a, b, power of two). Probe j moves a + b * j slots on from probe
+# j - 1, so the offset from the initial index is j * a + b * j(j + 1) / 2:
+#   linear      offsets j, which visit every slot
+#   quadratic   offsets j^2, which visit every slot only for some capacities
+#   triangular  offsets j(j + 1) / 2, which visit every slot of a power of two capacity
+#   double      offsets j * step, with an odd step from a second hash of the key (a is None),
+#               which visit every slot of a power of two capacity
+PROBE_STRATEGIES = {
+    "linear": (1, 0, False),
+    "quadratic": (-1, 2, False),
+    "triangular": (0, 1, True),
+    "double": (None, 0, True),
+}
+
+
+class HashMap(HashMapMixin):
+    def __new__(cls, *args, compact: bool = False, **kwargs):
         """
-        Initialize new HashMap that uses
-        quadratic probing for collision resolution
+        Return a CompactHashMap when the compact storage backend is requested
+        """
+        if compact and cls is HashMap:
+            cls = CompactHashMap
+        return super().__new__(cls)
+
+    def __init__(self, capacity: int, function, incremental: bool = False, rehash_step: int = 4, *,
+                 compact: bool = False, tombstone_ratio: float = .25, stats: bool = False,
+                 clock=time.monotonic, probe: str = "quadratic", step_function=hash_function_2) -> None:
         """
+        Initialize new HashMap that uses
+        quadratic probing (or another probe strategy) for collision resolution
+        :param capacity: The initial number of slots
+        :param function: The hash function
+        :param incremental: Migrate slots a few at a time during put/get/remove instead of all at once
+        :param rehash_step: Number of old slots migrated per operation while a resize is pending
+        :param compact: Store entries in flat parallel arrays instead of HashEntry objects
+        :param tombstone_ratio: Fraction of slots holding tombstones that triggers an in-place rehash;
+                                None disables compaction
+        :param stats: Record operation counts, probe lengths and resize times (see get_stats)
+        :param clock: Returns the current time in seconds, for keys put with a ttl
+        :param probe: The probe sequence, one of PROBE_STRATEGIES: "linear", "quadratic",
+                      "triangular" or "double" (double hashing); the last two round the
+                      capacity up to a power of two
+        :param step_function: The second hash, of the key, that gives the step for double hashing
+        """
+        capacity = self._init_probe(capacity, probe, step_function)
         self._buckets = DynamicArray()
         for _ in range(capacity):
             self._buckets.append(None)
 
         self._capacity = capacity
-        self._hash_function = function
+        self._hash_function = resolve_hash_function(function)
         self._size = 0
+        self._tombstones = 0
+        self._tombstone_ratio = tombstone_ratio
+
+        # Incremental resize state; _old_buckets is None unless a migration is pending
+        self._incremental = incremental
+        self._rehash_step = max(rehash_step, 1)
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_idx = 0
+
+        # Bumped whenever keys are added, removed or moved, to detect mutation during iteration
+        self._version = 0
+        self._stats = HashMapStats() if stats else None
+
+        # Timers for keys put with a ttl; created by the first such put
+        self._clock = clock
+        self._wheel = None
+
+    def _init_probe(self, capacity: int, probe: str, step_function) -> int:
+        """
+        Helper method to __init__ that selects the probe strategy
+        :return: The capacity, rounded up to a power of two if the strategy needs one
+        """
+        if probe not in PROBE_STRATEGIES:
+            raise ValueError(f"Unknown probe {probe!r}; expected one of {sorted(PROBE_STRATEGIES)}")
+        self._probe_name = probe
+        self._probe_a, self._probe_b, self._power_of_two = PROBE_STRATEGIES[probe]
+        self._step_function = resolve_hash_function(step_function)
+        return self._round_capacity(capacity)
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that rounds capacity up to a power of two if the probe strategy needs one
+        """
+        if self._power_of_two and capacity > 0:
+            return 1 << (capacity - 1).bit_length()
+        return capacity
+
+    def _probe_terms(self, key: str) -> (int, int):
+        """
+        Helper method that returns the terms (a, b) of the probe sequence for key: probe j is
+        a + b * j slots on from probe j - 1. After capacity probes the sequence continues
+        linearly, so that even quadratic probing reaches every slot of any capacity.
+        """
+        if self._probe_a is None:
+            return (self._step_function(key) | 1, 0)
+        return (self._probe_a, self._probe_b)
+
+    def get_probe(self) -> str:
+        """
+        The method returns the name of the probe strategy used by the hash map
+        """
+        return self._probe_name
 
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
         """
+        self.complete_resize()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -35,62 +136,134 @@ class HashMap:
         """
         Return size of map
         """
+        if self._wheel is not None:
+            self._expire()
         return self._size
 
-    def get_capacity(self) -> int:
-        """
-        Return capacity of map
-        """
-        return self._capacity
-
     # ------------------------------------------------------------------ #
 
-    def put(self, key: str, value: object) -> None:
+    def put(self, key: str, value: object, ttl: float = None) -> None:
         """
         The method updates the key/value pair for an existing key, or adds the key/value to the hash map
         :param key: the key to be updated or added ot the hashmap
         :param value: the value to be added or updated
+        :param ttl: Seconds until the key expires; None (the default) keeps it until it is removed,
+                    and also clears any ttl the key had
         :return: None
         """
-        # If the load factor is greater than or equal to 0.5,
-        # resize the table before inserting the new key/value pair
-        if self.table_load() >= .5:
-            self.resize_table(self._capacity * 2)
+        if self._wheel is not None:
+            self._expire()
+        hash_value = self._hash_function(key)
+        if ttl is None:
+            self._put_hashed(key, value, hash_value)
+        else:
+            self._put_hashed(key, value, hash_value, self._schedule(key, hash_value, ttl))
+
+    def _put_hashed(self, key: str, value: object, hash_value: int, expires: float = None) -> None:
+        """
+        Helper method to put/put_many that updates or adds the key/value given the key's hash
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :param hash_value: the hash of the key
+        :param expires: The clock time at which the key expires, else None
+        :return: None
+        """
+        if self._stats is not None:
+            self._stats.count("put")
+        if self._old_buckets is not None:
+            self._migrate_buckets()
+
+        # Grow first: a resize started here moves the key (if present) into the old table,
+        # so the lookup below must come after it or the key would be inserted twice
+        self._make_room()
+        if self._old_buckets is not None:
+            old_index = self._old_index(key, hash_value)
+            if old_index is not None:
+                self._old_buckets[old_index].value = value
+                self._old_buckets[old_index].expires = expires
+                return
 
         # Hash and insert/update
-        hash_index = self._probe_index(key, self._buckets, self._capacity)
-        if self._buckets[hash_index] is None or self._buckets[hash_index].is_tombstone:
+        hash_index = self._probe_index(key, self._buckets, self._capacity, hash_value=hash_value)
+        entry = self._buckets[hash_index]
+        if entry is None or entry.is_tombstone:
             self._size += 1
-        self._buckets[hash_index] = HashEntry(key, value)
+            self._version += 1
+            if entry is not None:
+                self._tombstones -= 1
+        self._buckets[hash_index] = HashEntry(key, value, hash_value, expires)
+
+    def _make_room(self) -> None:
+        """
+        Helper method to put that compacts or grows the table before an insert.
+        Tombstones lengthen probe sequences like live keys do, so they count towards the 0.5 threshold.
+        :return: None
+        """
+        self._compact_tombstones()
+
+        # If the load factor (including tombstones) is greater than or equal to 0.5,
+        # resize the table before inserting the new key/value pair
+        if (self._size + self._tombstones) / self._capacity >= .5:
+            self.resize_table(self._capacity * 2)
+
+    def _compact_tombstones(self) -> None:
+        """
+        Helper method that rehashes the table in place once tombstones exceed the tombstone ratio.
+        :return: None
+        """
+        if self._tombstone_ratio is not None and self._tombstones > self._capacity * self._tombstone_ratio:
+            self.resize_table(self._capacity)
 
-    def _probe_index(self, key: str, da: DynamicArray, capacity, remove=False) -> int:
+    def _probe_index(self, key: str, da: DynamicArray, capacity, remove=False, hash_value: int = None,
+                     record: bool = True) -> int:
         """
         Helper method to put/resize/remove that returns a hash index after probing for collisions
-        via quadratic probing.
+        along the key's probe sequence.
         :param key: The key to be hashed
         :param da: The hash table array
         :param capacity: The capacity of the hash table
         :param remove: Indicates helping remove method
-        :return: The hash index
+        :param hash_value: The cached hash of the key, computed if not given
+        :param record: Count the probe length in the stats; False when rehashing or expiring
+        :return: The hash index of the key, else of the slot to put it in; -1 if there is none
         """
-        # Quadratic Probing: i = (initial index + j^2) % capacity
-        initial_idx = self._hash_function(key)
+        initial_idx = self._hash_function(key) if hash_value is None else hash_value
         j = 0
 
-        # Determine hash index for put/resize/remove methods
-        hash_index = (initial_idx + j ** 2) % capacity
+        # Determine hash index for put/resize/remove methods; stored hashes are
+        # compared first so most mismatching keys are never compared directly.
+        # A put reuses the first tombstone, but only after probing on to rule out
+        # a live copy of the key further along the sequence.
+        first_tombstone = None
+        a, b = self._probe_terms(key)
+        hash_index = initial_idx % capacity
         while da[hash_index] is not None:
-            if da[hash_index].key == key or (da[hash_index].is_tombstone and not remove):
-                return hash_index
+            entry = da[hash_index]
+            if entry.is_tombstone:
+                if first_tombstone is None and not remove:
+                    first_tombstone = hash_index
+            elif entry.hash_value == initial_idx and entry.key == key:
+                first_tombstone = None
+                break
             j += 1
-            hash_index = (initial_idx + j ** 2) % capacity
-        return hash_index
+            if j >= capacity:
+                if j == 2 * capacity:
+                    hash_index = -1
+                    break
+                a, b = 1, 0
+            hash_index = (hash_index + a + b * j) % capacity
+
+        if record and self._stats is not None:
+            self._stats.record_probe(j)
+        return hash_index if first_tombstone is None else first_tombstone
 
     def table_load(self) -> float:
         """
         The method returns the current load factor of the hash table
         :return: The load factor of the hash table
         """
+        if self._wheel is not None:
+            self._expire()
         return self._size / self._capacity
 
     def empty_buckets(self) -> int:
@@ -98,7 +271,9 @@ class HashMap:
         The method returns the number of empty buckets in the hash table
         :return: The number of empty buckets
         """
-        return self._capacity - self._size
+        if self._wheel is not None:
+            self._expire()
+        return self._capacity - self._size - self._tombstones
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -106,18 +281,110 @@ class HashMap:
         :param new_capacity: The new capacity of the hash table
         :return: None
         """
+        new_capacity = self._round_capacity(new_capacity)
         if new_capacity < self._size or new_capacity < 1:
             return
 
-        new_hash = HashMap(new_capacity, self._hash_function)
+        # Quadratic probing is only sure to reach a free slot while the load stays below 0.5
+        while self._size / new_capacity >= .5:
+            new_capacity *= 2
+
+        # Only one migration may be pending at a time
+        self.complete_resize()
+        self._tombstones = 0
+        self._version += 1
+        start = time.perf_counter() if self._stats is not None else None
+
+        if self._incremental:
+            # Keep the old table around; slots move over in _migrate_buckets
+            self._old_buckets, self._old_capacity = self._buckets, self._capacity
+            self._rehash_idx = 0
+            self._buckets, self._capacity = DynamicArray([None] * new_capacity), new_capacity
+            if start is not None:
+                self._stats.record_resize(time.perf_counter() - start)
+            return
+
+        new_hash = DynamicArray([None] * new_capacity)
 
-        # Rehash keys for new hash table
+        # Rehash keys for new hash table, reusing each entry and its cached hash
         for idx in range(self._capacity):
-            if (self._buckets[idx] is not None) and (not self._buckets[idx].is_tombstone):
-                new_hash.put(self._buckets[idx].key, self._buckets[idx].value)
+            entry = self._buckets[idx]
+            if entry is not None and not entry.is_tombstone:
+                hash_index = self._probe_index(entry.key, new_hash, new_capacity, hash_value=entry.hash_value,
+                                               record=False)
+                new_hash[hash_index] = entry
+
+        self._buckets, self._capacity = new_hash, new_capacity
+        if start is not None:
+            self._stats.record_resize(time.perf_counter() - start)
 
-        self._buckets = new_hash.get_buckets()
-        self._capacity = new_hash.get_capacity()
+    def _migrate_buckets(self, count: int = None) -> None:
+        """
+        Helper method that moves up to count slots from the old table into the current one
+        while an incremental resize is pending. Migrated slots are left in place so that probe
+        sequences through the old table stay intact; _old_index skips them instead.
+        :param count: The number of old slots to migrate, defaults to the rehash step
+        :return: None
+        """
+        count = self._rehash_step if count is None else count
+        stop = min(self._rehash_idx + count, self._old_capacity)
+        start = time.perf_counter() if self._stats is not None else None
+
+        for idx in range(self._rehash_idx, stop):
+            entry = self._old_buckets[idx]
+            if entry is not None and not entry.is_tombstone:
+                hash_index = self._probe_index(entry.key, self._buckets, self._capacity,
+                                               hash_value=entry.hash_value, record=False)
+                if self._buckets[hash_index] is not None:
+                    self._tombstones -= 1
+                self._buckets[hash_index] = entry
+
+        if start is not None:
+            self._stats.record_resize(time.perf_counter() - start, started=False)
+        self._rehash_idx = stop
+        if self._rehash_idx >= self._old_capacity:
+            self._old_buckets, self._old_capacity = None, 0
+
+    def _old_index(self, key: str, hash_value: int) -> int:
+        """
+        Helper method that returns the index of key in the old table of a pending resize
+        :param key: The key to be searched
+        :param hash_value: The hash of the key
+        :return: The index of the live, not yet migrated entry, else None
+        """
+        if self._old_buckets is None:
+            return None
+
+        a, b = self._probe_terms(key)
+        capacity = self._old_capacity
+        j = 0
+
+        hash_index = hash_value % capacity
+        while self._old_buckets[hash_index] is not None and j < 2 * capacity:
+            entry = self._old_buckets[hash_index]
+            if (hash_index >= self._rehash_idx and entry.hash_value == hash_value
+                    and entry.key == key and not entry.is_tombstone):
+                return hash_index
+            j += 1
+            if j >= capacity:
+                a, b = 1, 0
+            hash_index = (hash_index + a + b * j) % capacity
+        return None
+
+    def complete_resize(self) -> None:
+        """
+        The method finishes any pending incremental resize in one call.
+        :return: None
+        """
+        if self._old_buckets is not None:
+            self._migrate_buckets(self._old_capacity)
+
+    def is_resizing(self) -> bool:
+        """
+        The method returns True while an incremental resize is pending.
+        :return: True if slots remain to be migrated, else False
+        """
+        return self._old_buckets is not None
 
     def get(self, key: str) -> object:
         """
@@ -125,26 +392,83 @@ class HashMap:
         :param key: The key to be searched
         :return: Returns the value associated with the given key, else returns None if not found
         """
+        if self._wheel is not None:
+            self._expire()
         return self._get_key_value(key)[1]
 
-    def _get_key_value(self, key: str) -> (str, object):
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
         """
-        Helper method that returns the key/value from the hash table, if it exists
+        Helper method that returns the key/value from the hash table, if it exists.
+        A key whose ttl has passed is not found, even before its timer tombstones it.
         :param key: The key to be searched
+        :param hash_value: The hash of the key, computed if not given
         :return: Returns a key/value pair if in hash table, else None
         """
-        # Quadratic Probing: i = (initial index + j^2) % capacity
-        initial_idx = self._hash_function(key)
+        initial_idx = self._hash_function(key) if hash_value is None else hash_value
         j = 0
 
-        # Search for key in hash table
-        hash_index = (initial_idx + j ** 2) % self._capacity
-        while self._buckets[hash_index] is not None:
-            if self._buckets[hash_index].key == key and not self._buckets[hash_index].is_tombstone:
-                return (self._buckets[hash_index].key, self._buckets[hash_index].value)
-            j += 1
-            hash_index = (initial_idx + j ** 2) % self._capacity
-        return (None, None)
+        if self._stats is not None:
+            self._stats.count("get")
+        found = None
+        if self._old_buckets is not None:
+            self._migrate_buckets()
+            old_index = self._old_index(key, initial_idx)
+            if old_index is not None:
+                found = self._old_buckets[old_index]
+
+        # Search for key in hash table, comparing cached hashes before keys
+        if found is None:
+            a, b = self._probe_terms(key)
+            capacity = self._capacity
+            hash_index = initial_idx % capacity
+            while self._buckets[hash_index] is not None and j < 2 * capacity:
+                entry = self._buckets[hash_index]
+                if entry.hash_value == initial_idx and entry.key == key and not entry.is_tombstone:
+                    found = entry
+                    break
+                j += 1
+                if j >= capacity:
+                    a, b = 1, 0
+                hash_index = (hash_index + a + b * j) % capacity
+
+            if self._stats is not None:
+                self._stats.record_probe(j)
+
+        if found is None or (found.expires is not None and found.expires <= self._clock()):
+            return (None, None)
+        return (found.key, found.value)
+
+    def _schedule(self, key: str, hash_value: int, ttl: float) -> float:
+        """
+        Helper method to put that starts a timer for key to expire after ttl seconds
+        :return: The clock time at which the key expires
+        """
+        now = self._clock()
+        if self._wheel is None:
+            self._wheel = TimerWheel(now)
+        expires = now + ttl
+        self._wheel.schedule(expires, (key, hash_value, expires))
+        return expires
+
+    def _expire(self) -> None:
+        """
+        Helper method that tombstones the keys whose timers have fired, then compacts the
+        tombstones if there are now too many. A timer is ignored if its key has since been
+        removed or put again, which gives the key a new expiry (or none).
+        :return: None
+        """
+        removed = False
+        for key, hash_value, expires in self._wheel.advance(self._clock()):
+            old_index = self._old_index(key, hash_value)
+            if old_index is not None:
+                entry = self._old_buckets[old_index]
+            else:
+                hash_index = self._probe_index(key, self._buckets, self._capacity, True, hash_value, record=False)
+                entry = self._buckets[hash_index] if hash_index >= 0 else None
+            if entry is not None and not entry.is_tombstone and entry.key == key and entry.expires == expires:
+                removed = self._remove_hashed(key, hash_value) or removed
+        if removed:
+            self._compact_tombstones()
 
     def contains_key(self, key: str) -> bool:
         """
@@ -152,8 +476,10 @@ class HashMap:
         :param: the key to be found
         :return: Returns True if the key is found, else False
         """
+        if self._wheel is not None:
+            self._expire()
         key_val, value = self._get_key_value(key)
-        return True if key_val else False
+        return key_val is not None
 
     def remove(self, key: str) -> None:
         """
@@ -161,29 +487,133 @@ class HashMap:
         :param key: The key to be removed
         :return: None
         """
-        hash_index = self._probe_index(key, self._buckets, self._capacity, True)
+        if self._wheel is not None:
+            self._expire()
+        if self._remove_hashed(key, self._hash_function(key)):
+            self._compact_tombstones()
 
-        if self._buckets[hash_index] and not self._buckets[hash_index].is_tombstone:
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/remove_many that tombstones the key given its hash.
+        Compaction is left to the caller so that batches only compact once.
+        :param key: The key to be removed
+        :param hash_value: The hash of the key
+        :return: True if the key was removed, else False
+        """
+        if self._stats is not None:
+            self._stats.count("remove")
+        if self._old_buckets is not None:
+            self._migrate_buckets()
+            old_index = self._old_index(key, hash_value)
+            if old_index is not None:
+                self._old_buckets[old_index].is_tombstone = True
+                self._size -= 1
+                self._version += 1
+                return True
+
+        hash_index = self._probe_index(key, self._buckets, self._capacity, True, hash_value)
+
+        if hash_index >= 0 and self._buckets[hash_index] and not self._buckets[hash_index].is_tombstone:
             self._buckets[hash_index].is_tombstone = True
             self._size -= 1
+            self._tombstones += 1
+            self._version += 1
+            return True
+        return False
+
+    # ------------------------------------------------------------------ #
+
+    def put_many(self, pairs) -> None:
+        """
+        The method adds or updates every key/value pair in pairs, sizing the table once up front
+        :param pairs: An iterable of (key, value) pairs
+        :return: None
+        """
+        if self._wheel is not None:
+            self._expire()
+        pairs = list(pairs)
+        self._reserve(len(pairs))
+
+        put, hash_function = self._put_hashed, self._hash_function
+        for key, value in pairs:
+            put(key, value, hash_function(key))
+
+    def get_many(self, keys) -> list:
+        """
+        The method returns the values associated with each of the given keys
+        :param keys: An iterable of keys
+        :return: A list with the value for each key, or None where a key is not found
+        """
+        if self._wheel is not None:
+            self._expire()
+        get, hash_function = self._get_key_value, self._hash_function
+        return [get(key, hash_function(key))[1] for key in keys]
+
+    def contains_many(self, keys) -> list:
+        """
+        The method returns whether each of the given keys is in the hash map
+        :param keys: An iterable of keys
+        :return: A list with True for each key found, else False
+        """
+        if self._wheel is not None:
+            self._expire()
+        get, hash_function = self._get_key_value, self._hash_function
+        return [get(key, hash_function(key))[0] is not None for key in keys]
+
+    def remove_many(self, keys) -> None:
+        """
+        The method removes each of the given keys, compacting tombstones at most once
+        :param keys: An iterable of keys
+        :return: None
+        """
+        if self._wheel is not None:
+            self._expire()
+        remove, hash_function = self._remove_hashed, self._hash_function
+        for key in keys:
+            remove(key, hash_function(key))
+        self._compact_tombstones()
+
+    def _reserve(self, count: int) -> None:
+        """
+        Helper method to put_many that doubles the capacity as many times as needed
+        to add count keys, with a single resize, so that no put has to resize.
+        :param count: The number of keys about to be added
+        :return: None
+        """
+        needed = self._size + self._tombstones + count
+        new_capacity = self._capacity
+        while needed / new_capacity >= .5:
+            new_capacity *= 2
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
 
     def clear(self) -> None:
         """
         The method clears the contents of the hash map.
         :return: None
         """
-        self.__init__(self._capacity, self._hash_function)
+        version, stats = self._version, self._stats
+        self.__init__(self._capacity, self._hash_function, self._incremental, self._rehash_step,
+                      tombstone_ratio=self._tombstone_ratio, clock=self._clock, probe=self._probe_name,
+                      step_function=self._step_function)
+        self._version, self._stats = version + 1, stats
 
     def get_keys(self) -> DynamicArray:
         """
         The method returns all of the keys stored in the hash map
         :return: Returns an array with the keys of the hash map
         """
+        if self._wheel is not None:
+            self._expire()
         result_array = DynamicArray()
 
-        for idx in range(self._capacity):
-            if self._buckets[idx] and not self._buckets[idx].is_tombstone:
-                result_array.append(self._buckets[idx].key)
+        now = self._clock()
+        for buckets, start, end in ((self._buckets, 0, self._capacity),
+                                    (self._old_buckets, self._rehash_idx, self._old_capacity)):
+            for idx in range(start, end):
+                entry = buckets[idx]
+                if entry and not entry.is_tombstone and (entry.expires is None or entry.expires > now):
+                    result_array.append(entry.key)
         return result_array
 
     def get_buckets(self) -> DynamicArray:
@@ -191,13 +621,270 @@ class HashMap:
         The method returns the hash array.
         :return: The hash array
         """
+        self.complete_resize()
         return self._buckets
 
-    def get_hash_function(self) -> str:
+    def _stats_fields(self) -> dict:
+        """
+        Helper method to get_stats that reports the tombstone count along with the size and capacity
+        """
+        return {"size": self._size, "capacity": self._capacity, "tombstones": self._tombstones}
+
+    # ------------------------------------------------------------------ #
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Remove the key using del; raises KeyError if the key is not found or has expired
+        """
+        if self._wheel is not None:
+            self._expire()
+        if not self._remove_hashed(key, self._hash_function(key)):
+            raise KeyError(key)
+        self._compact_tombstones()
+
+    def _iter_items(self):
+        """
+        Helper generator that walks the slots in place, yielding (key, value) pairs.
+        A pending incremental resize is completed first so that entries cannot move mid-walk.
+        Raises RuntimeError if keys are added or removed while iterating.
+        """
+        if self._wheel is not None:
+            self._expire()
+        self.complete_resize()
+        version, now = self._version, self._clock()
+        for idx in range(self._capacity):
+            entry = self._buckets[idx]
+            if entry is not None and not entry.is_tombstone and (entry.expires is None or entry.expires > now):
+                yield (entry.key, entry.value)
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
+
+
+class CompactHashMap(HashMap):
+    """
+    Open addressing HashMap that stores entries in parallel flat arrays -- keys, values,
+    cached 64-bit hashes and a one byte control array (empty / full / tombstone) -- instead
+    of one HashEntry object per slot. Created directly or via HashMap(..., compact=True).
+    """
+
+    def __init__(self, capacity: int, function, incremental: bool = False, rehash_step: int = 4, *,
+                 compact: bool = True, tombstone_ratio: float = .25, stats: bool = False,
+                 clock=time.monotonic, probe: str = "quadratic", step_function=hash_function_2) -> None:
+        """
+        Initialize new compact HashMap that uses quadratic probing (or another
+        probe strategy) for collision resolution; keys cannot be put with a ttl,
+        and resizes are always eager, so incremental must be False
+        """
+        if incremental:
+            raise ValueError("CompactHashMap does not support incremental resizing; use HashMap")
+        capacity = self._init_probe(capacity, probe, step_function)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._ctrl = bytearray(capacity)
+
+        self._capacity = capacity
+        self._hash_function = resolve_hash_function(function)
+        self._size = 0
+        self._tombstones = 0
+        self._tombstone_ratio = tombstone_ratio
+
+        # Rehashing reuses the cached hashes and allocates no entries, so resizes are always eager
+        self._incremental = False
+        self._rehash_step = max(rehash_step, 1)
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_idx = 0
+
+        # Bumped whenever keys are added, removed or moved, to detect mutation during iteration
+        self._version = 0
+        self._stats = HashMapStats() if stats else None
+        self._clock = clock
+        self._wheel = None
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            entry = None
+            if self._ctrl[i] != _EMPTY:
+                entry = f"K: {self._keys[i]} V: {self._values[i]} TS: {self._ctrl[i] == _TOMBSTONE}"
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    def _put_hashed(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Helper method to put/put_many that updates or adds the key/value given the key's hash
+        """
+        if self._stats is not None:
+            self._stats.count("put")
+        self._make_room()
+
+        hash_value &= _HASH_MASK
+        idx = self._find_slot(key, hash_value)
+        if idx >= 0:
+            self._values[idx] = value
+            return
+
+        # Reuse the first tombstone on the probe sequence, else the empty slot that ended it
+        ctrl, capacity = self._ctrl, self._capacity
+        a, b = self._probe_terms(key)
+        j = 0
+        idx = hash_value % capacity
+        while ctrl[idx] == _FULL:
+            j += 1
+            if j >= capacity:
+                a, b = 1, 0
+            idx = (idx + a + b * j) % capacity
+        if ctrl[idx] == _TOMBSTONE:
+            self._tombstones -= 1
+        self._store(idx, key, value, hash_value)
+        self._size += 1
+        self._version += 1
+
+    def _store(self, idx: int, key: str, value: object, hash_value: int) -> None:
         """
-        The method returns the current hash function used by the hash map
+        Helper method that writes an entry into slot idx
         """
-        if self._hash_function is hash_function_1:
-            return "Hash function 1"
-        if self._hash_function is hash_function_2:
-            return "Hash function 2"
+        self._keys[idx] = key
+        self._values[idx] = value
+        self._hashes[idx] = hash_value
+        self._ctrl[idx] = _FULL
+
+    def _find_slot(self, key: str, hash_value: int) -> int:
+        """
+        Helper method that returns the slot holding key, comparing cached hashes before keys
+        :param key: The key to be searched
+        :param hash_value: The masked hash of the key
+        :return: The slot index, else -1 if the key is not in the table
+        """
+        ctrl, keys, hashes, capacity = self._ctrl, self._keys, self._hashes, self._capacity
+
+        a, b = self._probe_terms(key)
+        j, found = 0, -1
+        idx = hash_value % capacity
+        while ctrl[idx] != _EMPTY and j < 2 * capacity:
+            if ctrl[idx] == _FULL and hashes[idx] == hash_value and keys[idx] == key:
+                found = idx
+                break
+            j += 1
+            if j >= capacity:
+                a, b = 1, 0
+            idx = (idx + a + b * j) % capacity
+
+        if self._stats is not None:
+            self._stats.record_probe(j)
+        return found
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        The method changes the capacity of the hash table
+        :param new_capacity: The new capacity of the hash table
+        :return: None
+        """
+        new_capacity = self._round_capacity(new_capacity)
+        if new_capacity < self._size or new_capacity < 1:
+            return
+
+        # Quadratic probing is only sure to reach a free slot while the load stays below 0.5
+        while self._size / new_capacity >= .5:
+            new_capacity *= 2
+
+        start = time.perf_counter() if self._stats is not None else None
+        keys, values, hashes, ctrl = self._keys, self._values, self._hashes, self._ctrl
+        self._tombstones = 0
+        self._version += 1
+        self._keys = [None] * new_capacity
+        self._values = [None] * new_capacity
+        self._hashes = array('Q', bytes(8 * new_capacity))
+        self._ctrl = bytearray(new_capacity)
+        self._capacity = new_capacity
+
+        # Rehash using the cached hashes; the new table has no tombstones to reuse
+        for idx in range(len(ctrl)):
+            if ctrl[idx] == _FULL:
+                hash_value = hashes[idx]
+                a, b = self._probe_terms(keys[idx])
+                j = 0
+                new_idx = hash_value % new_capacity
+                while self._ctrl[new_idx] != _EMPTY:
+                    j += 1
+                    if j >= new_capacity:
+                        a, b = 1, 0
+                    new_idx = (new_idx + a + b * j) % new_capacity
+                self._store(new_idx, keys[idx], values[idx], hash_value)
+
+        if start is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
+        """
+        Helper method that returns the key/value from the hash table, if it exists
+        :param key: The key to be searched
+        :param hash_value: The hash of the key, computed if not given
+        :return: Returns a key/value pair if in hash table, else None
+        """
+        if self._stats is not None:
+            self._stats.count("get")
+        hash_value = self._hash_function(key) if hash_value is None else hash_value
+        idx = self._find_slot(key, hash_value & _HASH_MASK)
+        if idx < 0:
+            return (None, None)
+        return (self._keys[idx], self._values[idx])
+
+    def _schedule(self, key: str, hash_value: int, ttl: float) -> float:
+        """
+        Helper method to put; the parallel arrays hold no expiry times
+        """
+        raise TypeError("CompactHashMap does not support ttl; use HashMap")
+
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/remove_many that tombstones the key given its hash
+        """
+        if self._stats is not None:
+            self._stats.count("remove")
+        idx = self._find_slot(key, hash_value & _HASH_MASK)
+        if idx < 0:
+            return False
+        self._keys[idx] = self._values[idx] = None
+        self._ctrl[idx] = _TOMBSTONE
+        self._size -= 1
+        self._tombstones += 1
+        self._version += 1
+        return True
+
+    def get_keys(self) -> DynamicArray:
+        """
+        The method returns all of the keys stored in the hash map
+        :return: Returns an array with the keys of the hash map
+        """
+        ctrl, keys = self._ctrl, self._keys
+        return DynamicArray([keys[idx] for idx in range(self._capacity) if ctrl[idx] == _FULL])
+
+    def get_buckets(self) -> DynamicArray:
+        """
+        The method returns a copy of the hash array, with a HashEntry for each occupied slot.
+        :return: The hash array
+        """
+        result_array = DynamicArray()
+        for idx in range(self._capacity):
+            entry = None
+            if self._ctrl[idx] == _FULL:
+                entry = HashEntry(self._keys[idx], self._values[idx], self._hashes[idx])
+            result_array.append(entry)
+        return result_array
+
+    def _iter_items(self):
+        """
+        Helper generator that walks the slots in place, yielding (key, value) pairs.
+        Raises RuntimeError if keys are added or removed while iterating.
+        """
+        version = self._version
+        for idx in range(self._capacity):
+            if self._ctrl[idx] == _FULL:
+                yield (self._keys[idx], self._values[idx])
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
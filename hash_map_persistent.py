@@ -0,0 +1,475 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents a persistent open addressing HashMap: every change is
+#               appended to a write-ahead log, and the log is compacted into a snapshot
+"""
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+from hash_map_oa import HashMap as HashMapOA
+from hash_map_snapshot import load_snapshot, save_items
+from hashmap_helpers import DynamicArray, blake2b_hash, hash_function_name, resolve_hash_function
+
+# Log record: CRC-32 of the rest of the record, operation, key length, value length,
+# then the pickled key and value. A record that is cut short or fails its CRC ends the log.
+_CRC = struct.Struct('<I')
+_BODY = struct.Struct('<BII')
+_PUT, _REMOVE, _CLEAR = 1, 2, 3
+_PROTOCOL = 4
+
+
+def _record(op: int, key_blob: bytes = b'', value_blob: bytes = b'') -> bytes:
+    """Return the log record for one operation."""
+    body = _BODY.pack(op, len(key_blob), len(value_blob)) + key_blob + value_blob
+    return _CRC.pack(zlib.crc32(body)) + body
+
+
+def _replay(path: str, hash_map) -> int:
+    """
+    Apply the records of one log file to hash_map, in order.
+    :return: The length of the valid records; anything after it is a torn write
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    offset, header = 0, _CRC.size + _BODY.size
+    while offset + header <= len(data):
+        op, key_length, value_length = _BODY.unpack_from(data, offset + _CRC.size)
+        end = offset + header + key_length + value_length
+        if end > len(data) or _CRC.unpack_from(data, offset)[0] != zlib.crc32(data[offset + _CRC.size:end]):
+            break
+        key_end = offset + header + key_length
+        if op == _PUT:
+            hash_map.put(pickle.loads(data[offset + header:key_end]), pickle.loads(data[key_end:end]))
+        elif op == _REMOVE:
+            hash_map.remove(pickle.loads(data[offset + header:key_end]))
+        elif op == _CLEAR:
+            hash_map.clear()
+        offset = end
+    return offset
+
+
+def _fsync_directory(path: str) -> None:
+    """Make renames and deletions in directory path durable, where the platform supports it."""
+    if os.name == 'posix':
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class HashMap:
+    def __init__(self, path: str, function=blake2b_hash, capacity: int = 11, compact: bool = True,
+                 sync_interval: float = .01, buffer_size: int = 1 << 20, compaction_ratio: float = 2.0,
+                 min_compaction_bytes: int = 1 << 20) -> None:
+        """
+        Open (or create) a persistent HashMap stored in directory path.
+        The newest snapshot is loaded and the write-ahead logs after it are replayed, so every
+        change that was synced before a crash is recovered; a torn final record is discarded.
+        Changes are applied in memory and appended to a log buffer. The buffer is written when it
+        reaches buffer_size and fsynced every sync_interval seconds by a background thread, so
+        concurrent writers share each fsync (group commit); sync() forces one immediately.
+        Once the log grows past compaction_ratio times the snapshot, a new log is started and
+        the map is written to a new snapshot in the background.
+        :param path: The directory holding the snapshots and logs
+        :param function: The hash function; it must be registered and hash identically in every
+                         process (e.g. blake2b_hash), so that snapshots can be reloaded
+        :param capacity: The initial number of slots of a new map
+        :param compact: Back a new map with the compact open addressing storage (see CompactHashMap)
+        :param sync_interval: Seconds between background fsyncs; None leaves syncing to sync() and close()
+        :param buffer_size: Bytes of log records buffered before they are written to the log file
+        :param compaction_ratio: Log size, relative to the snapshot, that triggers compaction
+        :param min_compaction_bytes: Log size below which the log is never compacted
+        """
+        self._hash_function = resolve_hash_function(function)
+        if hash_function_name(self._hash_function) is None:
+            raise ValueError("The hash function must be registered to be persisted")
+        self._path = path
+        self._buffer_size = buffer_size
+        self._compaction_ratio = compaction_ratio
+        self._min_compaction_bytes = min_compaction_bytes
+
+        # _lock guards the map and the buffer; _sync_lock orders writes to the log file,
+        # so writers only wait for an fsync when the buffer is full
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._buffer = bytearray()
+        self._unsynced = False
+        self._compactor = None
+
+        self._recover(capacity, compact)
+        self._closed = threading.Event()
+        self._flusher = None
+        if sync_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_periodically, args=(sync_interval,), daemon=True)
+            self._flusher.start()
+
+    def _file(self, kind: str, generation: int) -> str:
+        """
+        Helper method that returns the path of the snapshot or log of a generation.
+        Snapshot N holds every change from the logs before N.
+        """
+        return os.path.join(self._path, f'{kind}.{generation:08d}')
+
+    def _recover(self, capacity: int, compact: bool) -> None:
+        """
+        Helper method to __init__ that loads the newest snapshot, replays the logs after it,
+        deletes files it supersedes, and opens the newest log for appending
+        """
+        os.makedirs(self._path, exist_ok=True)
+        generations = {'snapshot': set(), 'wal': set()}
+        for name in os.listdir(self._path):
+            kind, _, generation = name.partition('.')
+            if name.endswith('.tmp'):
+                os.remove(os.path.join(self._path, name))
+            elif kind in generations and generation.isdigit():
+                generations[kind].add(int(generation))
+
+        base = max(generations['snapshot'], default=0)
+        if base in generations['snapshot']:
+            self._map = load_snapshot(self._file('snapshot', base), self._hash_function)
+            self._snapshot_bytes = os.path.getsize(self._file('snapshot', base))
+        else:
+            self._map = HashMapOA(capacity, self._hash_function, compact=compact)
+            self._snapshot_bytes = 0
+
+        logs = sorted(generation for generation in generations['wal'] if generation >= base)
+        for generation in logs:
+            path = self._file('wal', generation)
+            valid = _replay(path, self._map)
+            if valid < os.path.getsize(path):
+                os.truncate(path, valid)
+        for kind, stale in generations.items():
+            for generation in stale:
+                if generation < base:
+                    os.remove(self._file(kind, generation))
+
+        self._generation = max(logs, default=base)
+        self._log = open(self._file('wal', self._generation), 'ab')
+        self._log_bytes = self._log.tell()
+
+    # ------------------------------------------------------------------ #
+
+    def _append(self, record: bytes) -> None:
+        """
+        Helper method to the write methods that buffers a record; the caller holds _lock,
+        so records are logged in the order their changes were applied
+        """
+        self._buffer += record
+
+    def _after_write(self) -> None:
+        """
+        Helper method to the write methods that writes the buffer out once it is full
+        """
+        if len(self._buffer) >= self._buffer_size:
+            with self._sync_lock:
+                self._flush(fsync=False)
+
+    def _flush(self, fsync: bool = True) -> None:
+        """
+        Helper method that writes the buffered records to the log, and fsyncs it.
+        The caller holds _sync_lock.
+        """
+        with self._lock:
+            buffer, self._buffer = self._buffer, bytearray()
+            log = self._log
+        if buffer:
+            log.write(buffer)
+            log.flush()
+            self._log_bytes += len(buffer)
+            self._unsynced = True
+        if fsync and self._unsynced:
+            os.fsync(log.fileno())
+            self._unsynced = False
+
+    def _flush_periodically(self, interval: float) -> None:
+        """
+        Helper method run by the background flusher thread until the map is closed
+        """
+        while not self._closed.wait(interval):
+            self.sync()
+
+    def sync(self) -> None:
+        """
+        The method makes every change so far durable with one fsync, then starts a
+        compaction if the log has outgrown the snapshot
+        :return: None
+        """
+        with self._sync_lock:
+            self._flush()
+            if (self._log_bytes >= self._min_compaction_bytes
+                    and self._log_bytes > self._compaction_ratio * self._snapshot_bytes
+                    and (self._compactor is None or not self._compactor.is_alive())):
+                self._rotate()
+
+    def compact(self) -> None:
+        """
+        The method writes the map to a new snapshot and deletes the logs it replaces,
+        waiting for the snapshot to be written
+        :return: None
+        """
+        with self._sync_lock:
+            if self._compactor is not None:
+                self._compactor.join()
+            self._flush()
+            self._rotate()
+        self._compactor.join()
+
+    def _rotate(self) -> None:
+        """
+        Helper method that starts a new log and writes the map as it is now to a snapshot
+        in a background thread. The caller holds _sync_lock and has flushed the buffer.
+        """
+        with self._lock:
+            self._flush()
+            items = list(self._map.items())
+            capacity = self._map.get_capacity()
+            self._log.close()
+            self._generation += 1
+            self._log = open(self._file('wal', self._generation), 'ab')
+            self._log_bytes = 0
+        self._compactor = threading.Thread(target=self._write_snapshot,
+                                           args=(self._generation, items, capacity, type(self._map)))
+        self._compactor.start()
+
+    def _write_snapshot(self, generation: int, items: list, capacity: int, cls) -> None:
+        """
+        Helper method run by the compaction thread: saves snapshot generation, after which
+        the older snapshot and logs are no longer needed
+        """
+        path = self._file('snapshot', generation)
+        save_items(items, path, self._hash_function, capacity, cls)
+        _fsync_directory(self._path)
+        self._snapshot_bytes = os.path.getsize(path)
+        for name in os.listdir(self._path):
+            kind, _, old = name.partition('.')
+            if kind in ('snapshot', 'wal') and old.isdigit() and int(old) < generation:
+                os.remove(os.path.join(self._path, name))
+
+    def close(self) -> None:
+        """
+        The method stops the background threads, syncs the log and closes it
+        :return: None
+        """
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._sync_lock:
+            self._flush()
+            if self._compactor is not None:
+                self._compactor.join()
+            self._log.close()
+
+    def __enter__(self) -> "HashMap":
+        """
+        Return the map, for use as a context manager
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the map at the end of a with block
+        """
+        self.close()
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        The method updates the key/value pair for an existing key, or adds the key/value to the hash map
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :return: None
+        """
+        record = _record(_PUT, pickle.dumps(key, _PROTOCOL), pickle.dumps(value, _PROTOCOL))
+        with self._lock:
+            self._map.put(key, value)
+            self._append(record)
+        self._after_write()
+
+    def put_many(self, pairs) -> None:
+        """
+        The method adds or updates every key/value pair in pairs, logging them as one batch
+        :param pairs: An iterable of (key, value) pairs
+        :return: None
+        """
+        pairs = list(pairs)
+        records = b''.join(_record(_PUT, pickle.dumps(key, _PROTOCOL), pickle.dumps(value, _PROTOCOL))
+                           for key, value in pairs)
+        with self._lock:
+            self._map.put_many(pairs)
+            self._append(records)
+        self._after_write()
+
+    def remove(self, key: str) -> None:
+        """
+        The method removes the given key and its value from the hash map.
+        :param key: The key to be removed
+        :return: None
+        """
+        self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        """
+        Helper method to remove/__delitem__ that removes the key and logs the removal
+        :param key: The key to be removed
+        :return: True if the key was removed, else False
+        """
+        with self._lock:
+            removed = self._map._remove_hashed(key, self._hash_function(key))
+            if removed:
+                self._map._compact_tombstones()
+                self._append(_record(_REMOVE, pickle.dumps(key, _PROTOCOL)))
+        self._after_write()
+        return removed
+
+    def remove_many(self, keys) -> None:
+        """
+        The method removes each of the given keys, logging them as one batch
+        :param keys: An iterable of keys
+        :return: None
+        """
+        hash_map, hash_function = self._map, self._hash_function
+        with self._lock:
+            for key in keys:
+                if hash_map._remove_hashed(key, hash_function(key)):
+                    self._append(_record(_REMOVE, pickle.dumps(key, _PROTOCOL)))
+            hash_map._compact_tombstones()
+        self._after_write()
+
+    def clear(self) -> None:
+        """
+        The method clears the contents of the hash map.
+        :return: None
+        """
+        with self._lock:
+            self._map.clear()
+            self._append(_record(_CLEAR))
+        self._after_write()
+
+    def get(self, key: str) -> object:
+        """
+        The method returns the value associated with the given key
+        :param key: The key to be searched
+        :return: Returns the value associated with the given key, else returns None if not found
+        """
+        with self._lock:
+            return self._map.get(key)
+
+    def get_many(self, keys) -> list:
+        """
+        The method returns the values associated with each of the given keys
+        :param keys: An iterable of keys
+        :return: A list with the value for each key, or None where a key is not found
+        """
+        with self._lock:
+            return self._map.get_many(keys)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method returns True if the key is in the hash map, else False
+        :param: the key to be found
+        :return: Returns True if the key is found, else False
+        """
+        with self._lock:
+            return self._map.contains_key(key)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    def table_load(self) -> float:
+        """
+        The method returns the current load factor of the hash table
+        :return: The load factor of the hash table
+        """
+        return self._map.table_load()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        The method returns all of the keys stored in the hash map
+        :return: Returns an array with the keys of the hash map
+        """
+        with self._lock:
+            return self._map.get_keys()
+
+    def get_hash_function(self) -> str:
+        """
+        The method returns the current hash function used by the hash map
+        """
+        return hash_function_name(self._hash_function)
+
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        """
+        Return size of map, for use with len()
+        """
+        return self.get_size()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return True if the key is in the hash map, for use with the in operator
+        """
+        return self.contains_key(key)
+
+    def __getitem__(self, key: str) -> object:
+        """
+        Return the value for key using [] syntax; raises KeyError if the key is not found
+        """
+        with self._lock:
+            return self._map[key]
+
+    def __setitem__(self, key: str, value: object) -> None:
+        """
+        Add or update the key/value pair using [] syntax
+        """
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Remove the key using del; raises KeyError if the key is not found
+        """
+        if not self._remove(key):
+            raise KeyError(key)
+
+    def __iter__(self):
+        """
+        Return a lazy iterator over the keys of the hash map
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        The method lazily yields each key in the hash map
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        The method lazily yields each value in the hash map
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self):
+        """
+        The method yields each (key, value) pair in the hash map, from a copy taken under
+        the lock so that concurrent writers never invalidate the iteration
+        """
+        with self._lock:
+            items = list(self._map.items())
+        yield from items
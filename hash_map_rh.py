@@ -0,0 +1,243 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents an implementation of the HashMap using open
+#               addressing with Robin Hood linear probing to resolve collisions
+"""
+import time
+
+from hashmap_helpers import DynamicArray, HashEntry, HashMapMixin, HashMapStats, resolve_hash_function
+
+
+class HashMap(HashMapMixin):
+    def __init__(self, capacity: int, function, max_load: float = .85, *, stats: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        Robin Hood linear probing for collision resolution
+        :param capacity: The initial number of slots
+        :param function: The hash function
+        :param max_load: Load factor above which the table doubles; must be between 0 and 1
+        :param stats: Record operation counts, probe lengths and resize times (see get_stats)
+        """
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+
+        self._buckets = DynamicArray()
+        for _ in range(capacity):
+            self._buckets.append(None)
+
+        self._capacity = capacity
+        self._hash_function = resolve_hash_function(function)
+        self._size = 0
+        self._max_load = max_load
+
+        # Bumped whenever keys are added, removed or moved, to detect mutation during iteration
+        self._version = 0
+        self._stats = HashMapStats() if stats else None
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _put_hashed(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Helper method to put/put_many that updates or adds the key/value given the key's hash
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :param hash_value: the hash of the key
+        :return: None
+        """
+        if self._stats is not None:
+            self._stats.count("put")
+
+        hash_index = self._find_index(key, hash_value)
+        if hash_index >= 0:
+            self._buckets[hash_index].value = value
+            return
+
+        if self._capacity < 1 or (self._size + 1) / self._capacity > self._max_load:
+            self.resize_table(max(self._capacity * 2, 1))
+
+        self._insert(self._buckets, self._capacity, HashEntry(key, value, hash_value))
+        self._size += 1
+        self._version += 1
+
+    @staticmethod
+    def _insert(da: DynamicArray, capacity: int, entry: HashEntry) -> None:
+        """
+        Helper method to put/resize that places an entry known not to be in the table.
+        Robin Hood: whenever the entry being placed is further from its home slot than the
+        resident entry, they swap and the resident continues probing in its place.
+        :param da: The hash table array
+        :param capacity: The capacity of the hash table
+        :param entry: The entry to be placed
+        :return: None
+        """
+        # Linear Probing: i = (initial index + j) % capacity
+        hash_index = entry.hash_value % capacity
+        distance = 0
+        while da[hash_index] is not None:
+            resident = da[hash_index]
+            resident_distance = (hash_index - resident.hash_value) % capacity
+            if resident_distance < distance:
+                da[hash_index], entry = entry, resident
+                distance = resident_distance
+            hash_index = (hash_index + 1) % capacity
+            distance += 1
+        da[hash_index] = entry
+
+    def _find_index(self, key: str, hash_value: int) -> int:
+        """
+        Helper method that returns the index of key in the hash table.
+        The search stops as soon as it reaches an entry closer to its home slot than the key
+        would be, since Robin Hood insertion would have placed the key before that entry.
+        :param key: The key to be searched
+        :param hash_value: The hash of the key
+        :return: The index of the key, else -1
+        """
+        capacity = self._capacity
+        result = -1
+        distance = 0
+        if capacity:
+            hash_index = hash_value % capacity
+            while self._buckets[hash_index] is not None:
+                entry = self._buckets[hash_index]
+                if (hash_index - entry.hash_value) % capacity < distance:
+                    break
+                if entry.hash_value == hash_value and entry.key == key:
+                    result = hash_index
+                    break
+                hash_index = (hash_index + 1) % capacity
+                distance += 1
+
+        if self._stats is not None:
+            self._stats.record_probe(distance)
+        return result
+
+    def empty_buckets(self) -> int:
+        """
+        The method returns the number of empty buckets in the hash table
+        :return: The number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        The method changes the capacity of the hash table
+        :param new_capacity: The new capacity of the hash table
+        :return: None
+        """
+        if new_capacity <= self._size or new_capacity < 1:
+            return
+
+        self._version += 1
+        start = time.perf_counter() if self._stats is not None else None
+
+        # Rehash keys for new hash table, reusing each entry and its cached hash
+        new_hash = DynamicArray([None] * new_capacity)
+        for idx in range(self._capacity):
+            entry = self._buckets[idx]
+            if entry is not None:
+                self._insert(new_hash, new_capacity, entry)
+
+        self._buckets, self._capacity = new_hash, new_capacity
+        if start is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
+        """
+        Helper method that returns the key/value from the hash table, if it exists
+        :param key: The key to be searched
+        :param hash_value: The hash of the key, computed if not given
+        :return: Returns a key/value pair if in hash table, else (None, None)
+        """
+        if self._stats is not None:
+            self._stats.count("get")
+        hash_value = self._hash_function(key) if hash_value is None else hash_value
+        hash_index = self._find_index(key, hash_value)
+        if hash_index < 0:
+            return (None, None)
+        entry = self._buckets[hash_index]
+        return (entry.key, entry.value)
+
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/remove_many that removes the key given its hash.
+        Backward-shift deletion: the entries after the removed one move back a slot until an
+        empty slot or an entry already in its home slot is reached, so no tombstones are left.
+        :param key: The key to be removed
+        :param hash_value: The hash of the key
+        :return: True if the key was removed, else False
+        """
+        if self._stats is not None:
+            self._stats.count("remove")
+        hash_index = self._find_index(key, hash_value)
+        if hash_index < 0:
+            return False
+
+        capacity = self._capacity
+        next_index = (hash_index + 1) % capacity
+        while True:
+            entry = self._buckets[next_index]
+            if entry is None or (next_index - entry.hash_value) % capacity == 0:
+                break
+            self._buckets[hash_index] = entry
+            hash_index, next_index = next_index, (next_index + 1) % capacity
+        self._buckets[hash_index] = None
+
+        self._size -= 1
+        self._version += 1
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def _reserve(self, count: int) -> None:
+        """
+        Helper method to put_many that doubles the capacity as many times as needed
+        to add count keys without exceeding max_load, with a single resize.
+        :param count: The number of keys about to be added
+        :return: None
+        """
+        new_capacity = max(self._capacity, 1)
+        while (self._size + count) / new_capacity > self._max_load:
+            new_capacity *= 2
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+
+    def clear(self) -> None:
+        """
+        The method clears the contents of the hash map.
+        :return: None
+        """
+        version, stats = self._version, self._stats
+        self.__init__(self._capacity, self._hash_function, self._max_load)
+        self._version, self._stats = version + 1, stats
+
+    def get_buckets(self) -> DynamicArray:
+        """
+        The method returns the hash array.
+        :return: The hash array
+        """
+        return self._buckets
+
+    # ------------------------------------------------------------------ #
+
+    def _iter_items(self):
+        """
+        Helper generator that walks the slots in place, yielding (key, value) pairs.
+        Raises RuntimeError if keys are added or removed while iterating.
+        """
+        version = self._version
+        for idx in range(self._capacity):
+            entry = self._buckets[idx]
+            if entry is not None:
+                yield (entry.key, entry.value)
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
@@ -4,75 +4,165 @@
 # Description:  The program represents an implementation of the HashMap using
 #               chaining to resolve collisions
 """
-from hashmap_helpers import (DynamicArray, LinkedList,
-                             hash_function_1, hash_function_2)
+import heapq
+import time
 
+from hashmap_helpers import (DynamicArray, HashMapMixin, HashMapStats, LinkedList, SLNode, TimerWheel,
+                             builtin_hash, hash_function_2, resolve_hash_function)
 
-class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+# Read in place of a bucket that has no list yet; nothing is ever inserted into it
+_EMPTY_BUCKET = LinkedList()
+
+
+class HashMap(HashMapMixin):
+    def __init__(self, capacity: int, function, max_load: float = None, min_load: float = None,
+                 incremental: bool = False, rehash_step: int = 4, *, stats: bool = False,
+                 clock=time.monotonic) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
+        :param capacity: The initial number of buckets
+        :param function: The hash function
+        :param max_load: Load factor above which the table doubles; None disables growth
+        :param min_load: Load factor below which the table halves after a removal; None disables shrinking
+        :param incremental: Migrate buckets a few at a time during put/get/remove instead of all at once
+        :param rehash_step: Number of old buckets migrated per operation while a resize is pending
+        :param stats: Record operation counts, chain lengths and resize times (see get_stats)
+        :param clock: Returns the current time in seconds, for keys put with a ttl
         """
-        self._buckets = DynamicArray()
-        for _ in range(capacity):
-            self._buckets.append(LinkedList())
+        if max_load is not None and max_load <= 0:
+            raise ValueError("max_load must be positive")
+        if min_load is not None and max_load is not None and min_load * 2 >= max_load:
+            # Halving at min_load must land below max_load, otherwise put/remove would thrash
+            raise ValueError("min_load must be less than half of max_load")
+
+        # Buckets stay None until a key is inserted, so a new table is allocated in one step
+        self._buckets = DynamicArray([None] * capacity)
 
         self._capacity = capacity
-        self._hash_function = function
+        self._hash_function = resolve_hash_function(function)
         self._hash_function1 = hash_function_2
         self._size = 0
+        self._max_load = max_load
+        self._min_load = min_load
+        self._min_capacity = max(capacity, 1)
+
+        # Incremental resize state; _old_buckets is None unless a migration is pending
+        self._incremental = incremental
+        self._rehash_step = max(rehash_step, 1)
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_idx = 0
+
+        # Bumped whenever keys are added, removed or moved, to detect mutation during iteration
+        self._version = 0
+        self._stats = HashMapStats() if stats else None
+
+        # Timers for keys put with a ttl; created by the first such put
+        self._clock = clock
+        self._wheel = None
 
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
         """
+        self.complete_resize()
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            out += str(i) + ': ' + str(self._buckets[i] or _EMPTY_BUCKET) + '\n'
         return out
 
     def get_size(self) -> int:
         """
         Return size of map
         """
+        if self._wheel is not None:
+            self._expire()
         return self._size
 
-    def get_capacity(self) -> int:
-        """
-        Return capacity of map
-        """
-        return self._capacity
-
     # ------------------------------------------------------------------ #
 
-    def put(self, key: str, value: object) -> None:
+    def put(self, key: str, value: object, ttl: float = None) -> None:
         """
         The method updates the key/value pair for an existing key, or adds the key/value to the hash map
         :param key: the key to be updated or added ot the hashmap
         :param value: the value to be added or updated
+        :param ttl: Seconds until the key expires; None (the default) keeps it until it is removed,
+                    and also clears any ttl the key had
         :return: None
         """
+        if self._wheel is not None:
+            self._expire()
+        hash_value = self._hash_function(key)
+        expires = None if ttl is None else self._schedule(key, hash_value, ttl)
+        self._put_hashed(key, value, hash_value, expires)
 
-        hash_index = self._hash_function(key) % self._capacity
+    def _put_hashed(self, key: str, value: object, hash_value: int, expires: float = None) -> None:
+        """
+        Helper method to put/put_many that updates or adds the key/value given the key's hash
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :param hash_value: the hash of the key
+        :param expires: The clock time at which the key expires, else None
+        :return: None
+        """
+        if self._stats is not None:
+            self._stats.count("put")
+        if self._old_buckets is not None:
+            self._migrate_buckets()
+            node = self._old_contains(key, hash_value)
+            if node:
+                node.value, node.expires = value, expires
+                return
+
+        hash_index = hash_value % self._capacity
 
-        # Determine if key is already in hash table and replace value
-        for node in self._buckets[hash_index]:
-            if node.key == key:
-                node.value = value
+        # Determine if key is already in hash table and replace value;
+        # cached hashes are compared first so most keys are never compared directly
+        for node in self._buckets[hash_index] or _EMPTY_BUCKET:
+            if node.hash_value == hash_value and node.key == key:
+                node.value, node.expires = value, expires
                 return
 
-        self._buckets[hash_index].insert(key, value)
+        self._link(SLNode(key, value, None, hash_value, expires))
+
+    def _put_node(self, node: SLNode) -> None:
+        """
+        Helper method that adds a node built by the caller, such as a CacheNode, for a key that
+        is not in the hash map. The node itself becomes the chain node, so the caller can keep it.
+        :param node: The node, with its key's full hash in hash_value
+        :return: None
+        """
+        if self._stats is not None:
+            self._stats.count("put")
+        if self._old_buckets is not None:
+            self._migrate_buckets()
+        self._link(node)
+
+    def _link(self, node: SLNode) -> None:
+        """
+        Helper method to put/_put_node that links a node for a new key into its bucket
+        and grows the table if needed
+        """
+        self._insert(self._buckets, node.hash_value % self._capacity, node)
         self._size += 1
+        self._version += 1
+
+        # Grow geometrically so the cost of rehashing is amortized across puts
+        if self._max_load is not None and self._size / self._capacity > self._max_load:
+            self.resize_table(self._capacity * 2)
 
     def empty_buckets(self) -> int:
         """
         The method returns the number of empty buckets in the hash table
         :return: The number of empty buckets
         """
+        if self._wheel is not None:
+            self._expire()
+        self.complete_resize()
         bucket_counter = 0
         for idx in range(self._capacity):
-            if self._buckets[idx].length() == 0:
+            if self._buckets[idx] is None or self._buckets[idx].length() == 0:
                 bucket_counter += 1
         return bucket_counter
 
@@ -81,6 +171,8 @@ class HashMap:
         The method returns the current load factor of the hash table
         :return: The load factor of the hash table
         """
+        if self._wheel is not None:
+            self._expire()
         return self._size / self._capacity
 
     def clear(self) -> None:
@@ -88,7 +180,10 @@ class HashMap:
         The method clears the contents of the hash map.
         :return: None
         """
-        self.__init__(self._capacity, self._hash_function)
+        min_capacity, version, stats = self._min_capacity, self._version, self._stats
+        self.__init__(self._capacity, self._hash_function, self._max_load, self._min_load,
+                      self._incremental, self._rehash_step, clock=self._clock)
+        self._min_capacity, self._version, self._stats = min_capacity, version + 1, stats
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -99,17 +194,89 @@ class HashMap:
         if new_capacity < 1:
             return
 
-        new_hash = DynamicArray()
-        for _ in range(new_capacity):
-            new_hash.append(LinkedList())
+        # Only one migration may be pending at a time
+        self.complete_resize()
+        self._version += 1
+        start = time.perf_counter() if self._stats is not None else None
+
+        new_hash = DynamicArray([None] * new_capacity)
+
+        if self._incremental:
+            # Keep the old table around; buckets move over in _migrate_buckets
+            self._old_buckets, self._old_capacity = self._buckets, self._capacity
+            self._rehash_idx = 0
+            self._buckets, self._capacity = new_hash, new_capacity
+            if start is not None:
+                self._stats.record_resize(time.perf_counter() - start)
+            return
 
-        # Rehash keys for new table
+        # Rehash keys for new table using each node's cached hash; the nodes are relinked, not copied
         for idx in range(self._capacity):
-            for node in self._buckets[idx]:
-                hash_index = self._hash_function(node.key) % new_capacity
-                new_hash[hash_index].insert(node.key, node.value)
+            for node in self._buckets[idx] or _EMPTY_BUCKET:
+                self._insert(new_hash, node.hash_value % new_capacity, node)
 
         self._buckets, self._capacity = new_hash, new_capacity
+        if start is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def _migrate_buckets(self, count: int = None) -> None:
+        """
+        Helper method that moves up to count buckets from the old table into the current one
+        while an incremental resize is pending.
+        :param count: The number of old buckets to migrate, defaults to the rehash step
+        :return: None
+        """
+        count = self._rehash_step if count is None else count
+        stop = min(self._rehash_idx + count, self._old_capacity)
+        start = time.perf_counter() if self._stats is not None else None
+
+        for idx in range(self._rehash_idx, stop):
+            for node in self._old_buckets[idx] or _EMPTY_BUCKET:
+                self._insert(self._buckets, node.hash_value % self._capacity, node)
+            self._old_buckets[idx] = None
+
+        if start is not None:
+            self._stats.record_resize(time.perf_counter() - start, started=False)
+        self._rehash_idx = stop
+        if self._rehash_idx >= self._old_capacity:
+            self._old_buckets, self._old_capacity = None, 0
+
+    def _old_contains(self, key: str, hash_value: int):
+        """
+        Helper method that returns the node for key in the old table of a pending resize, or None
+        :param key: The key to be searched
+        :param hash_value: The hash of the key
+        :return: The matching node, else None
+        """
+        if self._old_buckets is None:
+            return None
+        hash_index = hash_value % self._old_capacity
+        return (self._old_buckets[hash_index] or _EMPTY_BUCKET).contains(key, hash_value)
+
+    def _insert(self, buckets: DynamicArray, hash_index: int, node: SLNode) -> None:
+        """
+        Helper method to put/resize that links a node into a bucket, creating the bucket's list on first use.
+        The node's next link is overwritten, so a node being moved must already have been passed by its iterator.
+        """
+        bucket = buckets[hash_index]
+        if bucket is None:
+            bucket = buckets[hash_index] = LinkedList()
+        bucket.insert_node(node)
+
+    def complete_resize(self) -> None:
+        """
+        The method finishes any pending incremental resize in one call.
+        :return: None
+        """
+        if self._old_buckets is not None:
+            self._migrate_buckets(self._old_capacity)
+
+    def is_resizing(self) -> bool:
+        """
+        The method returns True while an incremental resize is pending.
+        :return: True if buckets remain to be migrated, else False
+        """
+        return self._old_buckets is not None
 
     def get(self, key: str) -> object:
         """
@@ -117,8 +284,9 @@ class HashMap:
         :param key: The key to be searched
         :return: Returns the value associated with the given key, else returns None if not found
         """
-        hash_index = self._hash_function(key) % self._capacity
-        node = self._buckets[hash_index].contains(key)
+        if self._wheel is not None:
+            self._expire()
+        node = self._find_node(key, self._hash_function(key))
         return (None if not node else node.value)
 
     def contains_key(self, key: str) -> bool:
@@ -127,68 +295,351 @@ class HashMap:
         :param: the key to be found
         :return: Returns True if the key is found, else False
         """
-        hash_index = self._hash_function(key) % self._capacity
-        node = self._buckets[hash_index].contains(key)
+        if self._wheel is not None:
+            self._expire()
+        node = self._find_node(key, self._hash_function(key))
         return (False if not node else True)
 
+    def _find_node(self, key: str, hash_value: int):
+        """
+        Helper method to get/contains_key that returns the node for key given its hash.
+        A key whose ttl has passed is not found, even before its timer removes it.
+        :param key: The key to be searched
+        :param hash_value: The hash of the key
+        :return: The matching node, else None
+        """
+        if self._old_buckets is not None:
+            self._migrate_buckets()
+        bucket = self._buckets[hash_value % self._capacity] or _EMPTY_BUCKET
+        if self._stats is not None:
+            self._stats.count("get")
+            self._stats.record_chain(bucket.length())
+        node = bucket.contains(key, hash_value) or self._old_contains(key, hash_value)
+        if node and node.expires is not None and node.expires <= self._clock():
+            return None
+        return node
+
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
+        """
+        Helper method that returns the key/value from the hash table, if it exists
+        :param key: The key to be searched
+        :param hash_value: The hash of the key, computed if not given
+        :return: Returns a key/value pair if in hash table, else (None, None)
+        """
+        node = self._find_node(key, self._hash_function(key) if hash_value is None else hash_value)
+        return (node.key, node.value) if node else (None, None)
+
+    def _schedule(self, key: str, hash_value: int, ttl: float) -> float:
+        """
+        Helper method to put that starts a timer for key to expire after ttl seconds
+        :return: The clock time at which the key expires
+        """
+        now = self._clock()
+        if self._wheel is None:
+            self._wheel = TimerWheel(now)
+        expires = now + ttl
+        self._wheel.schedule(expires, (key, hash_value, expires))
+        return expires
+
+    def _expire(self) -> None:
+        """
+        Helper method that removes the keys whose timers have fired. A timer is ignored if its key
+        has since been removed or put again, which gives the key a new expiry (or none).
+        :return: None
+        """
+        removed = False
+        for key, hash_value, expires in self._wheel.advance(self._clock()):
+            node = (self._buckets[hash_value % self._capacity] or _EMPTY_BUCKET).contains(key, hash_value) or \
+                self._old_contains(key, hash_value)
+            if node and node.expires == expires:
+                removed = self._remove_hashed(key, hash_value) or removed
+        if removed:
+            self._shrink()
+
     def remove(self, key: str) -> None:
         """
         The method removes the given key and its value from the hash map.
         :param key: The key to be removed
         :return: None
         """
-        hash_index = self._hash_function(key) % self._capacity
-        result = self._buckets[hash_index].remove(key)
+        if self._wheel is not None:
+            self._expire()
+        if self._remove_hashed(key, self._hash_function(key)):
+            self._shrink()
+
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/remove_many that removes the key given its hash.
+        Shrinking is left to the caller so that batches only resize once.
+        :param key: The key to be removed
+        :param hash_value: The hash of the key
+        :return: True if the key was removed, else False
+        """
+        if self._stats is not None:
+            self._stats.count("remove")
+        if self._old_buckets is not None:
+            self._migrate_buckets()
+        hash_index = hash_value % self._capacity
+        result = (self._buckets[hash_index] or _EMPTY_BUCKET).remove(key, hash_value)
+        if not result and self._old_buckets is not None:
+            old_index = hash_value % self._old_capacity
+            result = (self._old_buckets[old_index] or _EMPTY_BUCKET).remove(key, hash_value)
         if result:
             self._size -= 1
+            self._version += 1
+        return result
+
+    def _shrink(self) -> None:
+        """
+        Helper method that halves the table, as often as needed, once it is sparse,
+        but never below the initial capacity.
+        :return: None
+        """
+        if self._min_load is None:
+            return
+        new_capacity = self._capacity
+        while new_capacity // 2 >= self._min_capacity and self._size / new_capacity < self._min_load:
+            new_capacity //= 2
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
+
+    # ------------------------------------------------------------------ #
+
+    def put_many(self, pairs) -> None:
+        """
+        The method adds or updates every key/value pair in pairs, growing the table at most once
+        :param pairs: An iterable of (key, value) pairs
+        :return: None
+        """
+        if self._wheel is not None:
+            self._expire()
+        pairs = list(pairs)
+        self._reserve(len(pairs))
+
+        put, hash_function = self._put_hashed, self._hash_function
+        for key, value in pairs:
+            put(key, value, hash_function(key))
+
+    def get_many(self, keys) -> list:
+        """
+        The method returns the values associated with each of the given keys
+        :param keys: An iterable of keys
+        :return: A list with the value for each key, or None where a key is not found
+        """
+        if self._wheel is not None:
+            self._expire()
+        find, hash_function = self._find_node, self._hash_function
+        result = []
+        for key in keys:
+            node = find(key, hash_function(key))
+            result.append(None if not node else node.value)
+        return result
+
+    def contains_many(self, keys) -> list:
+        """
+        The method returns whether each of the given keys is in the hash map
+        :param keys: An iterable of keys
+        :return: A list with True for each key found, else False
+        """
+        if self._wheel is not None:
+            self._expire()
+        find, hash_function = self._find_node, self._hash_function
+        return [find(key, hash_function(key)) is not None for key in keys]
+
+    def remove_many(self, keys) -> None:
+        """
+        The method removes each of the given keys, shrinking the table at most once
+        :param keys: An iterable of keys
+        :return: None
+        """
+        if self._wheel is not None:
+            self._expire()
+        remove, hash_function = self._remove_hashed, self._hash_function
+        for key in keys:
+            remove(key, hash_function(key))
+        self._shrink()
+
+    def _reserve(self, count: int) -> None:
+        """
+        Helper method to put_many that doubles the capacity as many times as needed
+        to add count keys without exceeding max_load, with a single resize.
+        :param count: The number of keys about to be added
+        :return: None
+        """
+        if self._max_load is None:
+            return
+        new_capacity = self._capacity
+        while (self._size + count) / new_capacity > self._max_load:
+            new_capacity *= 2
+        if new_capacity != self._capacity:
+            self.resize_table(new_capacity)
 
     def get_keys(self) -> DynamicArray:
         """
         The method returns all of the keys stored in the hash map
         :return: Returns an array with the keys of the hash map
         """
-        result_array = DynamicArray()
+        if self._wheel is not None:
+            self._expire()
+        result_array, now = DynamicArray(), self._clock()
 
         for idx in range(self._capacity):
-            for node in self._buckets[idx]:
-                result_array.append(node.key)
+            for node in self._buckets[idx] or _EMPTY_BUCKET:
+                if node.expires is None or node.expires > now:
+                    result_array.append(node.key)
+        for idx in range(self._rehash_idx, self._old_capacity):
+            for node in self._old_buckets[idx] or _EMPTY_BUCKET:
+                if node.expires is None or node.expires > now:
+                    result_array.append(node.key)
         return result_array
 
-    def get_hash_function(self) -> str:
+    # ------------------------------------------------------------------ #
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Remove the key using del; raises KeyError if the key is not found or has expired
+        """
+        if self._wheel is not None:
+            self._expire()
+        if not self._remove_hashed(key, self._hash_function(key)):
+            raise KeyError(key)
+        self._shrink()
+
+    def _iter_items(self):
+        """
+        Helper generator that walks the buckets in place, yielding (key, value) pairs.
+        A pending incremental resize is completed first so that entries cannot move mid-walk.
+        Raises RuntimeError if keys are added or removed while iterating.
+        """
+        if self._wheel is not None:
+            self._expire()
+        self.complete_resize()
+        version, now = self._version, self._clock()
+        for idx in range(self._capacity):
+            for node in self._buckets[idx] or _EMPTY_BUCKET:
+                if node.expires is not None and node.expires <= now:
+                    continue
+                yield (node.key, node.value)
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
+
+
+class FrequencyCounter:
+    """
+    Streaming frequency counter backed by an auto-growing chaining HashMap.
+    Values are consumed one at a time from any iterable, so the input never has to be materialized.
+    """
+
+    def __init__(self, function=builtin_hash, capacity: int = 11) -> None:
+        """
+        Initialize an empty counter
+        :param function: The hash function used for the values
+        :param capacity: The initial number of buckets; the table doubles as needed
+        """
+        self._map = HashMap(capacity, function, max_load=1.0)
+        self._mode_values = []
+        self._mode_freq = 0
+        self._total = 0
+
+    def add(self, value: object) -> int:
+        """
+        The method counts one occurrence of value
+        :param value: The value to be counted
+        :return: The number of times value has been seen
+        """
+        self.update((value,))
+        return self.count(value)
+
+    def update(self, values) -> None:
+        """
+        The method counts every value in values, in a single pass
+        :param values: An iterable (or generator) of values, or a DynamicArray
+        :return: None
+        """
+        if isinstance(values, DynamicArray):
+            da = values
+            values = (da[idx] for idx in range(da.length()))
+
+        find, put, hash_function = self._map._find_node, self._map._put_hashed, self._map._hash_function
+        modes, mode_freq, total = self._mode_values, self._mode_freq, self._total
+        for value in values:
+            total += 1
+            hash_value = hash_function(value)
+            node = find(value, hash_value)
+            if node:
+                freq = node.value = node.value + 1
+            else:
+                put(value, 1, hash_value)
+                freq = 1
+
+            # Values are added to the modes in the order they reach the modal frequency
+            if freq > mode_freq:
+                modes, mode_freq = [value], freq
+            elif freq == mode_freq:
+                modes.append(value)
+        self._mode_values, self._mode_freq, self._total = modes, mode_freq, total
+
+    def count(self, value: object) -> int:
+        """
+        The method returns the number of times value has been seen
+        """
+        frequency = self._map.get(value)
+        return 0 if frequency is None else frequency
+
+    def get_total(self) -> int:
         """
-        The method returns the current hash function used by the hash map
+        Return the number of values counted, including repeats
         """
-        if self._hash_function is hash_function_1:
-            return "Hash function 1"
-        if self._hash_function is hash_function_2:
-            return "Hash function 2"
+        return self._total
+
+    def __len__(self) -> int:
+        """
+        Return the number of distinct values counted
+        """
+        return self._map.get_size()
+
+    def items(self):
+        """
+        The method lazily yields each distinct (value, frequency) pair
+        """
+        return self._map.items()
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        The method returns the mode value(s) and the modal frequency
+        :return: A tuple containing an array with the mode value(s), in the order they reached
+                 the modal frequency, and the frequency
+        """
+        return (DynamicArray(self._mode_values), self._mode_freq)
+
+    def top_k(self, k: int) -> DynamicArray:
+        """
+        The method returns the k most frequent values, using a heap of at most k entries
+        :param k: The number of values to return
+        :return: An array of (value, frequency) tuples, most frequent first; ties are in no particular order
+        """
+        return DynamicArray(heapq.nlargest(k, self._map.items(), key=lambda item: item[1]))
 
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
     The function takes an unsorted array and returns a tuple containing
     the mode value(s) and the modal frequency
-    :param da: The specified Dynamic Array
+    :param da: The specified Dynamic Array, or any iterable of values
     :return: A tuple containing an array with the mode value(s), and the frequency
     """
-    # Use HashMap to track frequency of values
-    map = HashMap(da.length() // 3, hash_function_1)
-
-    mode_array, mode_freq = DynamicArray(), 0
-    len_of_array = da.length()
-
-    # Track frequency of values
-    for idx in range(len_of_array):
-        curr_freq = map.get(da[idx])
-        curr_freq = 0 if curr_freq is None else curr_freq
-        map.put(da[idx], curr_freq + 1)
-
-        # Replace mode with new mode or append to mode array
-        if curr_freq + 1 > mode_freq:
-            mode_array = DynamicArray()
-            mode_array.append(da[idx])
-            mode_freq = curr_freq + 1
-        elif curr_freq + 1 == mode_freq:
-            mode_array.append(da[idx])
-
-    return (mode_array, mode_freq)
+    counter = FrequencyCounter()
+    counter.update(da)
+    return counter.mode()
+
+
+def find_top_k(values, k: int) -> DynamicArray:
+    """
+    The function counts the values in one pass and returns the k most frequent
+    :param values: A Dynamic Array, or any iterable of values
+    :param k: The number of values to return
+    :return: An array of (value, frequency) tuples, most frequent first
+    """
+    counter = FrequencyCounter()
+    counter.update(values)
+    return counter.top_k(k)
@@ -0,0 +1,298 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents a HashMap split by hash into independent chaining
+#               shards, which can be built in parallel worker processes and merged
+"""
+import operator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from hash_map_sc import HashMap as HashMapSC
+from hashmap_helpers import HashMapMixin, resolve_hash_function
+
+
+def _last_writer_wins(old: object, new: object) -> object:
+    """Merge function that keeps the newer value."""
+    return new
+
+
+# Named merge functions: called as merge(existing value, incoming value) -> combined value
+MERGE_FUNCTIONS = {
+    "sum": operator.add,
+    "last": _last_writer_wins,
+}
+
+
+def _resolve_merge(how):
+    """Return the merge function for a name in MERGE_FUNCTIONS, or how itself if it is callable."""
+    if callable(how):
+        return how
+    try:
+        return MERGE_FUNCTIONS[how]
+    except KeyError:
+        raise ValueError(f"Unknown merge {how!r}; expected one of {sorted(MERGE_FUNCTIONS)} or a function")
+
+
+def _new_shard(capacity: int, function) -> HashMapSC:
+    """Return an empty shard."""
+    return HashMapSC(capacity, function, max_load=1.0)
+
+
+def _merge_into(shard: HashMapSC, key: str, value: object, hash_value: int, merge) -> None:
+    """Add key/value to shard given the key's hash within the shard, merging with any existing value."""
+    node = shard._find_node(key, hash_value)
+    if node:
+        node.value = merge(node.value, value)
+    else:
+        shard._put_hashed(key, value, hash_value)
+
+
+def _build_partition(items, function, num_shards: int, how, counting: bool) -> list:
+    """
+    Worker for HashMap.build: combine the items of one input partition, shard by shard.
+    :param items: (key, value) pairs, or keys when counting
+    :param function: The hash function
+    :param num_shards: The number of shards
+    :param how: The merge name or function
+    :param counting: Treat every item as (item, 1)
+    :return: A list with the (key, value, hash) triples for each shard, hashed in this worker
+    """
+    merge = _resolve_merge(how)
+    shards = [_new_shard(11, function) for _ in range(num_shards)]
+    for item in items:
+        key, value = (item, 1) if counting else item
+        hash_value, idx = divmod(function(key), num_shards)
+        _merge_into(shards[idx], key, value, hash_value, merge)
+    return [[(key, value, function(key)) for key, value in shard.items()] for shard in shards]
+
+
+def _check_hashes(results: list, function) -> None:
+    """
+    Raise ValueError unless function gives this process the hashes that the build workers
+    returned, checking the first key of each partition. A function seeded per process
+    (e.g. builtin_hash under the spawn start method) would otherwise build a map in
+    which every lookup misses.
+    """
+    for result in results:
+        triple = next((pairs[0] for pairs in result if pairs), None)
+        if triple is not None and function(triple[0]) != triple[2]:
+            raise ValueError(f"The hash function gives {triple[0]!r} a different hash in a worker process; "
+                             "use one that hashes the same in every process, e.g. fnv1a_hash")
+
+
+def _build_shard(partials: list, function, num_shards: int, how) -> HashMapSC:
+    """
+    Worker for HashMap.build: merge the results of every partition for one shard, in partition order.
+    :param partials: A list of (key, value, hash) triple lists, one per partition
+    :return: The shard
+    """
+    merge = _resolve_merge(how)
+    shard = _new_shard(max(sum(len(triples) for triples in partials), 11), function)
+    for triples in partials:
+        for key, value, hash_value in triples:
+            _merge_into(shard, key, value, hash_value // num_shards, merge)
+    return shard
+
+
+class HashMap(HashMapMixin):
+    def __init__(self, num_shards: int, function, capacity: int = 11) -> None:
+        """
+        Initialize new HashMap made of num_shards chaining HashMaps.
+        A key's shard is its hash modulo num_shards, so lookups go straight to one shard.
+        :param num_shards: The number of shards
+        :param function: The hash function; to build in worker processes it must be a module-level
+                         function that gives the same hash in every process (e.g. fnv1a_hash)
+        :param capacity: The initial number of buckets, shared between the shards
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be positive")
+        self._hash_function = resolve_hash_function(function)
+        self._num_shards = num_shards
+        shard_capacity = max(-(-capacity // num_shards), 1)
+        self._shards = [_new_shard(shard_capacity, self._hash_function) for _ in range(num_shards)]
+
+    @classmethod
+    def build(cls, partitions, function, num_shards: int = 8, how="last", max_workers: int = None,
+              counting: bool = False) -> "HashMap":
+        """
+        Build a sharded HashMap from partitioned input, in parallel across worker processes.
+        Each partition is first combined per shard by one worker; then each shard merges
+        its part of every partition, in partition order, in one worker.
+        :param partitions: A list of partitions, each a picklable list of (key, value) pairs
+                           (or of keys when counting)
+        :param function: The hash function
+        :param num_shards: The number of shards
+        :param how: How values for the same key are combined: "sum", "last" (last writer wins,
+                    in partition order) or a picklable function merge(old, new)
+        :param max_workers: The number of worker processes; 1 builds in this process
+        :param counting: Count each key instead of reading (key, value) pairs; implies how="sum"
+        :return: The sharded HashMap
+        :raises ValueError: If a worker hashes a key differently from this process
+        """
+        function = resolve_hash_function(function)
+        how = "sum" if counting else how
+        _resolve_merge(how)
+        partitions = list(partitions)
+        hash_map = cls(num_shards, function)
+
+        executor = None if max_workers == 1 else ProcessPoolExecutor(max_workers=max_workers)
+        mapper = map if executor is None else executor.map
+        try:
+            results = list(mapper(_build_partition, partitions, repeat(function), repeat(num_shards),
+                                  repeat(how), repeat(counting)))
+            _check_hashes(results, function)
+            partials = [[result[idx] for result in results] for idx in range(num_shards)]
+            hash_map._shards = list(mapper(_build_shard, partials, repeat(function), repeat(num_shards),
+                                           repeat(how)))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return hash_map
+
+    @classmethod
+    def count(cls, partitions, function, num_shards: int = 8, max_workers: int = None) -> "HashMap":
+        """
+        Build a frequency table (key -> number of occurrences) from partitioned keys, in parallel
+        :param partitions: A list of partitions, each a picklable list of keys
+        :return: The sharded HashMap of counts
+        """
+        return cls.build(partitions, function, num_shards, max_workers=max_workers, counting=True)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for idx in range(self._num_shards):
+            out += 'shard ' + str(idx) + ':\n' + str(self._shards[idx])
+        return out
+
+    def _route(self, hash_value: int) -> (HashMapSC, int):
+        """
+        Helper method that returns the shard for a key's hash and the key's hash within the shard.
+        The shard is picked by the hash modulo the number of shards and the bucket by the
+        quotient, so the keys of one shard still spread over all of its buckets.
+        :param hash_value: The hash of the key to be routed
+        :return: A tuple of the shard and the key's hash within the shard
+        """
+        hash_value, idx = divmod(hash_value, self._num_shards)
+        return self._shards[idx], hash_value
+
+    def get_shard(self, idx: int) -> HashMapSC:
+        """
+        The method returns the chaining HashMap holding shard idx
+        """
+        return self._shards[idx]
+
+    def get_num_shards(self) -> int:
+        """
+        Return the number of shards
+        """
+        return self._num_shards
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(shard.get_size() for shard in self._shards)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the total of the shard capacities
+        """
+        return sum(shard.get_capacity() for shard in self._shards)
+
+    # ------------------------------------------------------------------ #
+
+    def _put_hashed(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Helper method to put/put_many that updates or adds the key/value in its shard
+        """
+        shard, hash_value = self._route(hash_value)
+        shard._put_hashed(key, value, hash_value)
+
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
+        """
+        Helper method that returns the key/value from its shard, if it exists
+        :param key: The key to be searched
+        :param hash_value: The hash of the key, computed if not given
+        :return: Returns a key/value pair if in hash table, else (None, None)
+        """
+        shard, hash_value = self._route(self._hash_function(key) if hash_value is None else hash_value)
+        node = shard._find_node(key, hash_value)
+        return (node.key, node.value) if node else (None, None)
+
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/remove_many/__delitem__ that removes the key from its shard
+        :param key: The key to be removed
+        :param hash_value: The hash of the key
+        :return: True if the key was removed, else False
+        """
+        shard, hash_value = self._route(hash_value)
+        return shard._remove_hashed(key, hash_value)
+
+    def update(self, pairs, how="last") -> None:
+        """
+        The method merges every key/value pair in pairs into the hash map
+        :param pairs: An iterable of (key, value) pairs
+        :param how: "sum", "last" or a function merge(old, new)
+        :return: None
+        """
+        merge = _resolve_merge(how)
+        for key, value in pairs:
+            shard, hash_value = self._route(self._hash_function(key))
+            _merge_into(shard, key, value, hash_value, merge)
+
+    def merge(self, other: "HashMap", how="sum") -> None:
+        """
+        The method merges another sharded HashMap into this one, shard by shard.
+        Maps with the same number of shards and hash function merge without rerouting any keys.
+        :param other: The sharded HashMap to merge in; its values are the newer ones
+        :param how: "sum", "last" or a function merge(old, new)
+        :return: None
+        """
+        merge = _resolve_merge(how)
+        if other._num_shards != self._num_shards or other._hash_function is not self._hash_function:
+            self.update(other.items(), merge)
+            return
+        for idx in range(self._num_shards):
+            shard = self._shards[idx]
+            for key, value in other._shards[idx].items():
+                _merge_into(shard, key, value, self._hash_function(key) // self._num_shards, merge)
+
+    def empty_buckets(self) -> int:
+        """
+        The method returns the number of empty buckets in the hash table
+        :return: The number of empty buckets
+        """
+        return sum(shard.empty_buckets() for shard in self._shards)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        The method changes the capacity of the hash table, sharing it between the shards
+        :param new_capacity: The new capacity of the hash table
+        :return: None
+        """
+        if new_capacity < 1:
+            return
+        for shard in self._shards:
+            shard.resize_table(max(-(-new_capacity // self._num_shards), 1))
+
+    def clear(self) -> None:
+        """
+        The method clears the contents of the hash map.
+        :return: None
+        """
+        for shard in self._shards:
+            shard.clear()
+
+    # ------------------------------------------------------------------ #
+
+    def _iter_items(self):
+        """
+        Helper generator that yields the (key, value) pairs of one shard after another
+        """
+        for shard in self._shards:
+            yield from shard.items()
@@ -0,0 +1,388 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program saves a chaining or open addressing HashMap to a binary snapshot file,
+#               and loads it back either as a full HashMap or as a read-only map over mmap
+"""
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+from hash_map_oa import HashMap as HashMapOA
+from hash_map_oa import CompactHashMap
+from hash_map_sc import HashMap as HashMapSC
+from hashmap_helpers import DynamicArray, hash_function_name, resolve_hash_function
+
+# File layout (little-endian, every section 8-byte aligned):
+#   header   magic, version, kind, name length, capacity, size, entries offset, blobs offset,
+#            settings length
+#   name     the registered name of the hash function, UTF-8, then the pickled settings: the
+#            constructor arguments that change how the map behaves (see _map_settings)
+#   buckets  capacity + 1 words; bucket b owns entries buckets[b] to buckets[b + 1] - 1
+#   entries  3 words per entry: 64-bit hash, blob offset, key length << 32 | value length
+#   blobs    the pickled key followed by the pickled value, for each entry
+MAGIC = b'PYHMSNAP'
+VERSION = 2
+_HEADER = struct.Struct('<8sHHIQQQQI')
+# Version 1 files have no settings, and are still read
+_HEADER_V1 = struct.Struct('<8sHHIQQQQ')
+_PROTOCOL = 4
+_MASK_64 = (1 << 64) - 1
+
+# Map classes by their kind in the header; subclasses are listed before their base class
+_KINDS = ((CompactHashMap, 2), (HashMapOA, 1), (HashMapSC, 0))
+
+
+def _align(offset: int) -> int:
+    """Round offset up to a multiple of 8."""
+    return -(-offset // 8) * 8
+
+
+def _write_words(file, words: array) -> None:
+    """Write an array of 64-bit words to file in little-endian order."""
+    if sys.byteorder != 'little':
+        words = array('Q', words)
+        words.byteswap()
+    words.tofile(file)
+
+
+def _read_words(view: memoryview):
+    """Return the little-endian 64-bit words in view; a zero-copy cast on little-endian machines."""
+    if sys.byteorder == 'little':
+        return view.cast('Q')
+    words = array('Q', bytes(view))
+    words.byteswap()
+    return words
+
+
+def _encode(obj: object) -> bytes:
+    """Pickle a key or value for the snapshot; equal str and int keys always give equal bytes."""
+    return pickle.dumps(obj, protocol=_PROTOCOL)
+
+
+def _map_settings(hash_map) -> dict:
+    """
+    Return the constructor arguments that change how hash_map behaves, for load_snapshot to pass
+    back: the probe strategy of an open addressing map (with the registered name of its step
+    function) or the load factors of a chaining map; other maps cannot be saved
+    """
+    if isinstance(hash_map, HashMapOA):
+        step_name = hash_function_name(hash_map._step_function)
+        if step_name is None and hash_map.get_probe() == "double":
+            raise ValueError("The step function must be registered to be saved")
+        settings = {"probe": hash_map.get_probe()}
+        if step_name is not None:
+            settings["step_function"] = step_name
+        return settings
+    if isinstance(hash_map, HashMapSC):
+        return {"max_load": hash_map._max_load, "min_load": hash_map._min_load}
+    return {}
+
+
+def save_snapshot(hash_map, path: str) -> None:
+    """
+    The function writes a chaining or open addressing HashMap to a snapshot file.
+    Entries are grouped by bucket (hash modulo capacity), so the file can be searched in place.
+    The probe strategy of an open addressing map and the load factors of a chaining map are saved too.
+    The file is written beside path and renamed over it, so readers never see a partial snapshot.
+    :param hash_map: The HashMap to save; its hash function must be registered and give the
+                     same hash in every process (e.g. fnv1a_hash), with values below 2 ** 64
+    :param path: The file to write
+    :return: None
+    """
+    hash_map.complete_resize()
+    _write_snapshot(hash_map.items(), hash_map.get_size(), path, hash_map._hash_function,
+                    hash_map.get_capacity(), type(hash_map), _map_settings(hash_map))
+
+
+def save_items(items: list, path: str, function, capacity: int, cls=HashMapOA) -> None:
+    """
+    The function writes a snapshot of a map of class cls holding items, without building the map;
+    load_snapshot returns that map.
+    :param items: A list of (key, value) pairs with distinct keys
+    :param path: The file to write
+    :param function: The hash function, as for save_snapshot
+    :param capacity: The capacity of the map
+    :param cls: The chaining, open addressing or compact HashMap class
+    :return: None
+    """
+    _write_snapshot(items, len(items), path, resolve_hash_function(function), capacity, cls, {})
+
+
+def _write_snapshot(items, size: int, path: str, function, capacity: int, cls, settings: dict) -> None:
+    """
+    Helper function to save_snapshot/save_items that writes size (key, value) pairs in one pass.
+    Blobs are streamed in the order given; the entries are then sorted into bucket order.
+    """
+    kind = next((kind for base, kind in _KINDS if issubclass(cls, base)), None)
+    if kind is None:
+        raise TypeError(f"Cannot snapshot {cls.__name__}")
+    name = hash_function_name(function)
+    if name is None:
+        raise ValueError("The hash function must be registered to be saved")
+
+    name_bytes = name.encode()
+    settings_bytes = _encode(settings) if settings else b''
+    buckets_offset = _align(_HEADER.size + len(name_bytes) + len(settings_bytes))
+    entries_offset = buckets_offset + 8 * (capacity + 1)
+    blobs_offset = entries_offset + 24 * size
+
+    hashes, offsets, lengths = array('Q'), array('Q'), array('Q')
+    buckets = array('Q', bytes(8 * (capacity + 1)))
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.seek(blobs_offset)
+            offset = blobs_offset
+            for key, value in items:
+                hash_value = function(key)
+                if not 0 <= hash_value <= _MASK_64:
+                    raise ValueError(f"Hash of {key!r} does not fit in 64 bits")
+                key_blob, value_blob = _encode(key), _encode(value)
+                file.write(key_blob)
+                file.write(value_blob)
+                hashes.append(hash_value)
+                offsets.append(offset)
+                lengths.append(len(key_blob) << 32 | len(value_blob))
+                buckets[hash_value % capacity + 1] += 1
+                offset += len(key_blob) + len(value_blob)
+            if len(hashes) != size:
+                raise ValueError(f"Expected {size} items, got {len(hashes)}")
+
+            # Counting sort: bucket b's entries start after the entries of every earlier bucket
+            for idx in range(capacity):
+                buckets[idx + 1] += buckets[idx]
+            entries = array('Q', bytes(24 * size))
+            fill = array('Q', buckets)
+            for position in range(size):
+                hash_value = hashes[position]
+                idx = 3 * fill[hash_value % capacity]
+                fill[hash_value % capacity] += 1
+                entries[idx], entries[idx + 1], entries[idx + 2] = hash_value, offsets[position], lengths[position]
+
+            file.seek(0)
+            file.write(_HEADER.pack(MAGIC, VERSION, kind, len(name_bytes), capacity, size,
+                                    entries_offset, blobs_offset, len(settings_bytes)))
+            file.write(name_bytes)
+            file.write(settings_bytes)
+            file.seek(buckets_offset)
+            _write_words(file, buckets)
+            _write_words(file, entries)
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str, function=None, **kwargs):
+    """
+    The function loads a snapshot file into a new HashMap of the kind that was saved.
+    Keys are placed using their stored hashes, so nothing is rehashed.
+    :param path: The snapshot file
+    :param function: The hash function, if it is not registered under the saved name
+    :param kwargs: Further arguments for the HashMap constructor, e.g. incremental; they override
+                   the saved settings (probe and step_function, or max_load and min_load)
+    :return: The chaining, open addressing or compact HashMap
+    """
+    with MappedHashMap(path, function) as snapshot:
+        cls = {kind: cls for cls, kind in _KINDS}[snapshot._kind]
+        settings = dict(snapshot._settings)
+        if "step_function" in settings:
+            settings["step_function"] = resolve_hash_function(settings["step_function"])
+        settings.update(kwargs)
+        hash_map = cls(snapshot.get_capacity(), snapshot._hash_function, **settings)
+        view, entries = snapshot._view, snapshot._entries
+        for idx in range(0, 3 * snapshot.get_size(), 3):
+            offset, lengths = entries[idx + 1], entries[idx + 2]
+            key_end = offset + (lengths >> 32)
+            key = pickle.loads(view[offset:key_end])
+            value = pickle.loads(view[key_end:key_end + (lengths & 0xFFFFFFFF)])
+            hash_map._put_hashed(key, value, entries[idx])
+    return hash_map
+
+
+class MappedHashMap:
+    """
+    Read-only HashMap over a memory-mapped snapshot file. Opening maps the file and reads the
+    header only; the operating system pages in the parts a lookup touches. A lookup hashes the
+    key, scans its bucket's entries in place, compares the pickled key bytes, and unpickles the
+    value only on a match. Snapshots contain pickles: only open files from a trusted source.
+    """
+
+    def __init__(self, path: str, function=None) -> None:
+        """
+        Map a snapshot file
+        :param path: The snapshot file
+        :param function: The hash function, if it is not registered under the saved name
+        """
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._buckets = self._entries = None
+        if len(self._view) < _HEADER_V1.size or self._view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a HashMap snapshot")
+        version = _HEADER_V1.unpack_from(self._view)[1]
+        if version not in (1, VERSION):
+            self.close()
+            raise ValueError(f"{path} is snapshot version {version}; expected {VERSION}")
+        header = _HEADER if version == VERSION else _HEADER_V1
+        fields = header.unpack_from(self._view)
+        _, _, kind, name_length, capacity, size, entries_offset, blobs_offset = fields[:8]
+        settings_length = fields[8] if version == VERSION else 0
+
+        name_end = header.size + name_length
+        name = bytes(self._view[header.size:name_end]).decode()
+        self._settings = pickle.loads(self._view[name_end:name_end + settings_length]) if settings_length else {}
+        self._hash_function = resolve_hash_function(name if function is None else function)
+        self._kind = kind
+        self._capacity = capacity
+        self._size = size
+        self._buckets = _read_words(self._view[entries_offset - 8 * (capacity + 1):entries_offset])
+        self._entries = _read_words(self._view[entries_offset:blobs_offset])
+
+        # A function that hashes differently here (e.g. a per-process seed) cannot find any keys
+        if size and self._hash_function(self._entry(0)[0]) != self._entries[0]:
+            self.close()
+            raise ValueError(f"Hash function {name!r} does not reproduce the hashes in {path}")
+
+    def __enter__(self) -> "MappedHashMap":
+        """
+        Return the map, for use as a context manager
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Unmap the file at the end of a with block
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        The method unmaps the file; the map cannot be used afterwards
+        """
+        for view in (self._buckets, self._entries, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+    def _entry(self, idx: int) -> (object, object):
+        """
+        Helper method that unpickles the key and value of entry idx
+        """
+        entries, view = self._entries, self._view
+        offset, lengths = entries[3 * idx + 1], entries[3 * idx + 2]
+        key_end = offset + (lengths >> 32)
+        return (pickle.loads(view[offset:key_end]),
+                pickle.loads(view[key_end:key_end + (lengths & 0xFFFFFFFF)]))
+
+    def _find(self, key: str) -> int:
+        """
+        Helper method that returns the index of the entry for key, else -1
+        """
+        hash_value = self._hash_function(key)
+        bucket = hash_value % self._capacity
+        entries, view, key_blob = self._entries, self._view, None
+        for idx in range(self._buckets[bucket], self._buckets[bucket + 1]):
+            if entries[3 * idx] == hash_value:
+                key_blob = _encode(key) if key_blob is None else key_blob
+                offset = entries[3 * idx + 1]
+                if view[offset:offset + (entries[3 * idx + 2] >> 32)] == key_blob:
+                    return idx
+        return -1
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of the saved map
+        """
+        return self._capacity
+
+    def get_hash_function(self) -> str:
+        """
+        The method returns the current hash function used by the hash map
+        """
+        return hash_function_name(self._hash_function)
+
+    def get(self, key: str) -> object:
+        """
+        The method returns the value associated with the given key
+        :param key: The key to be searched
+        :return: Returns the value associated with the given key, else returns None if not found
+        """
+        idx = self._find(key)
+        return None if idx < 0 else self._entry(idx)[1]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method returns True if the key is in the hash map, else False
+        :param: the key to be found
+        :return: Returns True if the key is found, else False
+        """
+        return self._find(key) >= 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        The method returns all of the keys stored in the hash map
+        :return: Returns an array with the keys of the hash map
+        """
+        return DynamicArray(list(self.keys()))
+
+    def __len__(self) -> int:
+        """
+        Return size of map, for use with len()
+        """
+        return self._size
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return True if the key is in the hash map, for use with the in operator
+        """
+        return self.contains_key(key)
+
+    def __getitem__(self, key: str) -> object:
+        """
+        Return the value for key using [] syntax; raises KeyError if the key is not found
+        """
+        idx = self._find(key)
+        if idx < 0:
+            raise KeyError(key)
+        return self._entry(idx)[1]
+
+    def __iter__(self):
+        """
+        Return a lazy iterator over the keys of the hash map
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        The method lazily yields each key in the hash map, in bucket order
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        The method lazily yields each value in the hash map, in bucket order
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self):
+        """
+        The method lazily yields each (key, value) pair in the hash map, in bucket order
+        """
+        for idx in range(self._size):
+            yield self._entry(idx)
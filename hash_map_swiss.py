@@ -0,0 +1,314 @@
+"""
+# Name:         Josh Harris
+# Course:       Data Structures
+# Description:  The program represents an implementation of the HashMap using open
+#               addressing with SwissTable-style control bytes probed a group at a time
+"""
+import sys
+import time
+from array import array
+
+from hashmap_helpers import DynamicArray, HashEntry, HashMapMixin, HashMapStats, resolve_hash_function
+
+# Control bytes: a full slot holds the low 7 bits of its key's hash (0x00 - 0x7F);
+# empty and deleted slots have the high bit set, so one mask finds both
+_EMPTY, _DELETED = 0x80, 0xFE
+_HASH_MASK = (1 << 64) - 1
+
+# Slots are probed in groups of 8 control bytes, read as one native 64-bit integer;
+# _BYTE_FLIP maps a byte's position in that integer back to its slot on big-endian machines
+_GROUP_WIDTH = 8
+_LSBS = 0x0101010101010101
+_MSBS = 0x8080808080808080
+_BYTE_FLIP = 0 if sys.byteorder == 'little' else 7
+
+
+def _match_byte(word: int, pattern: int) -> int:
+    """
+    Return a mask with the high bit set in each byte of word equal to the byte repeated in pattern.
+    A byte just above a true match may also be set; callers confirm every candidate.
+    """
+    x = word ^ pattern
+    return (x - _LSBS) & ~x & _MSBS
+
+
+def _match_empty(word: int) -> int:
+    """Return a mask with the high bit set in each byte of word that is _EMPTY."""
+    return word & (~word << 6) & _MSBS
+
+
+class HashMap(HashMapMixin):
+    def __init__(self, capacity: int, function, *, stats: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        SwissTable-style group probing for collision resolution.
+        Keys are only compared in slots whose control byte matches 7 bits of the key's hash,
+        so a miss rarely compares any keys at all.
+        :param capacity: The initial number of slots, rounded up to a power of two groups of 8
+        :param function: The hash function; the 7 low bits tag the slot and the rest choose the group
+        :param stats: Record operation counts, probe lengths and resize times (see get_stats)
+        """
+        self._hash_function = resolve_hash_function(function)
+        self._size = 0
+        self._deleted = 0
+        self._allocate(capacity)
+
+        # Bumped whenever keys are added, removed or moved, to detect mutation during iteration
+        self._version = 0
+        self._stats = HashMapStats() if stats else None
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method to init/resize that creates empty arrays with room for at least capacity slots
+        """
+        groups = 1
+        while groups * _GROUP_WIDTH < capacity:
+            groups *= 2
+        self._capacity = groups * _GROUP_WIDTH
+        self._group_mask = groups - 1
+        self._ctrl = bytearray([_EMPTY]) * self._capacity
+        self._groups = memoryview(self._ctrl).cast('Q')
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._hashes = array('Q', bytes(8 * self._capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            entry = None
+            if self._ctrl[i] < _EMPTY:
+                entry = f"K: {self._keys[i]} V: {self._values[i]} TS: False"
+            elif self._ctrl[i] == _DELETED:
+                entry = "K: None V: None TS: True"
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _put_hashed(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Helper method to put/put_many that updates or adds the key/value given the key's hash
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :param hash_value: the hash of the key
+        :return: None
+        """
+        if self._stats is not None:
+            self._stats.count("put")
+        hash_value &= _HASH_MASK
+        idx = self._find_slot(key, hash_value)
+        if idx >= 0:
+            self._values[idx] = value
+            return
+
+        # Keep at least one group in eight free so that every probe sequence reaches an empty slot
+        if (self._size + self._deleted + 1) * 8 > self._capacity * 7:
+            self._make_room()
+
+        idx = self._free_slot(hash_value)
+        if self._ctrl[idx] == _DELETED:
+            self._deleted -= 1
+        self._ctrl[idx] = hash_value & 0x7F
+        self._keys[idx], self._values[idx], self._hashes[idx] = key, value, hash_value
+        self._size += 1
+        self._version += 1
+
+    def _make_room(self) -> None:
+        """
+        Helper method to put that clears deleted slots by rehashing in place when they make up
+        much of the table, and otherwise doubles the capacity.
+        :return: None
+        """
+        if (self._size + 1) * 32 <= self._capacity * 25:
+            self.resize_table(self._capacity)
+        else:
+            self.resize_table(self._capacity * 2)
+
+    def _find_slot(self, key: str, hash_value: int) -> int:
+        """
+        Helper method that returns the index of key, comparing keys only where the control
+        byte matches. Groups are probed triangularly (1, 2, 3, ... groups apart), which visits
+        every group since the number of groups is a power of two.
+        :param key: The key to be searched
+        :param hash_value: The 64-bit hash of the key
+        :return: The index of the key, else -1
+        """
+        groups, hashes, keys = self._groups, self._hashes, self._keys
+        group_mask = self._group_mask
+        pattern = _LSBS * (hash_value & 0x7F)
+        group = (hash_value >> 7) & group_mask
+        step = 0
+        result = -1
+
+        while True:
+            word = groups[group]
+            # _match_byte and _match_empty, inlined as this is the hottest loop
+            x = word ^ pattern
+            match = (x - _LSBS) & ~x & _MSBS
+            while match:
+                bit = match & -match
+                idx = group * _GROUP_WIDTH + ((bit.bit_length() - 1) >> 3 ^ _BYTE_FLIP)
+                if hashes[idx] == hash_value and keys[idx] == key:
+                    result = idx
+                    break
+                match ^= bit
+            if result >= 0 or word & (~word << 6) & _MSBS:
+                break
+            step += 1
+            group = (group + step) & group_mask
+
+        if self._stats is not None:
+            self._stats.record_probe(step)
+        return result
+
+    def _free_slot(self, hash_value: int) -> int:
+        """
+        Helper method to put/resize that returns the first empty or deleted slot in the key's probe sequence
+        :param hash_value: The 64-bit hash of the key
+        :return: The index of the slot
+        """
+        groups, group_mask = self._groups, self._group_mask
+        group = (hash_value >> 7) & group_mask
+        step = 0
+        while True:
+            free = groups[group] & _MSBS
+            if free:
+                return group * _GROUP_WIDTH + (((free & -free).bit_length() - 1) >> 3 ^ _BYTE_FLIP)
+            step += 1
+            group = (group + step) & group_mask
+
+    def empty_buckets(self) -> int:
+        """
+        The method returns the number of empty buckets in the hash table
+        :return: The number of empty buckets
+        """
+        return self._capacity - self._size - self._deleted
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        The method changes the capacity of the hash table, rounded up to a power of two groups of 8
+        slots and to no less than the size requires
+        :param new_capacity: The new capacity of the hash table
+        :return: None
+        """
+        if new_capacity < self._size or new_capacity < 1:
+            return
+
+        start = time.perf_counter() if self._stats is not None else None
+        while self._size * 8 > new_capacity * 7:
+            new_capacity *= 2
+
+        ctrl, keys, values, hashes = self._ctrl, self._keys, self._values, self._hashes
+        self._allocate(new_capacity)
+        self._deleted = 0
+        self._version += 1
+
+        # Rehash keys for new hash table using the cached hashes
+        for idx in range(len(ctrl)):
+            if ctrl[idx] < _EMPTY:
+                hash_value = hashes[idx]
+                new_idx = self._free_slot(hash_value)
+                self._ctrl[new_idx] = ctrl[idx]
+                self._keys[new_idx], self._values[new_idx] = keys[idx], values[idx]
+                self._hashes[new_idx] = hash_value
+
+        if start is not None:
+            self._stats.record_resize(time.perf_counter() - start)
+
+    def _get_key_value(self, key: str, hash_value: int = None) -> (str, object):
+        """
+        Helper method that returns the key/value from the hash table, if it exists
+        :param key: The key to be searched
+        :param hash_value: The hash of the key, computed if not given
+        :return: Returns a key/value pair if in hash table, else (None, None)
+        """
+        if self._stats is not None:
+            self._stats.count("get")
+        hash_value = self._hash_function(key) if hash_value is None else hash_value
+        idx = self._find_slot(key, hash_value & _HASH_MASK)
+        if idx < 0:
+            return (None, None)
+        return (self._keys[idx], self._values[idx])
+
+    def _remove_hashed(self, key: str, hash_value: int) -> bool:
+        """
+        Helper method to remove/remove_many that removes the key given its hash.
+        A group that still has an empty slot has never been full, so no probe sequence
+        continues past it and the slot can be marked empty rather than deleted.
+        :param key: The key to be removed
+        :param hash_value: The hash of the key
+        :return: True if the key was removed, else False
+        """
+        if self._stats is not None:
+            self._stats.count("remove")
+        idx = self._find_slot(key, hash_value & _HASH_MASK)
+        if idx < 0:
+            return False
+
+        if _match_empty(self._groups[idx // _GROUP_WIDTH]):
+            self._ctrl[idx] = _EMPTY
+        else:
+            self._ctrl[idx] = _DELETED
+            self._deleted += 1
+        self._keys[idx] = self._values[idx] = None
+        self._size -= 1
+        self._version += 1
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def _reserve(self, count: int) -> None:
+        """
+        Helper method to put_many that grows the table once so that count more keys
+        fit without another resize.
+        :param count: The number of keys about to be added
+        :return: None
+        """
+        if (self._size + self._deleted + count) * 8 > self._capacity * 7:
+            self.resize_table(max(self._capacity, (self._size + count) * 8 // 7 + 1))
+
+    def clear(self) -> None:
+        """
+        The method clears the contents of the hash map.
+        :return: None
+        """
+        version, stats = self._version, self._stats
+        self.__init__(self._capacity, self._hash_function)
+        self._version, self._stats = version + 1, stats
+
+    def get_buckets(self) -> DynamicArray:
+        """
+        The method returns a copy of the hash array, with a HashEntry for each occupied slot.
+        :return: The hash array
+        """
+        result_array = DynamicArray()
+        for idx in range(self._capacity):
+            entry = None
+            if self._ctrl[idx] < _EMPTY:
+                entry = HashEntry(self._keys[idx], self._values[idx], self._hashes[idx])
+            result_array.append(entry)
+        return result_array
+
+    def _stats_fields(self) -> dict:
+        """
+        Helper method to get_stats that reports the deleted slot count along with the size and
+        capacity. Probe lengths count groups, not slots.
+        """
+        return {"size": self._size, "capacity": self._capacity, "tombstones": self._deleted}
+
+    # ------------------------------------------------------------------ #
+
+    def _iter_items(self):
+        """
+        Helper generator that walks the slots in place, yielding (key, value) pairs.
+        Raises RuntimeError if keys are added or removed while iterating.
+        """
+        version = self._version
+        for idx in range(self._capacity):
+            if self._ctrl[idx] < _EMPTY:
+                yield (self._keys[idx], self._values[idx])
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
@@ -2,6 +2,9 @@
 # Description: Data structures used by Hashmaps
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 """
+import hashlib
+import heapq
+import os
 
 
 class DynamicArrayException(Exception):
@@ -76,22 +79,478 @@ class DynamicArray:
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
-    hash = 0
-    for letter in key:
-        hash += ord(letter)
-    return hash
+    return sum(map(ord, key))
 
 
 def hash_function_2(key: str) -> int:
     """Sample Hash function #2 to be used with HashMap implementation"""
-    hash, index = 0, 0
-    index = 0
-    for letter in key:
-        hash += (index + 1) * ord(letter)
-        index += 1
+    return sum((index + 1) * ord(letter) for index, letter in enumerate(key))
+
+
+_MASK_64 = (1 << 64) - 1
+_FNV_OFFSET_BASIS = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+
+
+def fnv1a_hash(key: str) -> int:
+    """
+    64-bit FNV-1a hash of the UTF-8 encoding of key.
+    Deterministic across processes, so it is suitable for hashes that are persisted. FNV-1a
+    consumes one byte per step, so this runs a Python loop per byte (several microseconds for
+    a 64 byte key); blake2b_hash is the cheaper stable hash unless FNV-1a values are needed,
+    e.g. to match NumpyHashMap's vectorized hashing.
+    """
+    hash = _FNV_OFFSET_BASIS
+    for byte in str(key).encode():
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK_64
     return hash
 
 
+def blake2b_hash(key: str) -> int:
+    """
+    Unkeyed 64-bit BLAKE2b hash of the UTF-8 encoding of key.
+    Deterministic across processes like fnv1a_hash, but hashlib runs it in C, so it costs
+    about as much as one call into hashlib whatever the length of the key.
+    """
+    return int.from_bytes(hashlib.blake2b(str(key).encode(), digest_size=8).digest(), 'little')
+
+
+def builtin_hash(key: str) -> int:
+    """
+    Thin wrapper around the builtin hash, masked to a non-negative 64-bit value.
+    CPython hashes str with SipHash using a per-process random seed (see PYTHONHASHSEED).
+    """
+    return hash(key) & _MASK_64
+
+
+def int_hash(key: int) -> int:
+    """
+    SplitMix64 finalizer applied to an integer key, so that sequential IDs
+    are spread evenly over the table.
+    """
+    z = (int(key) + 0x9e3779b97f4a7c15) & _MASK_64
+    z = ((z ^ (z >> 30)) * 0xbf58476d1ce4e5b9) & _MASK_64
+    z = ((z ^ (z >> 27)) * 0x94d049bb133111eb) & _MASK_64
+    return z ^ (z >> 31)
+
+
+def make_keyed_hash(secret: bytes = None):
+    """
+    Return a keyed 64-bit hash function, so collisions cannot be forced without the secret.
+    Uses BLAKE2b from hashlib as the keyed PRF, which runs in C; a random secret is generated if none is given.
+    """
+    secret = os.urandom(16) if secret is None else secret
+
+    def keyed_hash(key: str) -> int:
+        """Keyed BLAKE2b hash of the UTF-8 encoding of key."""
+        digest = hashlib.blake2b(str(key).encode(), digest_size=8, key=secret).digest()
+        return int.from_bytes(digest, 'little')
+
+    return keyed_hash
+
+
+keyed_hash = make_keyed_hash()
+
+
+# Hash functions known by name; used by get_hash_function and to look functions up by name
+_HASH_FUNCTIONS = {}
+
+
+def register_hash_function(name: str, function) -> None:
+    """Register a hash function under the given name, replacing any function with that name."""
+    _HASH_FUNCTIONS[name] = function
+
+
+def unregister_hash_function(name: str) -> None:
+    """Remove the hash function registered under name, if there is one."""
+    _HASH_FUNCTIONS.pop(name, None)
+
+
+def get_registered_hash_function(name: str):
+    """Return the hash function registered under name."""
+    if name not in _HASH_FUNCTIONS:
+        raise KeyError(f"No hash function registered as {name!r}")
+    return _HASH_FUNCTIONS[name]
+
+
+def resolve_hash_function(function):
+    """Return function itself, or the registered hash function if given its name."""
+    return get_registered_hash_function(function) if isinstance(function, str) else function
+
+
+def hash_function_name(function) -> str:
+    """Return the name a hash function is registered under, or None if it is not registered."""
+    for name, registered in _HASH_FUNCTIONS.items():
+        if registered is function:
+            return name
+    return None
+
+
+register_hash_function("Hash function 1", hash_function_1)
+register_hash_function("Hash function 2", hash_function_2)
+register_hash_function("FNV-1a", fnv1a_hash)
+register_hash_function("BLAKE2b", blake2b_hash)
+register_hash_function("Builtin hash", builtin_hash)
+register_hash_function("Integer SplitMix64", int_hash)
+register_hash_function("Keyed BLAKE2b", keyed_hash)
+
+
+class HashMapStats:
+    """
+    Opt-in operation counters and histograms for a HashMap.
+    Maps only call into this class when constructed with stats=True.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.operations = {}
+        self.probe_lengths = {}
+        self.chain_lengths = {}
+        self.resizes = 0
+        self.resize_seconds = 0.0
+
+    def count(self, operation: str) -> None:
+        """Count one call of the named operation."""
+        self.operations[operation] = self.operations.get(operation, 0) + 1
+
+    def record_probe(self, length: int) -> None:
+        """Record the number of collisions probed past by one open addressing lookup."""
+        self.probe_lengths[length] = self.probe_lengths.get(length, 0) + 1
+
+    def record_chain(self, length: int) -> None:
+        """Record the length of the chain walked by one separate chaining lookup."""
+        self.chain_lengths[length] = self.chain_lengths.get(length, 0) + 1
+
+    def record_resize(self, seconds: float, started: bool = True) -> None:
+        """Add time spent rehashing; started is False for later steps of an incremental resize."""
+        self.resizes += started
+        self.resize_seconds += seconds
+
+    def snapshot(self) -> dict:
+        """Return a copy of the counters as plain dicts and numbers."""
+        return {
+            "operations": dict(self.operations),
+            "probe_lengths": dict(self.probe_lengths),
+            "chain_lengths": dict(self.chain_lengths),
+            "resizes": self.resizes,
+            "resize_seconds": self.resize_seconds,
+        }
+
+
+class HashMapMixin:
+    """
+    The parts of the HashMap interface that every map builds the same way: lookups by key,
+    batch operations, the mapping protocol, lazy iteration and statistics. A map provides
+      _get_key_value(key, hash_value=None)  the (key, value) pair, else (None, None)
+      _put_hashed(key, value, hash_value)   adds or updates the pair given the key's hash
+      _remove_hashed(key, hash_value)       removes the key, returning True if it was found
+      _iter_items()                         a generator of (key, value) pairs
+    along with _hash_function, _size and _capacity, and overrides whatever it does differently.
+    """
+
+    # Maps created with stats=True replace this with a HashMapStats
+    _stats = None
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def put(self, key: str, value: object) -> None:
+        """
+        The method updates the key/value pair for an existing key, or adds the key/value to the hash map
+        :param key: the key to be updated or added ot the hashmap
+        :param value: the value to be added or updated
+        :return: None
+        """
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def get(self, key: str) -> object:
+        """
+        The method returns the value associated with the given key
+        :param key: The key to be searched
+        :return: Returns the value associated with the given key, else returns None if not found
+        """
+        return self._get_key_value(key)[1]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method returns True if the key is in the hash map, else False
+        :param: the key to be found
+        :return: Returns True if the key is found, else False
+        """
+        return self._get_key_value(key)[0] is not None
+
+    def remove(self, key: str) -> None:
+        """
+        The method removes the given key and its value from the hash map.
+        :param key: The key to be removed
+        :return: None
+        """
+        self._remove_hashed(key, self._hash_function(key))
+
+    def table_load(self) -> float:
+        """
+        The method returns the current load factor of the hash table
+        :return: The load factor of the hash table
+        """
+        return self.get_size() / self.get_capacity()
+
+    def complete_resize(self) -> None:
+        """
+        The method finishes any pending incremental resize; maps that resize eagerly have none.
+        :return: None
+        """
+
+    def is_resizing(self) -> bool:
+        """
+        The method returns True while an incremental resize is pending; never for eager maps.
+        :return: False
+        """
+        return False
+
+    # ------------------------------------------------------------------ #
+
+    def put_many(self, pairs) -> None:
+        """
+        The method adds or updates every key/value pair in pairs, sizing the table once up front
+        :param pairs: An iterable of (key, value) pairs
+        :return: None
+        """
+        pairs = list(pairs)
+        self._reserve(len(pairs))
+
+        put, hash_function = self._put_hashed, self._hash_function
+        for key, value in pairs:
+            put(key, value, hash_function(key))
+
+    def get_many(self, keys) -> list:
+        """
+        The method returns the values associated with each of the given keys
+        :param keys: An iterable of keys
+        :return: A list with the value for each key, or None where a key is not found
+        """
+        get, hash_function = self._get_key_value, self._hash_function
+        return [get(key, hash_function(key))[1] for key in keys]
+
+    def contains_many(self, keys) -> list:
+        """
+        The method returns whether each of the given keys is in the hash map
+        :param keys: An iterable of keys
+        :return: A list with True for each key found, else False
+        """
+        get, hash_function = self._get_key_value, self._hash_function
+        return [get(key, hash_function(key))[0] is not None for key in keys]
+
+    def remove_many(self, keys) -> None:
+        """
+        The method removes each of the given keys
+        :param keys: An iterable of keys
+        :return: None
+        """
+        remove, hash_function = self._remove_hashed, self._hash_function
+        for key in keys:
+            remove(key, hash_function(key))
+
+    def _reserve(self, count: int) -> None:
+        """
+        Helper method to put_many that maps which resize override, to grow the table
+        once for count more keys rather than during the puts
+        :param count: The number of keys about to be added
+        :return: None
+        """
+
+    def get_keys(self) -> DynamicArray:
+        """
+        The method returns all of the keys stored in the hash map
+        :return: Returns an array with the keys of the hash map
+        """
+        return DynamicArray(list(self.keys()))
+
+    def get_hash_function(self) -> str:
+        """
+        The method returns the current hash function used by the hash map
+        """
+        return hash_function_name(self._hash_function)
+
+    def get_stats(self) -> dict:
+        """
+        The method returns a snapshot of the recorded statistics along with the current size
+        and capacity (see _stats_fields), or None if the map was not created with stats=True
+        :return: A dict of plain values, suitable for exporting
+        """
+        if self._stats is None:
+            return None
+        snapshot = self._stats.snapshot()
+        snapshot.update(self._stats_fields())
+        return snapshot
+
+    def _stats_fields(self) -> dict:
+        """
+        Helper method to get_stats that returns the map's own state to report with the statistics
+        """
+        return {"size": self._size, "capacity": self._capacity}
+
+    def reset_stats(self) -> None:
+        """
+        The method zeroes the recorded statistics, if they are enabled
+        :return: None
+        """
+        if self._stats is not None:
+            self._stats = HashMapStats()
+
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        """
+        Return size of map, for use with len()
+        """
+        return self.get_size()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Return True if the key is in the hash map, for use with the in operator
+        """
+        return self.contains_key(key)
+
+    def __getitem__(self, key: str) -> object:
+        """
+        Return the value for key using [] syntax; raises KeyError if the key is not found
+        """
+        key_val, value = self._get_key_value(key)
+        if key_val is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: object) -> None:
+        """
+        Add or update the key/value pair using [] syntax
+        """
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Remove the key using del; raises KeyError if the key is not found
+        """
+        if not self._remove_hashed(key, self._hash_function(key)):
+            raise KeyError(key)
+
+    def __iter__(self):
+        """
+        Return a lazy iterator over the keys of the hash map
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        The method lazily yields each key in the hash map
+        """
+        for key, _ in self._iter_items():
+            yield key
+
+    def values(self):
+        """
+        The method lazily yields each value in the hash map
+        """
+        for _, value in self._iter_items():
+            yield value
+
+    def items(self):
+        """
+        The method lazily yields each (key, value) pair in the hash map
+        """
+        return self._iter_items()
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel: level 0 has one slot per tick, and each level above has slots
+    spanning a whole turn of the level below. A timer waits in the coarsest level that fits
+    its delay and moves down a level each time the level below turns over, so scheduling is
+    O(1) and each timer is moved at most once per level before it fires. Level 0 slots are
+    heaps ordered by deadline, so timers fire at their deadline rather than at the end of
+    their tick, at O(log n) for a timer placed in level 0.
+    """
+
+    def __init__(self, now: float, tick: float = 1.0, bits: int = 6, levels: int = 4) -> None:
+        """
+        Initialize an empty wheel at time now
+        :param now: The current time
+        :param tick: The width of a level 0 slot, in the units of now
+        :param bits: log2 of the number of slots per level
+        :param levels: The number of levels; later timers wait in the top level until it turns
+        """
+        self._tick = tick
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._levels = levels
+        self._slots = [[[] for _ in range(1 << bits)] for _ in range(levels)]
+        self._current = int(now // tick)
+        self._count = 0
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        """Return the number of timers that have not fired."""
+        return self._count
+
+    def schedule(self, deadline: float, item: object) -> None:
+        """Add a timer that fires item once the time reaches deadline."""
+        # The sequence number orders timers with equal deadlines without comparing their items
+        self._sequence += 1
+        self._place((deadline, self._sequence, item))
+        self._count += 1
+
+    def _place(self, timer: tuple) -> None:
+        """Put a (deadline, sequence, item) timer into the coarsest level whose turn covers it."""
+        when = max(int(timer[0] // self._tick), self._current)
+        delay, level = when - self._current, 0
+        while level < self._levels - 1 and delay >> (self._bits * (level + 1)):
+            level += 1
+        slot = self._slots[level][(when >> (self._bits * level)) & self._mask]
+        if level:
+            slot.append(timer)
+        else:
+            heapq.heappush(slot, timer)
+
+    def advance(self, now: float) -> list:
+        """
+        Move the wheel forward to time now.
+        :return: A list with the item of every timer whose deadline has been reached
+        """
+        target, expired = int(now // self._tick), []
+        while self._current < target and self._count:
+            timers = self._slots[0][self._current & self._mask]
+            if timers:
+                self._slots[0][self._current & self._mask] = []
+                expired.extend(item for _, _, item in timers)
+                self._count -= len(timers)
+            self._current += 1
+            if self._current & self._mask == 0:
+                # Level 0 turned over: move the timers of the slot now starting on each level down
+                for level in range(1, self._levels):
+                    idx = (self._current >> (self._bits * level)) & self._mask
+                    timers, self._slots[level][idx] = self._slots[level][idx], []
+                    for timer in timers:
+                        self._place(timer)
+                    if idx:
+                        break
+        self._current = max(self._current, target)
+
+        # Timers due in the tick in progress are at the top of its heap
+        timers = self._slots[0][self._current & self._mask]
+        while timers and timers[0][0] <= now:
+            expired.append(heapq.heappop(timers)[2])
+            self._count -= 1
+        return expired
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -99,17 +558,101 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash_value: int = None,
+                 expires: float = None) -> None:
+        """Initialize node given a key, value and optionally the key's full hash and expiry time."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash_value = hash_value
+        self.expires = expires
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return '(' + str(self.key) + ': ' + str(self.value) + ')'
 
 
+class CacheNode(SLNode):
+    """
+    SLNode with recency links for use in a bounded cache: older points to the next less recently
+    used node and newer to the next more recently used one, in a circular list with a sentinel.
+    next is left free, so the node can also be the chain node of a chaining HashMap.
+    """
+
+    def __init__(self, key: str, value: object, hash_value: int = None, size: int = 0) -> None:
+        """Initialize an unlinked node given a key, value, the key's full hash and the entry's size."""
+        super().__init__(key, value, None, hash_value)
+        self.older = self.newer = None
+        self.size = size
+
+
+class RecencyList:
+    """
+    Circular doubly linked list of CacheNodes in use order, for a bounded cache. A sentinel
+    node joins the ends: sentinel.older is the most recently used node and sentinel.newer the
+    least recently used, so every operation is O(1).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty list."""
+        self._head = CacheNode(None, None)
+        self._head.older = self._head.newer = self._head
+
+    def push_front(self, node: CacheNode) -> None:
+        """Link node in as the most recently used."""
+        head = self._head
+        node.newer, node.older = head, head.older
+        head.older.newer = node
+        head.older = node
+
+    def unlink(self, node: CacheNode) -> None:
+        """Remove node from the list."""
+        node.newer.older = node.older
+        node.older.newer = node.newer
+
+    def move_to_front(self, node: CacheNode) -> None:
+        """Mark a linked node as the most recently used."""
+        if node is not self._head.older:
+            self.unlink(node)
+            self.push_front(node)
+
+    def oldest(self) -> CacheNode:
+        """Return the least recently used node, else None if the list is empty."""
+        node = self._head.newer
+        return None if node is self._head else node
+
+    def clear(self) -> None:
+        """Unlink every node."""
+        self._head.older = self._head.newer = self._head
+
+    def __iter__(self):
+        """Lazily yield each node, most recently used first."""
+        node = self._head.older
+        while node is not self._head:
+            yield node
+            node = node.older
+
+
+class CacheStats:
+    """
+    Hit, miss and eviction counters for a bounded cache
+    """
+
+    def __init__(self) -> None:
+        """Initialize zeroed counters."""
+        self.hits = self.misses = self.evictions = 0
+
+    def snapshot(self) -> dict:
+        """Return the counts and the hit rate as plain values."""
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+        }
+
+
 class LinkedListIterator:
     """
     Separate iterator class for LinkedList
@@ -164,20 +707,27 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash_value: int = None, expires: float = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash_value, expires)
+        self._size += 1
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node, e.g. one moved from another list, in at the front of the list."""
+        node.next = self._head
+        self._head = node
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash_value: int = None) -> bool:
         """
         Remove first node with matching key.
+        If hash_value is given, nodes with a different cached hash are skipped without comparing keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash_value is None or node.hash_value == hash_value) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -188,11 +738,14 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash_value: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If hash_value is given, nodes with a different cached hash are skipped without comparing keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash_value is None or node.hash_value == hash_value) and node.key == key:
                 return node
             node = node.next
         return node
@@ -206,10 +759,12 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    def __init__(self, key: str, value: object, hash_value: int = None, expires: float = None) -> None:
+        """Initialize an entry for use in a hash map, optionally caching the key's full hash and expiry time."""
         self.key = key
         self.value = value
+        self.hash_value = hash_value
+        self.expires = expires
         self.is_tombstone = False
 
     def __str__(self) -> str:
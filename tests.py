@@ -5,11 +5,33 @@
 #               CI workflow implemented using GitHub Actions.
 """
 
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+import benchmarks
 from hash_map_sc import HashMap as HashMapSC
-from hash_map_sc import find_mode
+from hash_map_sc import find_mode, find_top_k, FrequencyCounter
 from hash_map_oa import HashMap as HashMapOA
-from hashmap_helpers import hash_function_1, hash_function_2, DynamicArray
+from hash_map_oa import CompactHashMap
+from hash_map_np import NumpyHashMap, np
+from hash_map_rh import HashMap as HashMapRH
+from hash_map_cuckoo import HashMap as HashMapCuckoo
+from hash_map_swiss import HashMap as HashMapSwiss
+from hash_map_concurrent import HashMap as HashMapConcurrent
+from hash_map_sharded import HashMap as HashMapSharded
+from frequency_sketches import CountMinSketch, SpaceSaving, find_mode_approximate
+from hash_map_snapshot import MappedHashMap, load_snapshot, save_snapshot
+from hash_map_persistent import HashMap as HashMapPersistent
+from hash_map_cache import HashMap as HashMapCache
+from hash_map_memoize import memoize
+from hash_map_async import HashMap as HashMapAsync
+from hashmap_helpers import hash_function_1, hash_function_2, DynamicArray, TimerWheel
+from hashmap_helpers import (fnv1a_hash, int_hash, make_keyed_hash, register_hash_function,
+                             unregister_hash_function, get_registered_hash_function, hash_function_name)
 
 
 # ---- Test cases for Hashmap Implementation -------- #
@@ -169,6 +191,19 @@ class TestCaseSC4(unittest.TestCase):
         expected = "1, 30, 10, True"
         self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
 
+    def test_sc_resize_cached_hash_1(self):
+        """Single Chaining - Resize reuses cached hashes instead of rehashing keys"""
+        calls = []
+        m = HashMapSC(20, lambda key: calls.append(key) or hash_function_1(key))
+        for i in range(50):
+            m.put('key' + str(i), i)
+        calls.clear()
+        m.resize_table(97)
+
+        actual = f"{len(calls)}, {m.get('key7')}, {m.contains_key('key50')}"
+        expected = "0, 7, False"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
 
 class TestCaseSC5(unittest.TestCase):
     """Single Chaining - initial capacity 75 - hash function 2"""
@@ -282,6 +317,340 @@ class TestCaseSC8(unittest.TestCase):
             self.assertEqual(expected[i], actual, msg=f"Expected {expected[i]}, got {actual}")
 
 
+class TestCaseSC9(unittest.TestCase):
+    """Single Chaining - initial capacity 4 - automatic resizing"""
+
+    def setUp(self):
+        self.hash_map = HashMapSC(4, hash_function_1, max_load=1.0, min_load=0.25)
+
+    def test_sc_auto_grow_1(self):
+        """Single Chaining - Table grows once max load is exceeded"""
+        m = self.hash_map
+        for i in range(150):
+            m.put('key' + str(i), i * 100)
+
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.table_load() <= 1.0}"
+        expected = "150, 256, True"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        result = True
+        for i in range(150):
+            result &= m.get('key' + str(i)) == i * 100
+        self.assertTrue(result, msg="Expected True, got False")
+
+    def test_sc_auto_shrink_1(self):
+        """Single Chaining - Table shrinks after bulk removal, but not below initial capacity"""
+        m = self.hash_map
+        for i in range(150):
+            m.put('key' + str(i), i * 100)
+        for i in range(140):
+            m.remove('key' + str(i))
+
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.contains_key('key145')}"
+        expected = "10, 32, True"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        for i in range(140, 150):
+            m.remove('key' + str(i))
+        actual = f"{m.get_size()}, {m.get_capacity()}"
+        expected = "0, 4"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sc_auto_invalid_1(self):
+        """Single Chaining - Thrashing load factor policy is rejected"""
+        with self.assertRaises(ValueError):
+            HashMapSC(4, hash_function_1, max_load=1.0, min_load=0.5)
+
+
+class TestCaseSC10(unittest.TestCase):
+    """Single Chaining - initial capacity 8 - incremental resizing"""
+
+    def setUp(self):
+        self.hash_map = HashMapSC(8, hash_function_2, max_load=1.0, incremental=True, rehash_step=1)
+
+    def test_sc_incremental_1(self):
+        """Single Chaining - Keys stay reachable while a resize is pending"""
+        m = self.hash_map
+        for i in range(9):
+            m.put('key' + str(i), i)
+        self.assertTrue(m.is_resizing(), msg="Expected True, got False")
+
+        m.put('key0', 'updated')
+        m.remove('key1')
+        result = m.get('key0') == 'updated' and not m.contains_key('key1')
+        for i in range(2, 9):
+            result &= m.get('key' + str(i)) == i
+        self.assertTrue(result, msg="Expected True, got False")
+
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.get_keys().length()}"
+        expected = "8, 16, 8"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        m.complete_resize()
+        self.assertFalse(m.is_resizing(), msg="Expected False, got True")
+        actual = m.get_keys()
+        actual = sorted(actual[i] for i in range(actual.length()))
+        expected = sorted('key' + str(i) for i in range(9) if i != 1)
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sc_incremental_2(self):
+        """Single Chaining - Repeated growth with incremental resizing"""
+        m = self.hash_map
+        for i in range(500):
+            m.put(str(i), i)
+        for i in range(0, 500, 2):
+            m.remove(str(i))
+
+        result = m.get_size() == 250
+        for i in range(500):
+            result &= m.contains_key(str(i)) == (i % 2 == 1)
+        self.assertTrue(result, msg="Expected True, got False")
+
+    def test_sc_incremental_3(self):
+        """Single Chaining - A resize step allocates only the buckets it migrates into"""
+        m = self.hash_map
+        for i in range(8):
+            m.put('key' + str(i), i)
+        first_chain = m._buckets[0].length() if m._buckets[0] is not None else 0
+
+        def allocated():
+            return sum(m._buckets[idx] is not None for idx in range(m.get_capacity()))
+
+        m.resize_table(1 << 16)
+        actual = f"{m.get_capacity()}, {allocated()}"
+        expected = "65536, 0"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        # rehash_step=1: a get migrates old bucket 0 and allocates at most one bucket per key in it
+        m.get('key0')
+        self.assertLessEqual(allocated(), first_chain)
+        m.complete_resize()
+        actual = f"{allocated()}, {m.get_size()}, {m.empty_buckets()}"
+        expected = f"8, 8, {(1 << 16) - 8}"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+class TestCaseSC11(unittest.TestCase):
+    """Single Chaining - initial capacity 4 - batch operations"""
+
+    def setUp(self):
+        self.hash_map = HashMapSC(4, hash_function_2, max_load=1.0, min_load=0.25)
+
+    def test_sc_batch_1(self):
+        """Single Chaining - put_many / get_many / contains_many / remove_many"""
+        m = self.hash_map
+        m.put_many(('key' + str(i), i) for i in range(150))
+
+        actual = f"{m.get_size()}, {m.get_capacity()}"
+        expected = "150, 256"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        actual = m.get_many(['key0', 'key149', 'missing'])
+        expected = [0, 149, None]
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        m.remove_many('key' + str(i) for i in range(140))
+        actual = m.contains_many(['key0', 'key145', 'missing'])
+        expected = [False, True, False]
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        actual = f"{m.get_size()}, {m.get_capacity()}"
+        expected = "10, 32"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+class TestCaseSC12(unittest.TestCase):
+    """Single Chaining - initial capacity 10 - mapping protocol and iteration"""
+
+    def setUp(self):
+        self.hash_map = HashMapSC(10, hash_function_2, max_load=1.0, incremental=True)
+
+    def test_sc_mapping_1(self):
+        """Single Chaining - len / in / [] / del"""
+        m = self.hash_map
+        for i in range(25):
+            m['key' + str(i)] = i
+        m[''] = 'empty'
+
+        actual = f"{len(m)}, {'key3' in m}, {'key30' in m}, {m['key7']}, {m['']}"
+        expected = "26, True, False, 7, empty"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        del m['key7']
+        self.assertNotIn('key7', m)
+        with self.assertRaises(KeyError):
+            m['key7']
+        with self.assertRaises(KeyError):
+            del m['key7']
+
+    def test_sc_iteration_1(self):
+        """Single Chaining - keys / values / items walk the table lazily"""
+        m = self.hash_map
+        for i in range(25):
+            m.put('key' + str(i), i)
+
+        expected = {'key' + str(i): i for i in range(25)}
+        self.assertEqual(expected, dict(m.items()))
+        self.assertEqual(sorted(expected), sorted(m))
+        self.assertEqual(sorted(expected.values()), sorted(m.values()))
+
+        with self.assertRaises(RuntimeError):
+            for key in m.keys():
+                m.remove(key)
+
+        # Updating values of existing keys is not a change of size
+        for key in m:
+            m[key] = 0
+        self.assertEqual({0}, set(m.values()))
+
+
+class TestCaseSC13(unittest.TestCase):
+    """Single Chaining - initial capacity 5 - operation stats"""
+
+    def test_sc_stats_1(self):
+        """Single Chaining - counters, chain lengths and resizes"""
+        m = HashMapSC(5, hash_function_1, max_load=1.0, stats=True)
+        for i in range(20):
+            m.put('key' + str(i), i)
+        for i in range(10):
+            m.get('key' + str(i))
+        m.contains_key('missing')
+        m.remove('key0')
+
+        stats = m.get_stats()
+        actual = f"{stats['operations']}, {stats['resizes']}, {stats['size']}, {stats['capacity']}"
+        expected = "{'put': 20, 'get': 11, 'remove': 1}, 2, 19, 20"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        self.assertEqual(11, sum(stats['chain_lengths'].values()))
+        self.assertGreater(stats['resize_seconds'], 0)
+
+        m.clear()
+        self.assertEqual(20, m.get_stats()['operations']['put'])
+        m.reset_stats()
+        self.assertEqual({}, m.get_stats()['operations'])
+        self.assertIsNone(HashMapSC(5, hash_function_1).get_stats())
+
+
+class TestCaseSC14(unittest.TestCase):
+    """Single Chaining - streaming frequency counts"""
+
+    def test_sc_mode_stream_1(self):
+        """Single Chaining - find_mode accepts short inputs and generators"""
+        test_cases = ([], ["apple"], ["apple", "grape"], (word for word in "b a b a c".split()))
+        expected = (
+            "Mode: [], Frequency: 0",
+            "Mode: ['apple'], Frequency: 1",
+            "Mode: ['apple', 'grape'], Frequency: 1",
+            "Mode: ['b', 'a'], Frequency: 2"
+        )
+
+        for i, case in enumerate(test_cases):
+            mode, frequency = find_mode(case)
+            actual = f"Mode: {mode}, Frequency: {frequency}"
+            self.assertEqual(expected[i], actual, msg=f"Expected {expected[i]}, got {actual}")
+
+    def test_sc_top_k_1(self):
+        """Single Chaining - top-k most frequent values"""
+        tokens = (token for token in "a b c a c d a b c a b a c".split())
+        actual = find_top_k(tokens, 3)
+        actual = [actual[i] for i in range(actual.length())]
+        expected = [('a', 5), ('c', 4), ('b', 3)]
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sc_counter_1(self):
+        """Single Chaining - FrequencyCounter grows as values stream in"""
+        counter = FrequencyCounter(capacity=1)
+        counter.update(range(1000))
+        counter.update(DynamicArray([5, 5, 7]))
+        actual = f"{counter.add(5)}, {counter.count(7)}, {counter.count(-1)}, {len(counter)}, {counter.get_total()}"
+        expected = "4, 2, 0, 1000, 1004"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        mode, frequency = counter.mode()
+        self.assertEqual("[5], 4", f"{mode}, {frequency}")
+        top = counter.top_k(2)
+        self.assertEqual([(5, 4), (7, 2)], [top[i] for i in range(top.length())])
+
+
+class TestCaseSC15(unittest.TestCase):
+    """Single Chaining - initial capacity 11 - keys with a ttl"""
+
+    def setUp(self):
+        self.now = [0.0]
+        self.hash_map = HashMapSC(11, hash_function_1, clock=lambda: self.now[0])
+
+    def test_sc_ttl_1(self):
+        """Single Chaining - expired keys are hidden at once and removed by their timer"""
+        m = self.hash_map
+        for i in range(20):
+            m.put('key' + str(i), i, ttl=5 if i % 2 else None)
+        m.put('key1', 'kept')
+        m.put('key3', 'renewed', ttl=10)
+
+        self.now[0] = 5.0
+        actual = f"{m.get('key5')}, {m.contains_key('key5')}, {m.get('key1')}, {m.get('key3')}"
+        expected = "None, False, kept, renewed"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        self.now[0] = 7.0
+        actual = f"{m.get_size()}, {len(list(m.items()))}, {m.get_keys().length()}"
+        expected = "12, 12, 12"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        self.now[0] = 12.0
+        actual = f"{len(m)}, {m.get('key3')}"
+        expected = "11, None"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sc_ttl_2(self):
+        """Single Chaining - size and load agree with iteration as soon as a key expires"""
+        m = self.hash_map
+        m.put('a', 1, ttl=0.2)
+        m.put('b', 2)
+        self.now[0] = 0.5
+        actual = f"{len(m)}, {list(m.keys())}, {m.table_load()}, {m.get_keys().length()}"
+        expected = f"1, ['b'], {1 / 11}, 1"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sc_ttl_3(self):
+        """Single Chaining - del raises KeyError for a key that has expired"""
+        m = self.hash_map
+        m.put('a', 1, ttl=1)
+        m.put('b', 2, ttl=3)
+        self.now[0] = 1.0
+        with self.assertRaises(KeyError):
+            del m['a']
+        del m['b']
+        actual = f"{len(m)}, {'a' in m}, {'b' in m}"
+        expected = "0, False, False"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sc_timer_wheel_1(self):
+        """Single Chaining - timers never fire early, and fire once their tick has passed"""
+        wheel = TimerWheel(0.0, tick=1.0, bits=2, levels=3)
+        deadlines = (0.5, 3.0, 4.0, 17.5, 70.0, 500.0)
+        for deadline in deadlines:
+            wheel.schedule(deadline, deadline)
+        fired = []
+        for now in range(0, 600, 3):
+            for deadline in wheel.advance(now):
+                self.assertLessEqual(deadline, now)
+                self.assertGreater(deadline + 4, now)
+                fired.append(deadline)
+        actual = f"{sorted(fired)}, {len(wheel)}"
+        expected = f"{list(deadlines)}, 0"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sc_timer_wheel_2(self):
+        """Single Chaining - timers fire at their deadline, within a tick"""
+        wheel = TimerWheel(0.0, tick=1.0, bits=2, levels=3)
+        for deadline in (0.25, 0.75, 0.5, 5.5, 5.5):
+            wheel.schedule(deadline, deadline)
+        actual = [wheel.advance(now) for now in (0.1, 0.5, 1.0, 5.4, 5.5)]
+        expected = [[], [0.25, 0.5], [0.75], [], [5.5, 5.5]]
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
 # ------------- Open Addressing --------------------- #
 class TestCaseOA1(unittest.TestCase):
     """Open Addressing - initial capacity 50 - hash function 1"""
@@ -437,6 +806,19 @@ class TestCaseOA4(unittest.TestCase):
         expected = "1, 30, 10, True"
         self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
 
+    def test_oa_resize_cached_hash_1(self):
+        """Open Addressing - Resize reuses cached hashes instead of rehashing keys"""
+        calls = []
+        m = HashMapOA(20, lambda key: calls.append(key) or hash_function_1(key))
+        for i in range(50):
+            m.put('key' + str(i), i)
+        calls.clear()
+        m.resize_table(397)
+
+        actual = f"{len(calls)}, {m.get('key7')}, {m.contains_key('key50')}"
+        expected = "0, 7, False"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
 
 class TestCaseOA5(unittest.TestCase):
     """Open Addressing - initial capacity 75 - hash function 2"""
@@ -528,5 +910,1386 @@ class TestCaseOA7(unittest.TestCase):
         self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
 
 
+class TestCaseOA8(unittest.TestCase):
+    """Open Addressing - initial capacity 7 - incremental resizing"""
+
+    def setUp(self):
+        self.hash_map = HashMapOA(7, hash_function_2, incremental=True, rehash_step=1)
+
+    def test_oa_incremental_1(self):
+        """Open Addressing - Keys stay reachable while a resize is pending"""
+        m = self.hash_map
+        for i in range(5):
+            m.put('key' + str(i), i)
+        self.assertTrue(m.is_resizing(), msg="Expected True, got False")
+
+        m.put('key0', 'updated')
+        m.remove('key1')
+        result = m.get('key0') == 'updated' and not m.contains_key('key1')
+        for i in range(2, 5):
+            result &= m.get('key' + str(i)) == i
+        self.assertTrue(result, msg="Expected True, got False")
+
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.get_keys().length()}"
+        expected = "4, 14, 4"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        m.complete_resize()
+        self.assertFalse(m.is_resizing(), msg="Expected False, got True")
+        actual = m.get_keys()
+        actual = sorted(actual[i] for i in range(actual.length()))
+        expected = ['key0', 'key2', 'key3', 'key4']
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_oa_incremental_2(self):
+        """Open Addressing - Repeated growth with incremental resizing"""
+        m = self.hash_map
+        for i in range(500):
+            m.put(str(i), i)
+        for i in range(0, 500, 2):
+            m.remove(str(i))
+
+        result = m.get_size() == 250
+        for i in range(500):
+            result &= m.contains_key(str(i)) == (i % 2 == 1)
+        self.assertTrue(result, msg="Expected True, got False")
+
+    def test_oa_incremental_3(self):
+        """Open Addressing - Updating a key at the 0.5 threshold does not duplicate it"""
+        m = HashMapOA(4, hash_function_1, incremental=True)
+        m.put('a', 1)
+        m.put('b', 2)
+        m.put('a', 100)
+        actual = f"{m.get_size()}, {m.get('a')}, {m.get('b')}"
+        expected = "2, 100, 2"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        m.complete_resize()
+        actual = m.get_keys()
+        actual = f"{m.get_size()}, {sorted(actual[i] for i in range(actual.length()))}, {m._tombstones}"
+        expected = "2, ['a', 'b'], 0"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+class TestCaseOA9(unittest.TestCase):
+    """Open Addressing - initial capacity 50 - compact storage backend"""
+
+    def setUp(self):
+        self.hash_map = HashMapOA(50, hash_function_1, compact=True)
+
+    def test_oa_compact_1(self):
+        """Open Addressing - Compact backend matches the entry backend"""
+        m, reference = self.hash_map, HashMapOA(50, hash_function_1)
+        self.assertIsInstance(m, CompactHashMap)
+        for i in range(150):
+            m.put('key' + str(i), i * 100)
+            reference.put('key' + str(i), i * 100)
+
+        actual = f"{m.empty_buckets()}, {m.table_load()}, {m.get_size()}, {m.get_capacity()}"
+        expected = "250, 0.375, 150, 400"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        for i in range(0, 150, 3):
+            m.remove('key' + str(i))
+            reference.remove('key' + str(i))
+        for i in range(0, 150, 6):
+            m.put('key' + str(i), 'back')
+            reference.put('key' + str(i), 'back')
+
+        result = m.get_size() == reference.get_size()
+        for i in range(160):
+            result &= m.get('key' + str(i)) == reference.get('key' + str(i))
+            result &= m.contains_key('key' + str(i)) == reference.contains_key('key' + str(i))
+        self.assertTrue(result, msg="Expected True, got False")
+
+        actual, expected = m.get_keys(), reference.get_keys()
+        actual = sorted(actual[i] for i in range(actual.length()))
+        expected = sorted(expected[i] for i in range(expected.length()))
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_oa_compact_clear_1(self):
+        """Open Addressing - Compact backend clear and resize"""
+        m = self.hash_map
+        m.put('key1', 10)
+        m.put('key2', 20)
+        m.resize_table(100)
+        m.clear()
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.get('key1')}"
+        expected = "0, 100, None"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+class TestCaseOA10(unittest.TestCase):
+    """Open Addressing - initial capacity 11 - tombstone handling"""
+
+    def test_oa_tombstone_duplicate_1(self):
+        """Open Addressing - Put does not duplicate a key that follows a tombstone"""
+        for compact in (False, True):
+            m = HashMapOA(11, hash_function_1, compact=compact)
+            m.put('ab', 1)
+            m.put('ba', 1)
+            m.remove('ab')
+            m.put('ba', 2)
+
+            actual = f"{m.get_size()}, {m.get_keys()}, {m.get('ba')}"
+            expected = "1, ['ba'], 2"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+            m.remove('ba')
+            self.assertFalse(m.contains_key('ba'), msg="Expected False, got True")
+
+    def test_oa_tombstone_compaction_1(self):
+        """Open Addressing - Put/remove churn compacts tombstones instead of growing the table"""
+        for compact in (False, True):
+            m = HashMapOA(11, hash_function_2, compact=compact)
+            for i in range(5):
+                m.put('live' + str(i), i)
+            for i in range(2000):
+                m.put(str(i), i)
+                m.remove(str(i))
+
+            result = m.get_capacity() == 22 and m.empty_buckets() >= m.get_capacity() * .5
+            for i in range(5):
+                result &= m.get('live' + str(i)) == i
+            self.assertTrue(result, msg="Expected True, got False")
+
+    def test_oa_tombstone_empty_buckets_1(self):
+        """Open Addressing - Tombstones are not reported as empty buckets"""
+        m = HashMapOA(11, hash_function_2, tombstone_ratio=None)
+        m.put('key1', 10)
+        m.put('key2', 20)
+        m.remove('key1')
+
+        actual = f"{m.empty_buckets()}, {m.get_size()}"
+        expected = "9, 1"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+class TestCaseOA11(unittest.TestCase):
+    """Open Addressing - initial capacity 50 - batch operations"""
+
+    def test_oa_batch_1(self):
+        """Open Addressing - put_many / get_many / contains_many / remove_many"""
+        for compact in (False, True):
+            m = HashMapOA(50, hash_function_1, compact=compact)
+            m.put_many(('key' + str(i), i * 100) for i in range(150))
+
+            actual = f"{m.get_size()}, {m.get_capacity()}"
+            expected = "150, 400"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+            actual = m.get_many(['key0', 'key149', 'missing'])
+            expected = [0, 14900, None]
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+            m.remove_many('key' + str(i) for i in range(0, 150, 2))
+            actual = m.contains_many(['key0', 'key1', 'missing'])
+            expected = [False, True, False]
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+            actual = f"{m.get_size()}, {m.get_capacity()}, {m.empty_buckets()}"
+            expected = "75, 400, 250"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+class TestCaseOA12(unittest.TestCase):
+    """Open Addressing - initial capacity 11 - vectorized NumPy lookups"""
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_oa_numpy_int_1(self):
+        """Open Addressing - Array lookups of integer keys match scalar lookups"""
+        m = NumpyHashMap(11, int_hash)
+        ids = np.arange(0, 2000, 2)
+        m.put_array(ids, ids * 10)
+        m.put(-7, 'negative')
+        m.remove(10)
+
+        keys = np.append(np.arange(-10, 2010), [2 ** 40])
+        values, found = m.get_array(keys)
+        expected = [m.get(key) for key in keys.tolist()]
+        self.assertEqual(expected, values.tolist())
+        self.assertEqual([value is not None for value in expected], found.tolist())
+        self.assertEqual(found.tolist(), m.contains_array(keys).tolist())
+        self.assertEqual(1000, m.get_size())
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_oa_numpy_str_1(self):
+        """Open Addressing - Array lookups of string keys with vectorized FNV-1a hashing"""
+        m = NumpyHashMap(11, fnv1a_hash)
+        m.put_array(np.array(['key' + str(i) for i in range(300)]), range(300))
+
+        values, found = m.get_array(np.array(['key0', 'key299', 'missing', 'key']), default=-1)
+        self.assertEqual([0, 299, -1, -1], values.tolist())
+        self.assertEqual([True, True, False, False], found.tolist())
+        self.assertEqual(42, m.get('key42'))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_oa_numpy_fallback_hash_1(self):
+        """Open Addressing - Array lookups with a hash function that has no vectorized form"""
+        m = NumpyHashMap(11, hash_function_2)
+        for i in range(100):
+            m.put(str(i), i)
+        values, found = m.get_array(np.array([str(i) for i in range(95, 105)]))
+        self.assertEqual([95, 96, 97, 98, 99] + [None] * 5, values.tolist())
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_oa_numpy_collisions_1(self):
+        """Open Addressing - Array lookups follow the linear fallback past the quadratic slots"""
+        # j^2 % 16 only reaches 4 slots, so keys sharing an initial index spill onto the fallback
+        m = NumpyHashMap(16, lambda key: key * 16)
+        for i in range(7):
+            m.put(i, i * 10)
+
+        keys = np.arange(8)
+        values, found = m.get_array(keys)
+        expected = [m.get(key) for key in keys.tolist()]
+        self.assertEqual(expected, values.tolist())
+        self.assertEqual([True] * 7 + [False], found.tolist())
+        self.assertEqual(found.tolist(), m.contains_array(keys).tolist())
+
+    def test_oa_numpy_clear_1(self):
+        """Open Addressing - clear keeps the settings and needs no NumPy"""
+        m = NumpyHashMap(8, int_hash, stats=True)
+        for i in range(20):
+            m.put(i, i * 10)
+        m.clear()
+        m.put(3, 'three')
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.get(3)}, {m.get(4)}, {m.get_probe()}"
+        expected = "1, 64, three, None, quadratic"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        with self.assertRaises(ValueError):
+            NumpyHashMap(8, probe="double")
+
+
+class TestCaseOA13(unittest.TestCase):
+    """Open Addressing - initial capacity 11 - mapping protocol and iteration"""
+
+    def test_oa_mapping_1(self):
+        """Open Addressing - len / in / [] / del"""
+        for compact in (False, True):
+            m = HashMapOA(11, hash_function_2, compact=compact)
+            for i in range(25):
+                m['key' + str(i)] = i
+            m[''] = 'empty'
+
+            actual = f"{len(m)}, {'key3' in m}, {'key30' in m}, {m['key7']}, {m['']}"
+            expected = "26, True, False, 7, empty"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+            del m['key7']
+            self.assertNotIn('key7', m)
+            with self.assertRaises(KeyError):
+                m['key7']
+            with self.assertRaises(KeyError):
+                del m['key7']
+
+    def test_oa_iteration_1(self):
+        """Open Addressing - keys / values / items walk the table lazily"""
+        for compact in (False, True):
+            m = HashMapOA(11, hash_function_2, incremental=not compact, compact=compact)
+            for i in range(25):
+                m.put('key' + str(i), i)
+
+            expected = {'key' + str(i): i for i in range(25)}
+            self.assertEqual(expected, dict(m.items()))
+            self.assertEqual(sorted(expected), sorted(m))
+            self.assertEqual(sorted(expected.values()), sorted(m.values()))
+
+            with self.assertRaises(RuntimeError):
+                for key in m.keys():
+                    m.put(key + 'x', 0)
+
+            m.clear()
+            self.assertEqual([], list(m.items()))
+
+
+class TestCaseOA14(unittest.TestCase):
+    """Open Addressing - initial capacity 11 - operation stats"""
+
+    def test_oa_stats_1(self):
+        """Open Addressing - counters, probe lengths, resizes and tombstones"""
+        for compact in (False, True):
+            m = HashMapOA(11, hash_function_1, compact=compact, stats=True)
+            for i in range(20):
+                m.put('key' + str(i), i)
+            for i in range(10):
+                m.get('key' + str(i))
+            m.contains_key('missing')
+            m.remove('key0')
+
+            stats = m.get_stats()
+            actual = f"{stats['operations']}, {stats['resizes']}, {stats['size']}, {stats['tombstones']}"
+            expected = "{'put': 20, 'get': 11, 'remove': 1}, 2, 19, 1"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+            self.assertGreaterEqual(sum(stats['probe_lengths'].values()), 11)
+            self.assertGreater(max(stats['probe_lengths']), 0)
+
+            m.reset_stats()
+            self.assertEqual({}, m.get_stats()['operations'])
+            self.assertIsNone(HashMapOA(11, hash_function_1, compact=compact).get_stats())
+
+    def test_oa_stats_2(self):
+        """Open Addressing - rehashing during a resize adds no probe lengths"""
+        for kwargs in ({}, {'compact': True}, {'incremental': True}):
+            m = HashMapOA(11, hash_function_1, stats=True, **kwargs)
+            for i in range(200):
+                m.put('key' + str(i), i)
+            for i in range(50):
+                m.get('key' + str(i))
+            m.remove('key0')
+
+            # One probe length per put, get and remove; an incremental get that finds its key
+            # in the old table records none
+            stats = m.get_stats()
+            actual = sum(stats['probe_lengths'].values())
+            self.assertGreater(stats['resizes'], 0)
+            if kwargs.get('incremental'):
+                self.assertLessEqual(actual, 251, msg=f"Expected at most 251, got {actual}")
+            else:
+                self.assertEqual(251, actual, msg=f"Expected 251, got {actual}")
+
+
+class TestCaseOA15(unittest.TestCase):
+    """Open Addressing - initial capacity 11 - keys with a ttl"""
+
+    def test_oa_ttl_1(self):
+        """Open Addressing - expired keys are hidden at once, then tombstoned and compacted"""
+        now = [0.0]
+        m = HashMapOA(11, hash_function_1, clock=lambda: now[0])
+        for i in range(20):
+            m.put('key' + str(i), i, ttl=5 if i % 2 else None)
+        m.put('key1', 'kept')
+
+        now[0] = 5.0
+        actual = f"{m.get('key5')}, {'key5' in m}, {m.get('key1')}, {m.get_keys().length()}"
+        expected = "None, False, kept, 11"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        now[0] = 7.0
+        actual = f"{m.get_size()}, {len(dict(m.items()))}, {m.get('key2')}"
+        expected = "11, 11, 2"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        self.assertLessEqual(m._tombstones, m.get_capacity() * .25)
+
+        # A key removed or put again before its timer fires is left alone by the timer
+        m.put('key2', 'short', ttl=1)
+        m.put('key2', 'long', ttl=10)
+        now[0] = 9.0
+        actual = f"{m.get('key2')}, {m.get_size()}"
+        expected = "long, 11"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        m.clear()
+        m.put('key0', 0, ttl=1)
+        now[0] = 11.0
+        self.assertEqual(0, len(m))
+        with self.assertRaises(TypeError):
+            HashMapOA(11, hash_function_1, compact=True).put('key0', 0, ttl=1)
+        with self.assertRaises(ValueError):
+            HashMapOA(11, hash_function_1, compact=True, incremental=True)
+
+    def test_oa_ttl_2(self):
+        """Open Addressing - size and load agree with iteration as soon as a key expires"""
+        now = [0.0]
+        m = HashMapOA(11, hash_function_1, clock=lambda: now[0])
+        m.put('a', 1, ttl=0.2)
+        m.put('b', 2)
+        now[0] = 0.5
+        actual = f"{len(m)}, {list(m.keys())}, {m.table_load()}, {m.empty_buckets()}"
+        expected = f"1, ['b'], {1 / 11}, 9"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_oa_ttl_3(self):
+        """Open Addressing - del raises KeyError for a key that has expired"""
+        now = [0.0]
+        m = HashMapOA(11, hash_function_1, clock=lambda: now[0])
+        m.put('a', 1, ttl=1)
+        m.put('b', 2, ttl=3)
+        now[0] = 1.0
+        with self.assertRaises(KeyError):
+            del m['a']
+        del m['b']
+        actual = f"{len(m)}, {'a' in m}, {'b' in m}"
+        expected = "0, False, False"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+class TestCaseOA16(unittest.TestCase):
+    """Open Addressing - probe strategies"""
+
+    def test_oa_probe_1(self):
+        """Open Addressing - every strategy and backend finds, updates and removes keys"""
+        for probe in ("linear", "quadratic", "triangular", "double"):
+            for compact in (False, True):
+                m = HashMapOA(11, hash_function_1, compact=compact, probe=probe)
+                for i in range(200):
+                    m.put('key' + str(i), i)
+                m.remove_many('key' + str(i) for i in range(0, 200, 2))
+                for i in range(1, 200, 2):
+                    m.put('key' + str(i), -i)
+
+                actual = f"{m.get_size()}, {m.get('key7')}, {m.get('key8')}, {m.get_probe()}"
+                expected = f"100, -7, None, {probe}"
+                self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+                self.assertEqual(sorted('key' + str(i) for i in range(1, 200, 2)), sorted(m.keys()))
+
+    def test_oa_probe_2(self):
+        """Open Addressing - power of two capacities and termination of quadratic probing"""
+        actual = [HashMapOA(11, hash_function_1, probe=probe).get_capacity()
+                  for probe in ("linear", "quadratic", "triangular", "double")]
+        m = HashMapOA(11, hash_function_1, probe="triangular")
+        m.resize_table(40)
+        actual.append(m.get_capacity())
+        expected = [11, 11, 16, 16, 64]
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        with self.assertRaises(ValueError):
+            HashMapOA(11, hash_function_1, probe="cubic")
+
+        # The squares modulo 16 are 0, 1, 4 and 9, so keys that share slot 0 fill every slot
+        # quadratic probing can reach from it; the probe then continues linearly
+        for compact in (False, True):
+            m = HashMapOA(16, lambda key: key, compact=compact)
+            for key in (0, 16, 32, 48, 64):
+                m.put(key, key)
+            actual = f"{m.get_capacity()}, {m.get(64)}, {m.get(80)}, {m.contains_key(96)}"
+            expected = "16, 64, None, False"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+# ------------- Robin Hood ------------------------- #
+class TestCaseRH1(unittest.TestCase):
+    """Robin Hood - initial capacity 50 - hash function 1"""
+
+    def setUp(self):
+        self.hash_map = HashMapRH(50, hash_function_1)
+
+    def test_rh_put_1(self):
+        """Robin Hood - Put grows the table only above max_load"""
+        m = self.hash_map
+        for i in range(150):
+            m.put('key' + str(i), i * 100)
+
+        actual = f"{m.empty_buckets()}, {m.table_load()}, {m.get_size()}, {m.get_capacity()}"
+        expected = "50, 0.75, 150, 200"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        for i in range(150):
+            self.assertEqual(i * 100, m.get('key' + str(i)))
+        self.assertIsNone(m.get('key150'))
+
+    def test_rh_remove_1(self):
+        """Robin Hood - Backward-shift deletion keeps every other key reachable"""
+        m = self.hash_map
+        for i in range(40):
+            m.put('key' + str(i), i)
+        for i in range(0, 40, 3):
+            m.remove('key' + str(i))
+        m.remove('key0')
+
+        actual = f"{m.empty_buckets()}, {m.get_size()}, {m.get_capacity()}"
+        expected = "24, 26, 50"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        for i in range(40):
+            self.assertEqual(i % 3 != 0, m.contains_key('key' + str(i)), msg='key' + str(i))
+
+        # No tombstones are left behind: every entry sits within its probe run
+        buckets = m.get_buckets()
+        self.assertEqual(26, sum(buckets[idx] is not None for idx in range(m.get_capacity())))
+
+    def test_rh_high_load_1(self):
+        """Robin Hood - Probe lengths stay short at a load factor of 0.9"""
+        m = HashMapRH(1000, fnv1a_hash, max_load=.9, stats=True)
+        m.put_many(('key' + str(i), i) for i in range(900))
+        self.assertEqual(.9, m.table_load())
+
+        m.reset_stats()
+        self.assertEqual(list(range(900)), m.get_many('key' + str(i) for i in range(900)))
+        probes = m.get_stats()['probe_lengths']
+        mean = sum(length * count for length, count in probes.items()) / 900
+        self.assertLess(mean, 5)
+
+    def test_rh_mapping_1(self):
+        """Robin Hood - Mapping protocol, iteration and clear"""
+        m = self.hash_map
+        for i in range(25):
+            m['key' + str(i)] = i
+        del m['key7']
+        with self.assertRaises(KeyError):
+            del m['key7']
+
+        expected = {'key' + str(i): i for i in range(25) if i != 7}
+        self.assertEqual(expected, dict(m.items()))
+        self.assertEqual(24, len(m))
+        with self.assertRaises(RuntimeError):
+            for key in m:
+                m.remove(key)
+
+        m.clear()
+        actual = f"{m.get_size()}, {m.get_capacity()}, {list(m.keys())}"
+        expected = "0, 50, []"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_rh_max_load_1(self):
+        """Robin Hood - max_load must leave room for an empty slot"""
+        with self.assertRaises(ValueError):
+            HashMapRH(10, hash_function_1, max_load=1.0)
+
+
+# ------------- Cuckoo ----------------------------- #
+class TestCaseCuckoo1(unittest.TestCase):
+    """Cuckoo - initial capacity 20 - hash function 1 and keyed second hash"""
+
+    def setUp(self):
+        self.hash_map = HashMapCuckoo(20, fnv1a_hash, stats=True)
+
+    def test_cuckoo_put_1(self):
+        """Cuckoo - Put / get / remove and the slot count rounds up to whole buckets"""
+        m = HashMapCuckoo(10, hash_function_1, bucket_size=4)
+        self.assertEqual(12, m.get_capacity())
+        for i in range(300):
+            m.put('key' + str(i), i * 100)
+        m.put('key1', 'updated')
+
+        actual = f"{m.get_size()}, {m.get('key1')}, {m.get('key299')}, {m.get('key300')}"
+        expected = "300, updated, 29900, None"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        self.assertLessEqual(m.table_load(), .9)
+
+        for i in range(0, 300, 2):
+            m.remove('key' + str(i))
+        for i in range(300):
+            self.assertEqual(i % 2 == 1, m.contains_key('key' + str(i)), msg='key' + str(i))
+        self.assertEqual(m.get_capacity() - 150 + len(m.get_stash()), m.empty_buckets())
+
+    def test_cuckoo_bounded_lookup_1(self):
+        """Cuckoo - Every key sits in one of its two buckets or the stash"""
+        m = self.hash_map
+        m.put_many(('key' + str(i), i) for i in range(500))
+        m.reset_stats()
+        m.get_many('key' + str(i) for i in range(1000))
+
+        # A lookup inspects the first bucket, the second bucket, then the stash
+        self.assertLessEqual(max(m.get_stats()['probe_lengths']), 2)
+        self.assertLessEqual(len(m.get_stash()), 4)
+        buckets, bucket_count = m.get_buckets(), m.get_capacity() // 4
+        for idx in range(m.get_capacity()):
+            if buckets[idx] is not None:
+                h1, h2 = buckets[idx].hash_value
+                self.assertIn(idx // 4, (h1 % bucket_count, h2 % bucket_count))
+
+    def test_cuckoo_rehash_1(self):
+        """Cuckoo - Insertion cycles rehash, and fail cleanly when keys cannot be separated"""
+        # Anagrams share their first bucket, so every key competes for its second bucket
+        keys = ['ab', 'ba', 'abc', 'bca', 'cab', 'acb']
+        m = HashMapCuckoo(8, hash_function_1, hash_function_2, bucket_size=1, stash_size=0, max_load=1)
+        for i, key in enumerate(keys):
+            m.put(key, i)
+        self.assertEqual({key: i for i, key in enumerate(keys)}, dict(m.items()))
+        self.assertEqual(16, m.get_capacity())
+
+        m = HashMapCuckoo(8, lambda key: 0, lambda key: 0, bucket_size=1, stash_size=1)
+        m.put('a', 1)
+        m.put('b', 2)
+        with self.assertRaises(RuntimeError):
+            m.put('c', 3)
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.get('a')}, {m.get('b')}, {m.get('c')}"
+        expected = "2, 8, 1, 2, None"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_cuckoo_rehash_2(self):
+        """Cuckoo - A failed insert keeps every resident key, whichever key its evictions end on"""
+        for max_kicks in (63, 64):
+            m = HashMapCuckoo(4, lambda key: 0, lambda key: 1, bucket_size=1, stash_size=0,
+                              max_load=1, max_kicks=max_kicks)
+            m.put('a', 1)
+            m.put('b', 2)
+            with self.assertRaises(RuntimeError):
+                m.put('c', 3)
+            actual = f"{m.get_size()}, {m.get('a')}, {m.get('b')}, {m.get('c')}, {sorted(m.keys())}"
+            expected = "2, 1, 2, None, ['a', 'b']"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_cuckoo_mapping_1(self):
+        """Cuckoo - Mapping protocol, iteration and clear"""
+        m = self.hash_map
+        for i in range(25):
+            m['key' + str(i)] = i
+        del m['key7']
+        with self.assertRaises(KeyError):
+            m['key7']
+
+        expected = {'key' + str(i): i for i in range(25) if i != 7}
+        self.assertEqual(expected, dict(m.items()))
+        with self.assertRaises(RuntimeError):
+            for key in m:
+                m.put(key + 'x', 0)
+
+        m.clear()
+        actual = f"{len(m)}, {list(m)}, {m.get_stats()['operations']['put']}"
+        expected = "0, [], 26"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+# ------------- SwissTable -------------------------- #
+class TestCaseSwiss1(unittest.TestCase):
+    """SwissTable - initial capacity 50 - FNV-1a"""
+
+    def setUp(self):
+        self.hash_map = HashMapSwiss(50, fnv1a_hash)
+
+    def test_swiss_put_1(self):
+        """SwissTable - Capacity rounds up to groups of 8 and grows past 7/8 full"""
+        m = self.hash_map
+        for i in range(56):
+            m.put('key' + str(i), i)
+        m.put('key1', 'updated')
+
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.empty_buckets()}, {m.get('key1')}, {m.get('key56')}"
+        expected = "56, 64, 8, updated, None"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        m.put('key56', 56)
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.table_load()}"
+        expected = "57, 128, 0.4453125"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_swiss_group_probe_1(self):
+        """SwissTable - Keys sharing a home group spill over to later groups and stay reachable"""
+        # Every key hashes to group 0 with its own 7-bit tag
+        m = HashMapSwiss(100, lambda key: key % 128, stats=True)
+        for i in range(100):
+            m.put(i, i * 10)
+        for i in range(0, 100, 3):
+            m.remove(i)
+
+        # Slots in groups that were never full are emptied; the rest are marked deleted
+        stats = m.get_stats()
+        actual = f"{m.get_size()}, {m.get_capacity()}, {m.empty_buckets()}, {stats['tombstones']}"
+        expected = "66, 128, 30, 32"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        self.assertGreater(max(stats['probe_lengths']), 0)
+        for i in range(100):
+            self.assertEqual(None if i % 3 == 0 else i * 10, m.get(i), msg=str(i))
+
+        # Deleted slots are reused, then cleared by an in-place rehash
+        for i in range(0, 100, 3):
+            m.put(i, -i)
+        m.remove_many(range(50))
+        m.put_many((i, i) for i in range(100, 150))
+        self.assertEqual({i: (-i if i % 3 == 0 else i * 10) for i in range(50, 100)} | {i: i for i in range(100, 150)},
+                         dict(m.items()))
+        self.assertEqual("128, 0", f"{m.get_capacity()}, {m.get_stats()['tombstones']}")
+
+    def test_swiss_mapping_1(self):
+        """SwissTable - Mapping protocol, iteration and clear"""
+        m = self.hash_map
+        for i in range(25):
+            m['key' + str(i)] = i
+        del m['key7']
+        with self.assertRaises(KeyError):
+            m['key7']
+        with self.assertRaises(KeyError):
+            del m['key7']
+
+        expected = {'key' + str(i): i for i in range(25) if i != 7}
+        self.assertEqual(expected, dict(m.items()))
+        self.assertEqual(sorted(expected), sorted(m.get_keys()[i] for i in range(24)))
+        with self.assertRaises(RuntimeError):
+            for key in m:
+                m.remove(key)
+
+        m.clear()
+        actual = f"{len(m)}, {m.get_capacity()}, {list(m)}"
+        expected = "0, 64, []"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+# ------------- Concurrent ------------------------- #
+class TestCaseConcurrent1(unittest.TestCase):
+    """Concurrent - initial capacity 16 - 4 segments"""
+
+    def setUp(self):
+        self.hash_map = HashMapConcurrent(16, fnv1a_hash, concurrency=4)
+
+    def test_concurrent_atomic_1(self):
+        """Concurrent - put_if_absent / compute / get_or_default"""
+        m = self.hash_map
+        actual = f"{m.put_if_absent('key1', 10)}, {m.put_if_absent('key1', 20)}, {m.get('key1')}"
+        expected = "None, 10, 10"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        m.compute('key1', lambda key, value: value + 5)
+        m.compute('key2', lambda key, value: 'new' if value is None else value)
+        m.compute('key1', lambda key, value: None)
+        actual = f"{m.get_or_default('key1', -1)}, {m.get_or_default('key2', -1)}, {m.get_size()}"
+        expected = "-1, new, 1"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_concurrent_compute_2(self):
+        """Concurrent - compute may touch its own key but not other segments"""
+        m = self.hash_map
+        m.put('key1', 1)
+        actual = m.compute('key1', lambda key, value: m.get(key) + value)
+        expected = 2
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        other = next(key for key in ('key' + str(i) for i in range(2, 50))
+                     if m._route(fnv1a_hash(key))[0] != m._route(fnv1a_hash('key1'))[0])
+        with self.assertRaises(RuntimeError):
+            m.compute('key1', lambda key, value: m.get(other))
+        with self.assertRaises(RuntimeError):
+            m.compute('key1', lambda key, value: list(m.keys()))
+
+        # The failed calls leave the map usable and the key unchanged
+        actual = f"{m.get('key1')}, {m.compute(other, lambda key, value: 'x')}, {m.get_size()}"
+        expected = "2, x, 2"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_concurrent_threads_1(self):
+        """Concurrent - Updates from many threads are neither lost nor duplicated"""
+        m = self.hash_map
+
+        def work(thread):
+            for i in range(1000):
+                m.compute('count' + str(i % 50), lambda key, value: (value or 0) + 1)
+                m.put_if_absent('owner' + str(i), thread)
+                m.put('thread' + str(thread) + '-' + str(i), i)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(work, range(8)))
+
+        self.assertEqual([160] * 50, m.get_many('count' + str(i) for i in range(50)))
+        self.assertTrue(all(0 <= m.get('owner' + str(i)) < 8 for i in range(1000)))
+        actual = f"{m.get_size()}, {len(list(m.items()))}"
+        expected = "9050, 9050"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        # Each segment grew on its own to keep its load at or below 1.0
+        m.complete_resize()
+        self.assertLessEqual(m.table_load(), 1.0)
+        self.assertFalse(m.is_resizing())
+
+    def test_concurrent_mapping_1(self):
+        """Concurrent - Mapping protocol, batch operations and clear"""
+        m = self.hash_map
+        m.put_many(('key' + str(i), i) for i in range(25))
+        del m['key7']
+        with self.assertRaises(KeyError):
+            m['key7']
+        with self.assertRaises(KeyError):
+            del m['key7']
+
+        expected = {'key' + str(i): i for i in range(25) if i != 7}
+        self.assertEqual(expected, dict(m.items()))
+        self.assertEqual([True, False], m.contains_many(['key1', 'key7']))
+        m.remove_many('key' + str(i) for i in range(10))
+        self.assertEqual(15, len(m))
+
+        m.clear()
+        actual = f"{len(m)}, {list(m)}, {m.get_hash_function()}"
+        expected = "0, [], FNV-1a"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+# ------------- Sharded ---------------------------- #
+def _process_hash(key: str) -> int:
+    """Hash that differs from process to process, like builtin_hash under the spawn start method."""
+    return fnv1a_hash(key) ^ os.getpid()
+
+
+class TestCaseSharded1(unittest.TestCase):
+    """Sharded - 4 shards - FNV-1a"""
+
+    def test_sharded_count_1(self):
+        """Sharded - Counting partitions in worker processes matches counting in this process"""
+        partitions = [['key' + str(i % 37) for i in range(start, start + 500)] for start in range(0, 2000, 500)]
+        parallel = HashMapSharded.count(partitions, fnv1a_hash, num_shards=4, max_workers=2)
+        serial = HashMapSharded.count(partitions, fnv1a_hash, num_shards=4, max_workers=1)
+
+        expected = {}
+        for partition in partitions:
+            for key in partition:
+                expected[key] = expected.get(key, 0) + 1
+        self.assertEqual(expected, dict(parallel.items()))
+        self.assertEqual(expected, dict(serial.items()))
+
+        # Every key lives in the shard its hash routes to
+        for idx in range(4):
+            for key in parallel.get_shard(idx):
+                self.assertEqual(idx, fnv1a_hash(key) % 4)
+
+    def test_sharded_count_2(self):
+        """Sharded - A hash function that differs in the worker processes is rejected"""
+        partitions = [['key' + str(i) for i in range(100)], ['key' + str(i) for i in range(50, 150)]]
+        with self.assertRaises(ValueError):
+            HashMapSharded.count(partitions, _process_hash, num_shards=4, max_workers=2)
+        serial = HashMapSharded.count(partitions, _process_hash, num_shards=4, max_workers=1)
+        actual = f"{serial.get_size()}, {serial.get('key75')}, {serial.get('key0')}"
+        expected = "150, 2, 1"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_sharded_merge_1(self):
+        """Sharded - Last writer wins in partition order; merge sums shard by shard"""
+        partitions = [[('a', 1), ('b', 2)], [('a', 3), ('c', 4)], [('c', 5)]]
+        m = HashMapSharded.build(partitions, fnv1a_hash, num_shards=4, how="last", max_workers=1)
+        self.assertEqual({'a': 3, 'b': 2, 'c': 5}, dict(m.items()))
+
+        other = HashMapSharded.build([[('a', 10), ('d', 1)]], fnv1a_hash, num_shards=4, max_workers=1)
+        m.merge(other, how="sum")
+        self.assertEqual({'a': 13, 'b': 2, 'c': 5, 'd': 1}, dict(m.items()))
+
+        # Maps with different shard counts are merged key by key
+        m.merge(HashMapSharded.build([[('b', 0)]], fnv1a_hash, num_shards=3, max_workers=1), how="last")
+        m.update([('e', 5), ('e', 6)], how=max)
+        self.assertEqual({'a': 13, 'b': 0, 'c': 5, 'd': 1, 'e': 6}, dict(m.items()))
+        with self.assertRaises(ValueError):
+            m.update([], how="median")
+
+    def test_sharded_mapping_1(self):
+        """Sharded - Lookups route to one shard; mapping protocol and clear"""
+        m = HashMapSharded(4, fnv1a_hash, capacity=16)
+        for i in range(25):
+            m['key' + str(i)] = i
+        del m['key7']
+        with self.assertRaises(KeyError):
+            m['key7']
+        with self.assertRaises(KeyError):
+            del m['key7']
+
+        actual = f"{len(m)}, {m.get('key3')}, {'key3' in m}, {m.contains_key('key7')}, {m.get_capacity()}"
+        expected = "24, 3, True, False, 32"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        self.assertEqual(24, sum(m.get_shard(idx).get_size() for idx in range(m.get_num_shards())))
+
+        m.clear()
+        self.assertEqual([], list(m))
+
+
+# ------------- Frequency Sketches ------------------ #
+class TestCaseSketch1(unittest.TestCase):
+    """Frequency Sketches - Count-Min Sketch and Space-Saving"""
+
+    def setUp(self):
+        # 20000 values over 5000 distinct keys, plus two heavy hitters
+        self.stream = ['key' + str(i % 5000) for i in range(20000)] + ['x'] * 900 + ['y'] * 850
+
+    def test_count_min_1(self):
+        """Count-Min - Estimates never undercount and stay within epsilon * total"""
+        sketch = CountMinSketch(epsilon=.01, delta=.01)
+        sketch.update(self.stream)
+        sketch.add('x', 100)
+
+        actual = f"{sketch.get_dimensions()}, {sketch.get_total()}, {sketch.error_bound()}"
+        expected = "(5, 272), 21850, 218"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        for key, count in (('x', 1000), ('y', 850), ('key42', 4), ('absent', 0)):
+            self.assertGreaterEqual(sketch.estimate(key), count)
+            self.assertLessEqual(sketch.estimate(key), count + sketch.error_bound())
+        with self.assertRaises(ValueError):
+            CountMinSketch(epsilon=0)
+
+    def test_space_saving_1(self):
+        """Space-Saving - Monitors a fixed number of values; counts bound the true count"""
+        summary = SpaceSaving(capacity=50)
+        summary.update(DynamicArray(self.stream))
+        top = summary.top_k(2)
+
+        actual = f"{top[0][0]}, {top[1][0]}, {summary._map.get_size()}, {summary.get_total()}"
+        expected = "x, y, 50, 21750"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        count, error = summary.estimate('x')
+        self.assertTrue(count - error <= 900 <= count)
+        self.assertLessEqual(error, summary.get_total() // 50)
+        self.assertLessEqual(len(summary._heap), 4 * 50 + 1)
+        self.assertEqual((0, 0), summary.estimate('absent'))
+
+    def test_find_mode_approximate_1(self):
+        """Approximate mode - Reports the candidates and how far the frequency may be off"""
+        mode, frequency, error = find_mode_approximate(iter(self.stream), epsilon=.01)
+        actual = f"{mode[0]}, {frequency - error <= 900 <= frequency}, {error <= 21750 * .01}"
+        expected = "x, True, True"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        # A near tie that the error bounds cannot separate reports both values
+        mode, frequency, error = find_mode_approximate(list(range(30)) + ['a', 'b'] * 20 + ['a'], epsilon=.1,
+                                                       function=fnv1a_hash)
+        self.assertEqual(['a', 'b'], [mode[idx] for idx in range(mode.length())])
+
+        mode, frequency, error = find_mode_approximate(DynamicArray(['a', 'b', 'b']))
+        actual = f"{mode.length()}, {mode[0]}, {frequency}, {error}"
+        expected = "1, b, 2, 0"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        self.assertEqual((0, 0), find_mode_approximate([])[1:])
+
+
+# ------------- Snapshots --------------------------- #
+class TestCaseSnapshot1(unittest.TestCase):
+    """Snapshots - Save to a binary file, load fully or through mmap"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'map.snap')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_snapshot_roundtrip_1(self):
+        """Snapshots - Each map kind reloads as the same kind with the same capacity and contents"""
+        for m in (HashMapSC(7, fnv1a_hash, max_load=1.0), HashMapOA(7, hash_function_2),
+                  HashMapOA(7, fnv1a_hash, compact=True)):
+            for i in range(300):
+                m.put('key' + str(i), [i])
+            m.remove('key5')
+            save_snapshot(m, self.path)
+            loaded = load_snapshot(self.path)
+
+            actual = f"{type(loaded).__name__}, {loaded.get_capacity()}, {loaded.get_size()}, {loaded.get('key7')}"
+            expected = f"{type(m).__name__}, {m.get_capacity()}, 299, [7]"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+            self.assertEqual(dict(m.items()), dict(loaded.items()))
+
+    def test_snapshot_settings_1(self):
+        """Snapshots - The probe strategy and load factors are restored; keyword arguments override them"""
+        m = HashMapOA(16, fnv1a_hash, probe="double", step_function=hash_function_1)
+        m.put_many(('key' + str(i), i) for i in range(5))
+        save_snapshot(m, self.path)
+        loaded = load_snapshot(self.path)
+        actual = f"{loaded.get_probe()}, {loaded._step_function is hash_function_1}, {loaded.get('key3')}"
+        expected = "double, True, 3"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        self.assertEqual("linear", load_snapshot(self.path, probe="linear").get_probe())
+
+        m = HashMapSC(8, fnv1a_hash, max_load=2.0, min_load=0.5)
+        m.put_many(('key' + str(i), i) for i in range(10))
+        save_snapshot(m, self.path)
+        loaded = load_snapshot(self.path)
+        actual = f"{loaded._max_load}, {loaded._min_load}, {loaded.get_capacity()}"
+        expected = "2.0, 0.5, 8"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        # A map saved with an unregistered step function could not be rebuilt with it
+        m = HashMapOA(16, fnv1a_hash, probe="double", step_function=lambda key: 3)
+        with self.assertRaises(ValueError):
+            save_snapshot(m, self.path)
+
+    def test_snapshot_mapped_1(self):
+        """Snapshots - A mapped snapshot answers lookups in place and is read-only"""
+        m = HashMapSC(11, fnv1a_hash)
+        for i in range(100):
+            m.put('key' + str(i), i * 10)
+        m.put(42, 'int key')
+        save_snapshot(m, self.path)
+
+        with MappedHashMap(self.path) as mapped:
+            actual = (f"{len(mapped)}, {mapped.get('key3')}, {mapped[42]}, {'key99' in mapped}, "
+                      f"{mapped.get('key100')}, {mapped.get_hash_function()}, {mapped.get_capacity()}")
+            expected = "101, 30, int key, True, None, FNV-1a, 11"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+            with self.assertRaises(KeyError):
+                mapped['missing']
+            with self.assertRaises(TypeError):
+                mapped['key1'] = 1
+            self.assertEqual(dict(m.items()), dict(mapped.items()))
+
+    def test_snapshot_errors_1(self):
+        """Snapshots - Unregistered or non-reproducible hash functions and foreign files are rejected"""
+        m = HashMapSC(5, lambda key: 7)
+        m.put('a', 1)
+        with self.assertRaises(ValueError):
+            save_snapshot(m, self.path)
+        with self.assertRaises(TypeError):
+            save_snapshot(HashMapRH(5, fnv1a_hash), self.path)
+
+        m = HashMapSC(5, fnv1a_hash)
+        m.put('a', 1)
+        save_snapshot(m, self.path)
+        with self.assertRaises(ValueError):
+            MappedHashMap(self.path, function=hash_function_1)
+        self.assertEqual(1, MappedHashMap(self.path, function=fnv1a_hash).get('a'))
+
+        with open(self.path, 'wb') as file:
+            file.write(b'not a snapshot')
+        with self.assertRaises(ValueError):
+            MappedHashMap(self.path)
+
+
+# ------------- Persistent -------------------------- #
+class TestCasePersistent1(unittest.TestCase):
+    """Persistent - Write-ahead log with compaction into snapshots"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'store')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_persistent_recovery_1(self):
+        """Persistent - Puts, removes and clears are replayed on open; a torn record is dropped"""
+        with HashMapPersistent(self.path, sync_interval=None) as m:
+            m.put_many(('key' + str(i), i) for i in range(50))
+            m.clear()
+            m.put_many(('key' + str(i), i) for i in range(20))
+            del m['key3']
+            m.remove_many(['key4', 'missing'])
+            m['key5'] = 'five'
+
+        # A crash part way through a write leaves a partial record at the end of the log
+        log = os.path.join(self.path, 'wal.00000000')
+        size = os.path.getsize(log)
+        with open(log, 'ab') as file:
+            file.write(b'\x01\x02\x03\x04\x01')
+
+        with HashMapPersistent(self.path, sync_interval=None) as m:
+            actual = f"{len(m)}, {m.get('key5')}, {'key3' in m}, {'key4' in m}, {m.get('key19')}, {os.path.getsize(log)}"
+            expected = f"18, five, False, False, 19, {size}"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_persistent_compaction_1(self):
+        """Persistent - Compaction replaces the log with a snapshot that is reloaded on open"""
+        with HashMapPersistent(self.path, sync_interval=None, min_compaction_bytes=0) as m:
+            for i in range(200):
+                m.put('key' + str(i), i)
+            m.remove('key0')
+            m.compact()
+            m.put('after', 1)
+            self.assertEqual(['snapshot.00000001', 'wal.00000001'], sorted(os.listdir(self.path)))
+
+        with HashMapPersistent(self.path, compact=False) as m:
+            actual = f"{len(m)}, {m.get('key1')}, {m.get('key0')}, {m.get('after')}, {type(m._map).__name__}"
+            expected = "200, 1, None, 1, CompactHashMap"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_persistent_group_commit_1(self):
+        """Persistent - Writers from several threads share background fsyncs; the log grows past its buffer"""
+        with HashMapPersistent(self.path, sync_interval=.001, buffer_size=256) as m:
+            def write(start):
+                for i in range(start, start + 250):
+                    m.put(i, str(i))
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(write, range(0, 1000, 250)))
+        with self.assertRaises(ValueError):
+            HashMapPersistent(self.path, function=lambda key: 0)
+
+        with HashMapPersistent(self.path) as m:
+            self.assertEqual({i: str(i) for i in range(1000)}, dict(m.items()))
+
+
+# ------------- Cache ------------------------------- #
+class TestCaseCache1(unittest.TestCase):
+    """Cache - Bounded LRU cache with optional TinyLFU admission"""
+
+    def test_cache_lru_1(self):
+        """Cache - The least recently used entry is evicted; get refreshes recency"""
+        cache = HashMapCache(3, hash_function_1)
+        for key in ('a', 'b', 'c'):
+            cache[key] = key.upper()
+        cache.get('a')
+        cache['d'] = 'D'
+        cache['c'] = 'C2'
+        cache.get('missing')
+
+        actual = f"{list(cache)}, {'b' in cache}, {cache.get('c')}, {len(cache)}"
+        expected = "['c', 'd', 'a'], False, C2, 3"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        stats = cache.get_stats()
+        actual = f"{stats['hits']}, {stats['misses']}, {stats['evictions']}, {stats['rejections']}"
+        expected = "2, 1, 1, 0"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        del cache['d']
+        with self.assertRaises(KeyError):
+            cache['d']
+        cache.clear()
+        self.assertEqual(([], 0), (list(cache), cache.get_bytes()))
+
+    def test_cache_bytes_1(self):
+        """Cache - A max_bytes budget evicts until the new entry fits and rejects oversized entries"""
+        cache = HashMapCache(None, max_bytes=100, sizeof=lambda key, value: len(value))
+        for i in range(5):
+            cache.put(i, 'x' * 30)
+        rejected = cache.put('big', 'x' * 101)
+        cache.put(4, 'x' * 10)
+
+        actual = f"{list(cache)}, {cache.get_bytes()}, {rejected}, {cache.get_stats()['evictions']}"
+        expected = "[4, 3, 2], 70, False, 2"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        with self.assertRaises(ValueError):
+            HashMapCache(None)
+        with self.assertRaises(ValueError):
+            HashMapCache(10, admission="lfu")
+
+    def test_cache_nodes_1(self):
+        """Cache - Each entry is one node, shared by its chain and the recency list across resizes"""
+        # A byte budget starts the map at 11 buckets, so it resizes several times
+        cache = HashMapCache(None, fnv1a_hash, max_bytes=400, sizeof=lambda key, value: 2)
+        for key in range(300):
+            cache.put(key, key * 2)
+        cache.get(150)
+
+        nodes = list(cache._recency)
+        actual = f"{len(nodes)}, {nodes[0].key}, {cache._map.get_capacity()}"
+        expected = "200, 150, 352"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        for node in nodes:
+            self.assertIs(node, cache._map._find_node(node.key, node.hash_value))
+            self.assertEqual(node.key * 2, node.value)
+
+    def test_cache_tinylfu_1(self):
+        """Cache - TinyLFU keeps frequently requested keys through a scan of one-off keys"""
+        results = {}
+        for admission in (None, "tinylfu"):
+            cache = HashMapCache(50, fnv1a_hash, admission=admission)
+            for rounds in range(20):
+                for key in range(40):
+                    if cache.get(key) is None:
+                        cache.put(key, key)
+            for key in range(1000, 1100):
+                if cache.get(key) is None:
+                    cache.put(key, key)
+            results[admission] = sum(key in cache for key in range(40))
+
+        self.assertEqual(40, results["tinylfu"])
+        self.assertLess(results[None], 40)
+
+    def test_cache_tinylfu_2(self):
+        """Cache - A miss and the put that fills it count as one request"""
+        cache = HashMapCache(50, fnv1a_hash, admission="tinylfu")
+        for key in range(10):
+            if cache.get(key) is None:
+                cache.put(key, key)
+        for key in range(10, 15):
+            cache.put(key, key)
+        cache.get(3)
+        actual = f"{cache._sketch.get_total()}, {cache._sketch.estimate(3)}, {cache._sketch.estimate(12)}"
+        expected = "16, 2, 1"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+# ------------- Memoize ----------------------------- #
+class TestCaseMemoize1(unittest.TestCase):
+    """Memoize - function results cached in a HashMap"""
+
+    def test_memoize_1(self):
+        """Memoize - hits, misses, LRU eviction and cache_info for both maps"""
+        for map_class in (HashMapSC, HashMapOA):
+            calls = []
+
+            @memoize(maxsize=2, map_class=map_class)
+            def square(x, power=2):
+                calls.append(x)
+                return x ** power
+
+            results = [square(2), square(3), square(2), square(4), square(3), square(2), square(2, power=3)]
+            info = square.cache_info()
+            actual = f"{results}, {calls}, {info['hits']}, {info['misses']}, {info['evictions']}, {info['size']}"
+            expected = "[4, 9, 4, 16, 9, 4, 8], [2, 3, 4, 3, 2, 2], 1, 6, 4, 2"
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+            self.assertEqual(info['table_load'], square._map.table_load())
+
+            square.cache_clear()
+            self.assertEqual((0, 0), (square.cache_info()['size'], square.cache_info()['hits']))
+
+    def test_memoize_2(self):
+        """Memoize - FIFO eviction, bypass, typed keys and methods"""
+        calls = []
+
+        @memoize(maxsize=2, eviction="fifo", typed=True)
+        def ident(x):
+            calls.append(x)
+            return x
+
+        for x in (1, 2, 1, 3, 1, 1.0):
+            ident(x)
+        ident(3, bypass_cache=True)
+        actual = f"{calls}, {ident.cache_info()['hits']}, {ident.__name__}"
+        expected = "[1, 2, 3, 1, 1.0, 3], 1, ident"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+        class Fib:
+            @memoize(maxsize=None, map_class=HashMapOA)
+            def fib(self, n):
+                return n if n < 2 else self.fib(n - 1) + self.fib(n - 2)
+
+        self.assertEqual(354224848179261915075, Fib().fib(100))
+        self.assertEqual(101, Fib.fib.cache_info()['size'])
+        with self.assertRaises(ValueError):
+            memoize(eviction="random")
+
+    def test_memoize_threads_1(self):
+        """Memoize - concurrent callers share one consistent cache"""
+        @memoize(maxsize=50, function=fnv1a_hash)
+        def label(x):
+            return f"value {x}"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(label, [str(i % 80) for i in range(4000)]))
+        self.assertEqual([f"value {i % 80}" for i in range(4000)], results)
+        info = label.cache_info()
+        actual = f"{info['hits'] + info['misses']}, {info['size']}"
+        expected = "4000, 50"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+# ------------- Async ------------------------------- #
+class TestCaseAsync1(unittest.TestCase):
+    """Async - single-flight loading and batched lookups"""
+
+    def test_async_get_or_load_1(self):
+        """Async - concurrent misses for a key share one load, for both maps"""
+        async def scenario(map_class):
+            m = HashMapAsync(11, hash_function_1, map_class=map_class)
+            calls = []
+
+            async def loader(key):
+                calls.append(key)
+                await asyncio.sleep(.01)
+                return key.upper()
+
+            values = await asyncio.gather(*(m.get_or_load(key, loader) for key in ["a", "b", "a", "a", "b"]))
+            again = await m.get_or_load("a", loader)
+            return f"{values}, {again}, {sorted(calls)}, {m.get_size()}, {m._loads.get_size()}"
+
+        expected = "['A', 'B', 'A', 'A', 'B'], A, ['a', 'b'], 2, 0"
+        for map_class in (HashMapSC, HashMapOA):
+            actual = asyncio.run(scenario(map_class))
+            self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_async_get_or_load_2(self):
+        """Async - a failed load reaches every waiter and is retried by the next call"""
+        async def scenario():
+            m = HashMapAsync(11, hash_function_1)
+            attempts = []
+
+            async def loader(key):
+                attempts.append(key)
+                await asyncio.sleep(.01)
+                if len(attempts) == 1:
+                    raise ConnectionError("backend down")
+                return 1
+
+            results = await asyncio.gather(m.get_or_load("k", loader), m.get_or_load("k", loader),
+                                           return_exceptions=True)
+            retried = await m.get_or_load("k", lambda key: 2)
+            return f"{[type(result).__name__ for result in results]}, {retried}, {len(attempts)}"
+
+        actual = asyncio.run(scenario())
+        expected = "['ConnectionError', 'ConnectionError'], 2, 1"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_async_get_many_1(self):
+        """Async - batched lookups, loading of missing keys and resizes that yield"""
+        async def scenario():
+            m = HashMapAsync(11, hash_function_1, resize_chunk=64)
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(1)
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            await m.put_many(('key' + str(i), i) for i in range(5000))
+
+            # The put that grows the table migrates it in chunks, letting the ticker run in between
+            capacity, i = m.get_map().get_capacity(), 5000
+            while m.get_map().get_capacity() == capacity:
+                before = len(ticks)
+                await m.put('key' + str(i), i)
+                i += 1
+            resized_ticks = len(ticks) - before
+            values = await m.get_many(['key1', 'missing', 'key4999'], batch_size=2)
+            loaded = await m.get_many(['key2', 'new'], loader=lambda key: len(key))
+            task.cancel()
+            return f"{resized_ticks > 10}, {m.get_map().is_resizing()}, {values}, {loaded}, {len(m) - i}"
+
+        actual = asyncio.run(scenario())
+        expected = "True, False, [1, None, 4999], [2, 3], 1"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+
+# ------------- Hash Functions ---------------------- #
+class TestCaseHash1(unittest.TestCase):
+    """Hash functions and the hash function registry"""
+
+    def test_hash_fnv1a_1(self):
+        """Hash Functions - FNV-1a matches the reference 64-bit values"""
+        actual = f"{fnv1a_hash('')}, {fnv1a_hash('a')}"
+        expected = f"{0xcbf29ce484222325}, {0xaf63dc4c8601ec8c}"
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+
+    def test_hash_distribution_1(self):
+        """Hash Functions - Registered functions spread sequential keys and anagrams"""
+        for name in ("FNV-1a", "BLAKE2b", "Builtin hash", "Keyed BLAKE2b"):
+            m = HashMapSC(50, name)
+            for i in range(50):
+                m.put('key' + str(i), i * 100)
+            self.assertLess(m.empty_buckets(), 25, msg=f"{name} left {m.empty_buckets()} buckets empty")
+
+            function = get_registered_hash_function(name)
+            self.assertNotEqual(function('listen'), function('silent'), msg=f"{name} collides on anagrams")
+
+    def test_hash_keyed_1(self):
+        """Hash Functions - Keyed hashes depend on the secret"""
+        first, second = make_keyed_hash(b'first secret'), make_keyed_hash(b'second secret')
+        self.assertEqual(first('key1'), make_keyed_hash(b'first secret')('key1'))
+        self.assertNotEqual(first('key1'), second('key1'))
+
+    def test_hash_registry_1(self):
+        """Hash Functions - Maps report the name of any registered function"""
+        def custom_hash(key):
+            return len(key)
+
+        register_hash_function("Length", custom_hash)
+        self.addCleanup(unregister_hash_function, "Length")
+        actual = [HashMapSC(10, custom_hash).get_hash_function(), HashMapOA(10, "FNV-1a").get_hash_function(),
+                  HashMapOA(10, hash_function_2).get_hash_function(), hash_function_name(len)]
+        expected = ["Length", "FNV-1a", "Hash function 2", None]
+        self.assertEqual(expected, actual, msg=f"Expected {expected}, got {actual}")
+        with self.assertRaises(KeyError):
+            HashMapSC(10, "No such function")
+
+        unregister_hash_function("Length")
+        self.assertIsNone(hash_function_name(custom_hash))
+
+
+# ------------- Benchmarks -------------------------- #
+class TestCaseBench1(unittest.TestCase):
+    """Benchmark suite smoke tests"""
+
+    def test_bench_run_1(self):
+        """Benchmarks - Every map and key distribution produces the expected metrics"""
+        results = benchmarks.run(list(benchmarks.MAPS), benchmarks.DISTRIBUTIONS, [50], "FNV-1a")
+        self.assertEqual(len(benchmarks.MAPS) * len(benchmarks.DISTRIBUTIONS), len(results))
+        for label, metrics in results.items():
+            for metric in benchmarks.THROUGHPUT_METRICS + benchmarks.COST_METRICS:
+                self.assertIn(metric, metrics, msg=f"{label} is missing {metric}")
+
+        histogram = results["oa/anagram/50"]["probe_length_histogram"]
+        self.assertEqual(50, sum(histogram.values()))
+        histogram = results["sc/sequential/50"]["chain_length_histogram"]
+        self.assertEqual(50, sum(length * count for length, count in histogram.items()))
+
+    def test_bench_keys_1(self):
+        """Benchmarks - Seeded random keys come out in the same order under any PYTHONHASHSEED"""
+        script = "import benchmarks; print(benchmarks.make_keys('random', 200, seed=3))"
+        outputs = []
+        for hash_seed in ('1', '2'):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            outputs.append(subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                                          cwd=os.path.dirname(os.path.abspath(__file__)), env=env).stdout)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(str(benchmarks.make_keys('random', 200, seed=3)) + '\n', outputs[0])
+
+    def test_bench_compare_1(self):
+        """Benchmarks - Regressions beyond the tolerance are reported"""
+        baseline = {"oa/random/10": {"get_ops": 1000.0, "resize_seconds": 1.0}}
+        results = {"oa/random/10": {"get_ops": 850.0, "resize_seconds": 1.05}}
+        self.assertEqual(["oa/random/10 get_ops: 1000.0 -> 850.0"], benchmarks.compare(results, baseline, .1))
+        self.assertEqual([], benchmarks.compare(results, baseline, .2))
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)